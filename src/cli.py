@@ -1,19 +1,37 @@
 import argparse
+import csv
 import json
 import sys
 from pathlib import Path
 
 from src.config import ARESTAS_FILE, BAIRROS_FILE, DATASET_2_CSV, OUT_DIR
-from src.graphs.io import carregar_dataset_parte2, carregar_grafo, normalizar_texto
+from src.graphs.algorithms import Sorting
+from src.graphs.cache import carregar_hierarquia, salvar_hierarquia
+from src.graphs.hierarquia import HierarquiaContracao
+from src.graphs.io import AGREGACAO_PADRAO, carregar_dataset_parte2, carregar_grafo, carregar_marcos, normalizar_texto
 from src.solve import orquestrar, run_part2_full_analysis
 
 
+def resolver_nome(grafo, texto, normalizar=True):
+    nome = grafo.resolver_vertice(texto)
+    if nome is not None:
+        return nome
+    return normalizar_texto(texto) if normalizar else texto
+
+
+def sugestoes_vertice(grafo, texto, k=5):
+    sugestoes = grafo.sugerir_vertices(texto, k)
+    if not sugestoes:
+        return "Nenhum vértice parecido encontrado."
+    return f"Você quis dizer: {', '.join(sugestoes)}?"
+
+
 def executar_bfs(grafo, origem, destino, diretorio_saida, normalizar=True):
-    origem_normalizada = normalizar_texto(origem) if normalizar else origem
+    origem_normalizada = resolver_nome(grafo, origem, normalizar)
     
     if origem_normalizada not in grafo.vertices:
         print(f"Erro: Vértice de origem '{origem}' não encontrado no grafo.")
-        print(f"Vértices disponíveis: {sorted(list(grafo.vertices.keys())[:10])}...")
+        print(sugestoes_vertice(grafo, origem))
         return
     
     print(f"Executando BFS a partir de '{origem_normalizada}'...")
@@ -28,17 +46,17 @@ def executar_bfs(grafo, origem, destino, diretorio_saida, normalizar=True):
         "niveis": niveis_json,
         "distancias": distancias_json,
         "anterior": resultado['anterior'],
-        "arvore": resultado['arvore'],
+        "arvore": dict(resultado['arvore']),
         "ordem_visita": resultado['ordem_visita'],
         "estatisticas": {
             "vertices_alcancados": len(resultado['ordem_visita']),
             "vertices_totais": len(grafo.vertices),
-            "maior_nivel": max([v for v in resultado['niveis'].values() if v != float('inf')], default=0)
+            "maior_nivel": max(resultado['niveis'].alcancados.values(), default=0)
         }
     }
     
     if destino:
-        destino_normalizado = normalizar_texto(destino) if normalizar else destino
+        destino_normalizado = resolver_nome(grafo, destino, normalizar)
         if destino_normalizado in grafo.vertices:
             if resultado['distancias'][destino_normalizado] != float('inf'):
                 caminho = []
@@ -68,15 +86,15 @@ def executar_bfs(grafo, origem, destino, diretorio_saida, normalizar=True):
 
 
 def executar_dfs(grafo, origem, destino, diretorio_saida, normalizar=True):
-    origem_normalizada = normalizar_texto(origem) if normalizar else origem
+    origem_normalizada = resolver_nome(grafo, origem, normalizar)
     
     if origem_normalizada not in grafo.vertices:
         print(f"Erro: Vértice de origem '{origem}' não encontrado no grafo.")
-        print(f"Vértices disponíveis: {sorted(list(grafo.vertices.keys())[:10])}...")
+        print(sugestoes_vertice(grafo, origem))
         return
     
     print(f"Executando DFS a partir de '{origem_normalizada}'...")
-    resultado = grafo.busca_em_profundidade(origem_normalizada)
+    resultado = grafo.busca_em_profundidade(origem_normalizada, classificar=True)
     
     classificacao_json = {f"{u}-{v}": tipo for (u, v), tipo in resultado['classificacao_arestas'].items()}
     
@@ -102,7 +120,7 @@ def executar_dfs(grafo, origem, destino, diretorio_saida, normalizar=True):
     }
     
     if destino:
-        destino_normalizado = normalizar_texto(destino) if normalizar else destino
+        destino_normalizado = resolver_nome(grafo, destino, normalizar)
         if destino_normalizado in grafo.vertices:
             if destino_normalizado in resultado['descoberta']:
                 caminho = []
@@ -138,6 +156,59 @@ def executar_dfs(grafo, origem, destino, diretorio_saida, normalizar=True):
     print(f"Vértices alcançados: {dados_saida['estatisticas']['vertices_alcancados']}/{dados_saida['estatisticas']['vertices_totais']}")
 
 
+def executar_pares(grafo, arquivo_pares, diretorio_saida, normalizar=True):
+    """Caminhos mínimos de todos os pares ``origem,destino`` do CSV, com uma busca por origem distinta."""
+    with open(arquivo_pares, 'r', encoding='utf-8') as f:
+        linhas = list(csv.DictReader(f))
+    if linhas and not {'origem', 'destino'} <= set(linhas[0]):
+        print(f"Erro: {arquivo_pares} precisa das colunas 'origem' e 'destino'.")
+        return
+
+    pares = [(resolver_nome(grafo, l['origem'], normalizar), resolver_nome(grafo, l['destino'], normalizar)) for l in linhas]
+    validos = [par for par in pares if par[0] in grafo.vertices and par[1] in grafo.vertices]
+    print(f"Calculando {len(validos)} caminhos ({len({o for o, _ in validos})} origens distintas)...")
+    resultados = dict(zip(validos, Sorting.caminhos_em_lote(grafo, validos)))
+
+    arquivo_saida = Path(diretorio_saida) / f"caminhos_{Path(arquivo_pares).stem}.csv"
+    with open(arquivo_saida, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['origem', 'destino', 'custo', 'caminho'])
+        for origem, destino in pares:
+            if (origem, destino) not in resultados:
+                writer.writerow([origem, destino, 'N/A', 'Vértice não encontrado'])
+                continue
+            custo, caminho = resultados[origem, destino]
+            writer.writerow([origem, destino, 'INF' if custo == float('inf') else f"{custo:.2f}", ' -> '.join(caminho)])
+
+    print(f"Resultado salvo em: {arquivo_saida}")
+    faltando = len(pares) - len(validos)
+    if faltando:
+        print(f"[AVISO] {faltando} pares com vértices não encontrados.")
+
+
+def carregar_grafo_dataset(args, path_nos, agregacao=None):
+    """Carrega o grafo de ``--dataset``; retorna ``(grafo, usar_normalizacao)``."""
+    eh_parte2 = 'airport' in args.dataset.lower() or 'aeroporto' in args.dataset.lower()
+    if eh_parte2:
+        print("[PARTE 2] Carregando grafo de aeroportos...")
+        grafo = carregar_dataset_parte2(args.dataset, usar_cache=not args.sem_cache, tamanho_bloco=args.tamanho_bloco, agregacao=agregacao)
+        return grafo, False
+
+    print("[PARTE 1] Carregando grafo de bairros...")
+    return carregar_grafo(path_nos, args.dataset, usar_cache=not args.sem_cache), True
+
+
+def hierarquia_para(grafo, arquivo=None):
+    """Hierarquia de contração do grafo: lida de ``arquivo`` quando ele confere, senão construída."""
+    if arquivo:
+        fontes = [grafo.arquivo_cache] if grafo.arquivo_cache else None
+        hierarquia = carregar_hierarquia(arquivo, fontes)
+        if hierarquia is not None and set(hierarquia.nomes) == set(grafo.vertices):
+            return hierarquia
+        print(f"[AVISO] Hierarquia em {arquivo} ausente ou desatualizada; construindo em memória.")
+    return HierarquiaContracao.construir(grafo)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Análise de Grafos - Teoria dos Grafos")
     dataset_padrao = str(ARESTAS_FILE)
@@ -155,7 +226,9 @@ def main():
             'BFS',
             'DFS',
             'DIJKSTRA',
-            'BELLMAN_FORD'
+            'BELLMAN_FORD',
+            'ALT',
+            'CH'
             ],
         help='Algoritimo a executar'
         )
@@ -168,9 +241,26 @@ def main():
     parser.add_argument('--server', action='store_true', help='Starta um servidor local para servir os arquivos de `out/`')
     parser.add_argument('--port', type=int, default=None, help='Porta para o servidor local (se `--server` for usado)')
     parser.add_argument('--parte2', action='store_true', help='Executar análise completa da Parte 2 (Aeroportos)')
+    parser.add_argument('--sem-cache', action='store_true', help='Ignorar o cache binário e reconstruir o grafo a partir dos CSVs')
+    parser.add_argument('--tamanho-bloco', type=int, default=None, help='Ler o dataset de aeroportos em blocos de N linhas, agregando rotas repetidas')
+    parser.add_argument('--construir-hierarquia', type=str, default=None, metavar='ARQUIVO',
+                        help='Pré-processar o grafo de --dataset em Contraction Hierarchies e gravar em ARQUIVO (.npz)')
+    parser.add_argument('--hierarquia', type=str, action='append', default=[], metavar='ARQUIVO',
+                        help='Hierarquia gerada por --construir-hierarquia, usada por --alg CH e pelo --server (pode repetir)')
+    parser.add_argument('--pares', type=str, default=None, metavar='ARQUIVO',
+                        help='CSV com colunas origem,destino: calcula todos os caminhos mínimos em lote (uma busca por origem)')
+    parser.add_argument('--agregacao', nargs='*', default=[f'{a}={r}' for a, r in AGREGACAO_PADRAO.items()], metavar='ATRIBUTO=REDUTOR',
+                        help='Redutores das rotas repetidas (sum, mean, min, max, last), com ou sem --tamanho-bloco '
+                             '(padrão: %(default)s)')
     
     args = parser.parse_args()
     
+    agregacao = None
+    if args.agregacao:
+        if not all('=' in item for item in args.agregacao):
+            parser.error("--agregacao espera itens no formato ATRIBUTO=REDUTOR")
+        agregacao = dict(item.split('=', 1) for item in args.agregacao)
+
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
     path_nos = str(BAIRROS_FILE)
@@ -191,7 +281,7 @@ def main():
             dataset_parte2 = str(DATASET_2_CSV)
         
         try:
-            grafo_parte2 = carregar_dataset_parte2(dataset_parte2)
+            grafo_parte2 = carregar_dataset_parte2(dataset_parte2, usar_cache=not args.sem_cache, tamanho_bloco=args.tamanho_bloco, agregacao=agregacao)
             run_part2_full_analysis(grafo_parte2, out_dir)
         except Exception as e:
             print(f"Erro ao executar análise da Parte 2: {e}")
@@ -214,28 +304,49 @@ def main():
         gerar_todas_visualizacoes(path_nos, path_arestas)
         return
     
+    if args.construir_hierarquia:
+        try:
+            grafo, _ = carregar_grafo_dataset(args, path_nos, agregacao)
+        except Exception as e:
+            print(f"Erro ao carregar arquivos do grafo: {e}")
+            return
+        print(f"Construindo hierarquia de contração ({grafo.ordem} vértices, {grafo.tamanho} arestas)...")
+        try:
+            hierarquia = HierarquiaContracao.construir(grafo)
+        except ValueError as e:
+            print(f"Erro ao construir hierarquia: {e}")
+            return
+        salvar_hierarquia(hierarquia, args.construir_hierarquia, [grafo.arquivo_cache] if grafo.arquivo_cache else ())
+        print(f"Hierarquia salva em: {args.construir_hierarquia} ({hierarquia.num_atalhos} atalhos)")
+        return
+
+    if args.pares:
+        if not Path(args.pares).exists():
+            print(f"Erro: Arquivo de pares não encontrado em {args.pares}")
+            return
+        try:
+            grafo, usar_normalizacao = carregar_grafo_dataset(args, path_nos, agregacao)
+        except Exception as e:
+            print(f"Erro ao carregar arquivos do grafo: {e}")
+            return
+        try:
+            executar_pares(grafo, args.pares, out_dir, normalizar=usar_normalizacao)
+        except ValueError as e:
+            print(f"Erro ao calcular os caminhos: {e}")
+        return
+
     if args.alg:
         print(f"Executando {args.alg}...")
         if not args.source:
             print(f"Erro: --source é obrigatório para executar {args.alg}.")
             return
-        if args.alg in ['DIJKSTRA', 'BELLMAN_FORD'] and not args.target:
+        if args.alg in ['DIJKSTRA', 'BELLMAN_FORD', 'ALT', 'CH'] and not args.target:
             print(f"Erro: --target é obrigatório para {args.alg}.")
             return
 
        
-        eh_parte2 = 'airport' in args.dataset.lower() or 'aeroporto' in args.dataset.lower()
-        
         try:
-            if eh_parte2:
-                print("[PARTE 2] Carregando grafo de aeroportos...")
-                grafo = carregar_dataset_parte2(args.dataset)
-                usar_normalizacao = False
-            else:
-                print("[PARTE 1] Carregando grafo de bairros...")
-                grafo = carregar_grafo(path_nos, path_arestas)
-                usar_normalizacao = True
-            
+            grafo, usar_normalizacao = carregar_grafo_dataset(args, path_nos, agregacao)
             print(f"Grafo carregado: {grafo.ordem} vértices, {grafo.tamanho} arestas.")
         except Exception as e:
             print(f"Erro ao carregar arquivos do grafo: {e}")
@@ -243,25 +354,21 @@ def main():
 
         try:
             
-            if usar_normalizacao:
-                origem_nome = normalizar_texto(args.source)
-                destino_nome = normalizar_texto(args.target) if args.target else None
-            else:
-                origem_nome = args.source
-                destino_nome = args.target
+            origem_nome = resolver_nome(grafo, args.source, usar_normalizacao)
+            destino_nome = resolver_nome(grafo, args.target, usar_normalizacao) if args.target else None
             
             if origem_nome not in grafo.vertices:
                 if usar_normalizacao:
-                    raise KeyError(f"Vértice de origem '{args.source}' (normalizado para '{origem_nome}') não encontrado.")
+                    raise KeyError(f"Vértice de origem '{args.source}' (normalizado para '{origem_nome}') não encontrado. {sugestoes_vertice(grafo, args.source)}")
                 else:
-                    raise KeyError(f"Vértice de origem '{origem_nome}' não encontrado. Vértices disponíveis: {sorted(list(grafo.vertices.keys()))[:10]}...")
+                    raise KeyError(f"Vértice de origem '{origem_nome}' não encontrado. {sugestoes_vertice(grafo, args.source)}")
             
             if destino_nome and destino_nome not in grafo.vertices:
                 if args.alg != 'BFS':
                     if usar_normalizacao:
-                        raise KeyError(f"Vértice de destino '{args.target}' (normalizado para '{destino_nome}') não encontrado.")
+                        raise KeyError(f"Vértice de destino '{args.target}' (normalizado para '{destino_nome}') não encontrado. {sugestoes_vertice(grafo, args.target)}")
                     else:
-                        raise KeyError(f"Vértice de destino '{destino_nome}' não encontrado. Vértices disponíveis: {sorted(list(grafo.vertices.keys()))[:10]}...")
+                        raise KeyError(f"Vértice de destino '{destino_nome}' não encontrado. {sugestoes_vertice(grafo, args.target)}")
 
         except KeyError as e:
             print(f"Erro: {e}")
@@ -279,6 +386,18 @@ def main():
                 else:
                     nome_arquivo = f"dijkstra_{origem_nome}_para_{destino_nome}.json"
 
+            elif args.alg == 'ALT':
+                tabelas = carregar_marcos(grafo, usar_cache=not args.sem_cache)
+                dist, caminho = Sorting.a_estrela_marcos(grafo, origem_nome, destino_nome, tabelas)
+                resultado = {"algoritmo": "A* (ALT)", "origem": origem_nome, "destino": destino_nome, "distancia_total": dist, "caminho": caminho}
+                nome_arquivo = f"alt_{origem_nome}_para_{destino_nome}.json"
+
+            elif args.alg == 'CH':
+                hierarquia = hierarquia_para(grafo, args.hierarquia[0] if args.hierarquia else None)
+                dist, caminho = hierarquia.caminho_mais_curto(origem_nome, destino_nome)
+                resultado = {"algoritmo": "Contraction Hierarchies", "origem": origem_nome, "destino": destino_nome, "distancia_total": dist, "caminho": caminho}
+                nome_arquivo = f"ch_{origem_nome}_para_{destino_nome}.json"
+
             elif args.alg == 'BELLMAN_FORD':
                 dist, caminho = grafo.caminho_mais_curto_bellman_ford(origem_nome, destino_nome)
                 resultado = {"algoritmo": "Bellman-Ford", "origem": origem_nome, "destino": destino_nome, "distancia_total": dist, "caminho": caminho}
@@ -310,7 +429,7 @@ def main():
     if args.server or args.interactive:
         try:
             from src.server import run_server
-            run_server()
+            run_server(args.port, args.hierarquia)
             return
         except ImportError as e:
             print(f"Erro crítico: Não foi possível importar o servidor. Verifique se src/server.py existe. Detalhes: {e}")
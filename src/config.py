@@ -5,6 +5,7 @@ SRC_DIR = ROOT_DIR / "src"
 DATA_DIR = ROOT_DIR / "data"
 OUT_DIR = ROOT_DIR / "out"
 TEMPLATES_DIR = SRC_DIR / "templates"
+CACHE_DIR = ROOT_DIR / ".cache"
 
 BAIRROS_FILE = DATA_DIR / "bairros_unique.csv"
 ARESTAS_FILE = DATA_DIR / "adjacencias_bairros.csv"
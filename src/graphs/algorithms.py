@@ -1,8 +1,17 @@
 import heapq
-from collections import deque
-from typing import List, Tuple, Union
+import math
+import os
+import threading
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from src.graphs.graph import Grafo, GrafoDirecionado, Vertice
+import numpy as np
+
+from src.graphs.graph import Grafo, GrafoCSR, GrafoDirecionado, Vertice
 
 
 class PositiveFloat(float):
@@ -11,59 +20,958 @@ class PositiveFloat(float):
             raise ValueError("Valor deve ser um número float positivo")
         return super(PositiveFloat, cls).__new__(cls, value)
 
+class CicloNegativoError(ValueError):
+    """Ciclo negativo alcançável a partir da origem; ``ciclo`` lista os vértices na ordem do ciclo."""
+
+    def __init__(self, ciclo: List[str]):
+        self.ciclo = ciclo
+        super().__init__(f"Grafo contém ciclo negativo: {' -> '.join(ciclo + ciclo[:1])}")
+
+
+class TabelasMarcos:
+    """Distâncias pré-computadas de/para os marcos (landmarks) usadas pelo A* ALT.
+
+    ``ida[i][v]`` é a distância do marco ``marcos[i]`` até o vértice ``v`` e
+    ``volta[i][v]`` a distância de ``v`` até o marco, com os vértices na ordem
+    de ``nomes`` (a mesma de ``grafo.vertices``). Pela desigualdade
+    triangular, ``ida[i][t] - ida[i][v]`` e ``volta[i][v] - volta[i][t]`` são
+    limites inferiores de ``d(v, t)``. As tabelas valem para o grafo no
+    momento do cálculo.
+    """
+
+    def __init__(self, nomes, marcos: List[int], ida: List[array], volta: List[array], direcionado: bool, estrategia: str = ''):
+        self.nomes = tuple(nomes)
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}
+        self.marcos = list(marcos)
+        self.ida = ida
+        self.volta = volta
+        self.direcionado = direcionado
+        self.estrategia = estrategia
+
+    def __len__(self) -> int:
+        return len(self.marcos)
+
+    def indice(self, vertice) -> int:
+        nome = str(vertice)
+        if nome not in self.indices:
+            raise ValueError(f"Vértice '{nome}' não está nas tabelas de marcos.")
+        return self.indices[nome]
+
+    def heuristica(self, s: int, t: int, num_ativos: int):
+        """Função ``h(v)`` para buscas até ``t``, usando os ``num_ativos`` marcos com o melhor limite em ``s``."""
+        infinito = float('inf')
+        termos = [(self.ida[i], self.ida[i][t], self.volta[i], self.volta[i][t]) for i in range(len(self))]
+
+        def limite(v: int, termos_usados) -> float:
+            melhor = 0.0
+            for ida, ida_t, volta, volta_t in termos_usados:
+                ida_v = ida[v]
+                if ida_v != infinito:
+                    # O marco alcança v mas não t: v também não alcança t.
+                    if ida_t == infinito:
+                        return infinito
+                    if ida_t - ida_v > melhor:
+                        melhor = ida_t - ida_v
+                if volta_t != infinito:
+                    volta_v = volta[v]
+                    if volta_v == infinito:
+                        return infinito
+                    if volta_v - volta_t > melhor:
+                        melhor = volta_v - volta_t
+            return melhor
+
+        if num_ativos < len(termos):
+            termos.sort(key=lambda termo: limite(s, [termo]), reverse=True)
+            termos = termos[:num_ativos]
+        return lambda v: limite(v, termos)
+
+
+def _infinito() -> float:
+    return float('inf')
+
+
+class MapaEsparso(Mapping):
+    """Mapa ``vértice -> valor`` que só guarda os vértices alcançados (``alcancados``).
+
+    Os demais vértices de ``universo`` valem ``padrao()`` sem ocupar memória.
+    A iteração percorre o universo inteiro, começando por ``primeiro``.
+    """
+
+    __slots__ = ('alcancados', 'universo', 'padrao', 'primeiro')
+
+    def __init__(self, alcancados: dict, universo, padrao, primeiro: str = None):
+        self.alcancados = alcancados
+        self.universo = universo
+        self.padrao = padrao
+        self.primeiro = primeiro
+
+    def __getitem__(self, nome):
+        if nome in self.alcancados:
+            return self.alcancados[nome]
+        if nome in self.universo:
+            return self.padrao()
+        raise KeyError(nome)
+
+    def __contains__(self, nome) -> bool:
+        return nome in self.alcancados or nome in self.universo
+
+    def __iter__(self):
+        primeiro = self.primeiro
+        if primeiro is not None:
+            yield primeiro
+        for nome in self.universo:
+            if nome != primeiro:
+                yield nome
+
+    def __len__(self) -> int:
+        return len(self.universo)
+
+    def __repr__(self) -> str:
+        return f"MapaEsparso({self.alcancados!r}, padrao={self.padrao()!r}, total={len(self)})"
+
+
+class MatrizDistancias:
+    """Distâncias entre todos os pares numa matriz densa ``n x n`` (``float64``, ``inf`` sem caminho).
+
+    ``anteriores[i, j]`` (opcional, ``int32``) é o vértice anterior a ``j``
+    no caminho mínimo a partir de ``i`` (-1 quando não há caminho ou ``i == j``).
+    """
+
+    def __init__(self, nomes, distancias: np.ndarray, anteriores: Optional[np.ndarray] = None):
+        self.nomes = tuple(nomes)
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}
+        self.distancias = distancias
+        self.anteriores = anteriores
+
+    @property
+    def ordem(self) -> int:
+        return len(self.nomes)
+
+    def indice(self, vertice) -> int:
+        nome = str(vertice)
+        if nome not in self.indices:
+            raise ValueError(f"Vértice '{nome}' não está na matriz de distâncias.")
+        return self.indices[nome]
+
+    def distancia(self, origem, destino) -> float:
+        return float(self.distancias[self.indice(origem), self.indice(destino)])
+
+    def matriz_distancias(self, origens, destinos) -> List[List[float]]:
+        """``matriz[i][j] = distancia(origens[i], destinos[j])``, como em ``OraculoHubs``."""
+        linhas = [self.indice(o) for o in origens]
+        colunas = [self.indice(d) for d in destinos]
+        return self.distancias[np.ix_(linhas, colunas)].tolist()
+
+    def caminho_mais_curto(self, origem, destino) -> Tuple[float, List[str]]:
+        if self.anteriores is None:
+            raise ValueError("Matriz calculada sem predecessores (use anteriores=True).")
+        s, t = self.indice(origem), self.indice(destino)
+        distancia = float(self.distancias[s, t])
+        if distancia == float('inf'):
+            return distancia, []
+
+        linha = self.anteriores[s]
+        caminho = [t]
+        while caminho[-1] != s:
+            caminho.append(int(linha[caminho[-1]]))
+        caminho.reverse()
+        return distancia, [self.nomes[i] for i in caminho]
+
+
+# Heurística de Beamer para a BFS por níveis: passa a bottom-up quando as
+# arestas da fronteira superam 1/ALFA das arestas de entrada ainda não
+# visitadas, e volta a top-down quando a fronteira cai abaixo de n/BETA.
+# Vetorizado, o bottom-up não para no primeiro pai encontrado e lê todas as
+# arestas de entrada pendentes, por isso ALFA = 1 e não os 14 do artigo
+# (medido: 157 ms contra 338 ms com 200 mil vértices de grau 10).
+ALFA_BFS_DIRECIONAL = 1
+BETA_BFS_DIRECIONAL = 24
+
+
+def _posicoes_arestas(offsets: np.ndarray, graus: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Posições das listas de adjacência de ``vertices``, concatenadas na ordem dada, e o grau de cada um."""
+    contagens = graus[vertices]
+    deslocamentos = offsets[vertices] - np.cumsum(contagens) + contagens
+    return np.repeat(deslocamentos, contagens) + np.arange(contagens.sum()), contagens
+
+
+class BFSDirecional:
+    """BFS por níveis sobre vetores NumPy de um ``GrafoCSR``, alternando top-down e bottom-up.
+
+    Top-down expande as arestas de saída da fronteira; bottom-up procura,
+    para cada vértice não visitado, pais na fronteira pelas arestas de
+    entrada. Nos dois modos o pai escolhido é o que a BFS com fila daria
+    (menor posição de visita, depois ordem na lista de adjacência), então
+    o resultado de ``executar`` é igual ao de ``Sorting.breadth_first_search``.
+    Os vetores são montados uma vez por grafo e servem a todas as origens.
+    """
+
+    def __init__(self, grafo: Union[Grafo, GrafoCSR], alfa: float = ALFA_BFS_DIRECIONAL, beta: float = BETA_BFS_DIRECIONAL):
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        n = csr.ordem
+        self.grafo = csr
+        self.alfa = alfa
+        self.beta = beta
+        self.offsets = np.asarray(csr.offsets, dtype=np.int64)
+        self.vizinhos = np.asarray(csr.vizinhos, dtype=np.int64)
+        self.graus = np.diff(self.offsets)
+
+        # Arestas de entrada agrupadas por destino, com a posição da aresta original.
+        self.arestas_entrada = np.argsort(self.vizinhos, kind='stable')
+        self.origens_entrada = np.repeat(np.arange(n, dtype=np.int64), self.graus)[self.arestas_entrada]
+        self.graus_entrada = np.bincount(self.vizinhos, minlength=n).astype(np.int64)
+        self.offsets_entrada = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.graus_entrada, out=self.offsets_entrada[1:])
+
+    def percorrer(self, inicio) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(nivel, pai, ordem_visita)`` em índices do CSR; ``nivel`` e ``pai`` valem -1 fora do alcance."""
+        s = self.grafo.indice(inicio)
+        n = self.grafo.ordem
+        nivel = np.full(n, -1, dtype=np.int64)
+        pai = np.full(n, -1, dtype=np.int64)
+        posicao = np.full(n, -1, dtype=np.int64)
+        nivel[s] = 0
+        posicao[s] = 0
+
+        fronteira = np.array([s], dtype=np.int64)
+        ordem_visita = [fronteira]
+        visitados = 1
+        arestas_restantes = int(self.graus_entrada.sum() - self.graus_entrada[s])
+        profundidade = 0
+        bottom_up = False
+
+        while fronteira.size:
+            profundidade += 1
+            if bottom_up:
+                bottom_up = fronteira.size >= n / self.beta
+            else:
+                bottom_up = int(self.graus[fronteira].sum()) > arestas_restantes / self.alfa
+
+            if bottom_up:
+                candidatos = np.flatnonzero(nivel == -1)
+                posicoes, contagens = _posicoes_arestas(self.offsets_entrada, self.graus_entrada, candidatos)
+                pais = self.origens_entrada[posicoes]
+                na_fronteira = nivel[pais] == profundidade - 1
+                filhos = np.repeat(candidatos, contagens)[na_fronteira]
+                pais = pais[na_fronteira]
+                ordem = np.lexsort((self.arestas_entrada[posicoes][na_fronteira], posicao[pais]))
+                filhos, pais = filhos[ordem], pais[ordem]
+            else:
+                posicoes, contagens = _posicoes_arestas(self.offsets, self.graus, fronteira)
+                filhos = self.vizinhos[posicoes]
+                novos = nivel[filhos] == -1
+                filhos = filhos[novos]
+                pais = np.repeat(fronteira, contagens)[novos]
+
+            # A primeira ocorrência de cada filho, na ordem da fila, define o pai.
+            _, primeiras = np.unique(filhos, return_index=True)
+            primeiras.sort()
+            fronteira = filhos[primeiras]
+            nivel[fronteira] = profundidade
+            pai[fronteira] = pais[primeiras]
+            posicao[fronteira] = np.arange(visitados, visitados + fronteira.size)
+            visitados += fronteira.size
+            arestas_restantes -= int(self.graus_entrada[fronteira].sum())
+            ordem_visita.append(fronteira)
+
+        return nivel, pai, np.concatenate(ordem_visita)
+
+    def executar(self, inicio):
+        """Mesmo dicionário de ``Sorting.breadth_first_search``."""
+        nivel, pai, ordem_visita = self.percorrer(inicio)
+        return _resultado_bfs_csr(self.grafo, ordem_visita.tolist(), nivel.tolist(), pai.tolist())
+
+
+def _resultado_bfs_csr(grafo: GrafoCSR, ordem_visita: List[int], nivel: List[int], pai: List[int]) -> dict:
+    nomes = grafo.nomes
+    origem = nomes[ordem_visita[0]]
+    niveis = {nomes[v]: nivel[v] for v in ordem_visita}
+    arvore = {}
+    anterior = {origem: None}
+    for v in ordem_visita[1:]:
+        anterior[nomes[v]] = nomes[pai[v]]
+        arvore.setdefault(nomes[pai[v]], []).append(nomes[v])
+
+    # Mesmo ``primeiro`` da versão sobre o Grafo: a iteração começa pela origem.
+    return {
+        'niveis': MapaEsparso(niveis, grafo.indices, _infinito, origem),
+        'distancias': MapaEsparso(niveis, grafo.indices, _infinito, origem),
+        'anterior': anterior,
+        'arvore': MapaEsparso(arvore, grafo.indices, list, origem),
+        'ordem_visita': [nomes[v] for v in ordem_visita]
+    }
+
+
+# Memória padrão das árvores de caminhos mínimos guardadas por grafo.
+MEMORIA_CACHE_ARVORES = 64 * 1024 * 1024
+
+
+class ArvoreCaminhos:
+    """Árvore de caminhos mínimos de uma origem: ``distancias[v]`` e ``anterior[v]`` (-1 sem predecessor)."""
+
+    __slots__ = ('grafo', 'origem', 'distancias', 'anterior')
+
+    def __init__(self, grafo: GrafoCSR, origem: int, distancias: array, anterior: array):
+        self.grafo = grafo
+        self.origem = origem
+        self.distancias = distancias
+        self.anterior = anterior
+
+    @property
+    def bytes(self) -> int:
+        return self.distancias.itemsize * len(self.distancias) + self.anterior.itemsize * len(self.anterior)
+
+    def distancia(self, destino) -> float:
+        return self.distancias[self.grafo.indice(destino)]
+
+    def caminho_mais_curto(self, destino) -> Tuple[float, List[str]]:
+        t = self.grafo.indice(destino)
+        if self.distancias[t] == float('inf'):
+            return float('inf'), []
+        return self.distancias[t], Sorting._reconstruir_caminho_csr(self.grafo, self.anterior, self.origem, t)
+
+
+# Cria o CacheArvores de cada grafo uma única vez, mesmo com várias threads.
+_TRAVA_CACHE_ARVORES = threading.Lock()
+
+
+class CacheArvores:
+    """LRU de árvores de caminhos mínimos de um grafo, limitado a ``memoria_maxima`` bytes.
+
+    As chaves são ``(versao do grafo, algoritmo, chave_peso, origem)``; quando
+    a versão do grafo muda (vértice ou aresta adicionado/removido) todas as
+    entradas e os snapshots CSR são descartados. Pode ser compartilhado entre
+    threads (ex.: requisições do servidor).
+    """
+
+    def __init__(self, memoria_maxima: int = MEMORIA_CACHE_ARVORES):
+        self.memoria_maxima = memoria_maxima
+        self.memoria = 0
+        self.versao = None
+        self.arvores: 'OrderedDict[tuple, ArvoreCaminhos]' = OrderedDict()
+        self.snapshots: Dict[str, GrafoCSR] = {}
+        self.acertos = 0
+        self.faltas = 0
+        self._trava = threading.RLock()
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['_trava']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._trava = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.arvores)
+
+    def limpar(self) -> None:
+        with self._trava:
+            self.arvores.clear()
+            self.snapshots.clear()
+            self.memoria = 0
+
+    def _sincronizar(self, versao) -> None:
+        if versao != self.versao:
+            self.limpar()
+            self.versao = versao
+
+    def snapshot(self, grafo: Union[Grafo, GrafoCSR], chave_peso: str) -> GrafoCSR:
+        with self._trava:
+            self._sincronizar(getattr(grafo, 'versao', 0))
+            if isinstance(grafo, GrafoCSR):
+                if chave_peso != 'peso':
+                    raise ValueError("Snapshots CSR só têm a coluna 'peso'.")
+                return grafo
+            if chave_peso not in self.snapshots:
+                self.snapshots[chave_peso] = grafo.to_csr(chave_peso)
+            return self.snapshots[chave_peso]
+
+    def obter(self, chave: tuple) -> Optional[ArvoreCaminhos]:
+        with self._trava:
+            arvore = self.arvores.get(chave)
+            if arvore is None:
+                self.faltas += 1
+                return None
+            self.arvores.move_to_end(chave)
+            self.acertos += 1
+            return arvore
+
+    def guardar(self, chave: tuple, arvore: ArvoreCaminhos) -> None:
+        if arvore.bytes > self.memoria_maxima:
+            return
+        with self._trava:
+            # Duas threads podem calcular a mesma árvore; a segunda substitui a primeira.
+            anterior = self.arvores.pop(chave, None)
+            if anterior is not None:
+                self.memoria -= anterior.bytes
+            self.arvores[chave] = arvore
+            self.memoria += arvore.bytes
+            while self.memoria > self.memoria_maxima:
+                _, antiga = self.arvores.popitem(last=False)
+                self.memoria -= antiga.bytes
+
+
+# Floyd–Warshall (matrizes n x n, n passadas O(n²) em numpy) só até este
+# número de vértices, e só se n² <= CELULAS_POR_ARESTA_FLOYD * arestas: uma
+# célula do numpy custa ~1/120 de uma aresta relaxada no Dijkstra em Python
+# (grade 20x20: empate; 700 vértices e 164 mil arestas: 14x mais rápido).
+LIMITE_FLOYD_WARSHALL = 2000
+CELULAS_POR_ARESTA_FLOYD = 120
+
+# Abaixo deste número de origens, subir o pool de processos custa mais que os Dijkstras.
+MINIMO_ORIGENS_PARALELO = 256
+
+# Snapshot reponderado usado pelos processos do pool do Johnson.
+_GRAFO_JOHNSON: Optional[GrafoCSR] = None
+
+
+def _iniciar_processo_johnson(grafo: GrafoCSR) -> None:
+    global _GRAFO_JOHNSON
+    _GRAFO_JOHNSON = grafo
+
+
+def _linhas_johnson(origens: List[int], com_anteriores: bool, grafo: GrafoCSR = None) -> List[Tuple[bytes, bytes]]:
+    grafo = grafo or _GRAFO_JOHNSON
+    linhas = []
+    for s in origens:
+        distancias, anterior = Sorting._arvore_dijkstra_csr(grafo, s)
+        linhas.append((distancias.tobytes(), anterior.tobytes() if com_anteriores else b''))
+    return linhas
+
+
+# Pesos com até tantas casas decimais viram inteiros exatos (escala 10^k).
+CASAS_DECIMAIS_MAXIMAS = 4
+# Acima deste peso inteiro máximo, a varredura dos buckets do Dial deixa de
+# compensar frente ao heapq (medido em grades de 22 mil vértices).
+MAXIMO_BUCKETS_DIAL = 128
+
+
+class PerfilPesos:
+    """Distribuição dos pesos de um grafo e a fila de prioridade indicada para o Dijkstra.
+
+    Quando todos os pesos viram inteiros ao multiplicar por ``escala``
+    (10^k, k <= ``CASAS_DECIMAIS_MAXIMAS``), ``inteiros`` guarda os pesos
+    escalados no mesmo índice do vetor de pesos do grafo. ``fila`` é
+    ``'dial'`` quando o maior peso escalado cabe em ``MAXIMO_BUCKETS_DIAL``
+    buckets e ``'heap'`` nos demais casos: no CPython o radix heap perde
+    para o ``heapq`` (em C) mesmo com pesos inteiros grandes, então ele só
+    é usado quando pedido explicitamente.
+    """
+
+    def __init__(self, fila: str, escala: int = None, peso_maximo: int = 0, distintos: int = 0, inteiros: array = None):
+        self.fila = fila
+        self.escala = escala
+        self.peso_maximo = peso_maximo
+        self.distintos = distintos
+        self.inteiros = inteiros
+
+    @classmethod
+    def analisar(cls, grafo: Union[Grafo, GrafoCSR]) -> 'PerfilPesos':
+        if isinstance(grafo, GrafoCSR):
+            pesos = grafo.pesos
+            ids = range(len(pesos))
+        else:
+            # Ids livres (arestas removidas) guardam pesos obsoletos.
+            pesos = grafo.colunas_arestas.pesos
+            ids = {id_aresta for vizinhos in grafo.mapa_adjacencia.values() for id_aresta in vizinhos.values()}
+
+        valores = {pesos[i] for i in ids}
+        if not all(p >= 0 and math.isfinite(p) for p in valores):
+            return cls('heap', distintos=len(valores))
+
+        for casas in range(CASAS_DECIMAIS_MAXIMAS + 1):
+            escala = 10 ** casas
+            if all(abs(p * escala - round(p * escala)) <= 1e-9 * max(1.0, p * escala) for p in valores):
+                break
+        else:
+            return cls('heap', distintos=len(valores))
+
+        inteiros = array('q', [0]) * len(pesos)
+        for i in ids:
+            inteiros[i] = round(pesos[i] * escala)
+        peso_maximo = max(inteiros) if inteiros else 0
+        fila = 'dial' if peso_maximo <= MAXIMO_BUCKETS_DIAL else 'heap'
+        return cls(fila, escala, peso_maximo, len(valores), inteiros)
+
+
 class Sorting:
     @staticmethod
-    def dijkstra(grafo: Grafo, inicio: Vertice, fim: Vertice):
-        distancias = {}
+    def dijkstra(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice):
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._dijkstra_csr(grafo, inicio, fim)
+
+        # Ponto a ponto: para assim que o destino é fixado e descarta as
+        # entradas obsoletas do heap, sem inicializar distâncias para o grafo todo.
+        origem, destino = str(inicio), str(fim)
+        distancias = {origem: 0}
         visitados = set()
         anterior = {}
-        fila: List[Tuple[int, str]] = []
-        
-        for nome in grafo.vertices:
-            distancias[nome] = float('inf')
-            
-        distancias[inicio.nome] = 0
-        heapq.heappush(fila, (0, inicio.nome))
+        fila: List[Tuple[float, str]] = [(0, origem)]
+        pesos = grafo.colunas_arestas.pesos
+        infinito = float('inf')
         
         while fila:
-            _, nome_atual = heapq.heappop(fila)
-            vertice = grafo.vertices[nome_atual]
-            
-            visitados.add(vertice)
+            distancia_atual, nome_atual = heapq.heappop(fila)
+            if nome_atual in visitados:
+                continue
+            visitados.add(nome_atual)
+            if nome_atual == destino:
+                break
             
-            for vizinho in vertice.vizinhos:
-                if vizinho in visitados: continue
+            for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome_atual].items():
+                if nome_vizinho in visitados: continue
     
-                peso_aresta = grafo.obter_peso(nome_atual, vizinho.nome)
+                peso_aresta = pesos[id_aresta]
                 if peso_aresta < 0:
                     raise ValueError("Dijkstra não suporta pesos negativos")
                     
-                nova_distancia = distancias[nome_atual] + peso_aresta
+                nova_distancia = distancia_atual + peso_aresta
                 
-                if nova_distancia < distancias[vizinho.nome]:
-                    distancias[vizinho.nome] = nova_distancia
-                    anterior[vizinho.nome] = nome_atual
-                    heapq.heappush(fila, (nova_distancia, vizinho.nome))
+                if nova_distancia < distancias.get(nome_vizinho, infinito):
+                    distancias[nome_vizinho] = nova_distancia
+                    anterior[nome_vizinho] = nome_atual
+                    heapq.heappush(fila, (nova_distancia, nome_vizinho))
 
-        caminho = []
-        atual = fim.nome
+        if destino not in visitados:
+            return infinito, []
         
-        if atual not in anterior and atual != inicio.nome:
-            return float('inf'), []
-        
-        while atual is not None:
+        return distancias[destino], Sorting._reconstruir_caminho(anterior, origem, destino)
+
+    @staticmethod
+    def caminhos_em_lote(grafo: Union[Grafo, GrafoCSR], pares: Iterable[Tuple[Vertice, Vertice]]) -> List[Tuple[float, List[str]]]:
+        """``Sorting.dijkstra`` para cada ``(origem, destino)`` de ``pares``, na mesma ordem.
+
+        Os pares são agrupados pela origem: uma única busca por origem
+        distinta, que para quando todos os destinos dela foram fixados, e
+        todos os caminhos saem do mesmo mapa de predecessores.
+        """
+        pares = [(str(origem), str(destino)) for origem, destino in pares]
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._caminhos_em_lote_csr(grafo, pares)
+
+        destinos_por_origem: Dict[str, set] = {}
+        for origem, destino in pares:
+            for nome in (origem, destino):
+                if nome not in grafo.vertices:
+                    raise ValueError(f"Vértice '{nome}' não encontrado no grafo.")
+            destinos_por_origem.setdefault(origem, set()).add(destino)
+
+        pesos = grafo.colunas_arestas.pesos
+        infinito = float('inf')
+        resultados = {}
+        for origem, destinos in destinos_por_origem.items():
+            distancias = {origem: 0}
+            visitados = set()
+            anterior = {}
+            fila: List[Tuple[float, str]] = [(0, origem)]
+            restantes = len(destinos)
+
+            while fila:
+                distancia_atual, nome_atual = heapq.heappop(fila)
+                if nome_atual in visitados:
+                    continue
+                visitados.add(nome_atual)
+                if nome_atual in destinos:
+                    restantes -= 1
+                    if not restantes:
+                        break
+
+                for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome_atual].items():
+                    if nome_vizinho in visitados:
+                        continue
+
+                    peso_aresta = pesos[id_aresta]
+                    if peso_aresta < 0:
+                        raise ValueError("Dijkstra não suporta pesos negativos")
+
+                    nova_distancia = distancia_atual + peso_aresta
+                    if nova_distancia < distancias.get(nome_vizinho, infinito):
+                        distancias[nome_vizinho] = nova_distancia
+                        anterior[nome_vizinho] = nome_atual
+                        heapq.heappush(fila, (nova_distancia, nome_vizinho))
+
+            for destino in destinos:
+                if destino in visitados:
+                    resultados[origem, destino] = (distancias[destino], Sorting._reconstruir_caminho(anterior, origem, destino))
+                else:
+                    resultados[origem, destino] = (infinito, [])
+
+        return [resultados[par] for par in pares]
+
+    @staticmethod
+    def cache_arvores(grafo: Union[Grafo, GrafoCSR]) -> CacheArvores:
+        """``CacheArvores`` do grafo, criado na primeira consulta (ajuste ``memoria_maxima`` nele)."""
+        if grafo._arvores is None:
+            with _TRAVA_CACHE_ARVORES:
+                if grafo._arvores is None:
+                    grafo._arvores = CacheArvores()
+        return grafo._arvores
+
+    @staticmethod
+    def arvore_caminhos(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, algoritmo: str = 'dijkstra', chave_peso: str = 'peso') -> ArvoreCaminhos:
+        """Árvore de caminhos mínimos a partir de ``inicio``, guardada no ``cache_arvores`` do grafo.
+
+        ``algoritmo`` é ``'dijkstra'`` ou ``'bellman_ford'`` (SPFA, aceita pesos
+        negativos e levanta ``CicloNegativoError``); ``chave_peso`` é o
+        atributo numérico das arestas usado como peso.
+        """
+        if algoritmo not in ('dijkstra', 'bellman_ford'):
+            raise ValueError(f"Algoritmo '{algoritmo}' não suportado (use 'dijkstra' ou 'bellman_ford').")
+        cache = Sorting.cache_arvores(grafo)
+        csr = cache.snapshot(grafo, chave_peso)
+        s = csr.indice(inicio)
+        chave = (cache.versao, algoritmo, chave_peso, s)
+        arvore = cache.obter(chave)
+        if arvore is not None:
+            return arvore
+
+        if algoritmo == 'dijkstra':
+            if any(peso < 0 for peso in csr.pesos):
+                raise ValueError("Dijkstra não suporta pesos negativos")
+            distancias, anterior = Sorting._arvore_dijkstra_csr(csr, s)
+        else:
+            distancias, anterior, ciclo = Sorting._spfa_csr(csr, [s])
+            if ciclo:
+                raise CicloNegativoError([csr.nomes[i] for i in ciclo])
+            distancias, anterior = array('d', distancias), array('q', anterior)
+
+        arvore = ArvoreCaminhos(csr, s, distancias, anterior)
+        cache.guardar(chave, arvore)
+        return arvore
+
+    @staticmethod
+    def caminho_pela_arvore(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice, algoritmo: str = 'dijkstra', chave_peso: str = 'peso') -> Tuple[float, List[str]]:
+        """``(distancia, caminho)`` pela árvore em cache da origem: consultas repetidas só percorrem predecessores."""
+        return Sorting.arvore_caminhos(grafo, inicio, algoritmo, chave_peso).caminho_mais_curto(fim)
+
+    @staticmethod
+    def _reconstruir_caminho(anterior: dict, inicio: str, fim: str) -> List[str]:
+        caminho = [fim]
+        while caminho[-1] != inicio:
+            caminho.append(anterior[caminho[-1]])
+        caminho.reverse()
+        return caminho
+
+    @staticmethod
+    def dijkstra_bidirecional(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], inicio: Vertice, fim: Vertice):
+        """Dijkstra ponto a ponto com buscas simultâneas a partir da origem e do destino.
+
+        A busca reversa usa ``mapa_adjacencia_reverso`` (em grafos não
+        direcionados, o próprio mapa). Cada passo expande o lado com a menor
+        distância no topo do heap; a busca termina quando a soma dos dois
+        topos alcança o melhor caminho já encontrado. Retorna o mesmo
+        ``(distancia, caminho)`` de ``dijkstra``.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._dijkstra_bidirecional_csr(grafo, inicio, fim)
+
+        origem, destino = str(inicio), str(fim)
+        if origem == destino:
+            return 0, [origem]
+
+        pesos = grafo.colunas_arestas.pesos
+        infinito = float('inf')
+        mapas = (grafo.mapa_adjacencia, grafo.mapa_adjacencia_reverso)
+        distancias = ({origem: 0}, {destino: 0})
+        anteriores = ({}, {})
+        visitados = (set(), set())
+        filas = ([(0, origem)], [(0, destino)])
+        melhor, encontro = infinito, None
+
+        while filas[0] and filas[1]:
+            topo_ida, topo_volta = filas[0][0][0], filas[1][0][0]
+            if topo_ida + topo_volta >= melhor:
+                break
+
+            lado = 0 if topo_ida <= topo_volta else 1
+            distancia_atual, nome_atual = heapq.heappop(filas[lado])
+            if nome_atual in visitados[lado]:
+                continue
+            visitados[lado].add(nome_atual)
+
+            fila, dist, anterior = filas[lado], distancias[lado], anteriores[lado]
+            dist_outro = distancias[1 - lado]
+            for nome_vizinho, id_aresta in mapas[lado][nome_atual].items():
+                peso_aresta = pesos[id_aresta]
+                if peso_aresta < 0:
+                    raise ValueError("Dijkstra não suporta pesos negativos")
+
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < dist.get(nome_vizinho, infinito):
+                    dist[nome_vizinho] = nova_distancia
+                    anterior[nome_vizinho] = nome_atual
+                    heapq.heappush(fila, (nova_distancia, nome_vizinho))
+
+                if nome_vizinho in dist_outro:
+                    total = dist[nome_vizinho] + dist_outro[nome_vizinho]
+                    if total < melhor:
+                        melhor, encontro = total, nome_vizinho
+
+        if encontro is None:
+            return infinito, []
+
+        caminho = Sorting._reconstruir_caminho(anteriores[0], origem, encontro)
+        atual = encontro
+        while atual != destino:
+            atual = anteriores[1][atual]
             caminho.append(atual)
-            atual = anterior.get(atual)
-            if atual == inicio.nome:
-                caminho.append(atual)
+        return Sorting._distancia_caminho(grafo, caminho), caminho
+
+    @staticmethod
+    def perfil_pesos(grafo: Union[Grafo, GrafoCSR]) -> PerfilPesos:
+        """``PerfilPesos`` do grafo, calculado uma vez e descartado quando uma aresta muda."""
+        if grafo._perfil_pesos is None:
+            grafo._perfil_pesos = PerfilPesos.analisar(grafo)
+        return grafo._perfil_pesos
+
+    @staticmethod
+    def _perfil_inteiro(grafo: Union[Grafo, GrafoCSR]) -> PerfilPesos:
+        perfil = Sorting.perfil_pesos(grafo)
+        if perfil.inteiros is None:
+            raise ValueError("Dial/radix heap exigem pesos não negativos com no máximo "
+                             f"{CASAS_DECIMAIS_MAXIMAS} casas decimais")
+        return perfil
+
+    @staticmethod
+    def _distancia_caminho(grafo: Grafo, caminho: List[str]) -> float:
+        """Peso do caminho somado da origem para o destino.
+
+        É a mesma ordem de soma do ``dijkstra``, então buscas que só
+        reconstroem o caminho devolvem exatamente a mesma distância em ponto flutuante.
+        """
+        pesos = grafo.colunas_arestas.pesos
+        distancia = 0
+        for u, v in zip(caminho, caminho[1:]):
+            distancia += pesos[grafo.mapa_adjacencia[u][v]]
+        return distancia
+
+    @staticmethod
+    def dijkstra_automatico(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice):
+        """Dijkstra com a fila escolhida pelo ``perfil_pesos`` do grafo (Dial ou heapq)."""
+        if Sorting.perfil_pesos(grafo).fila == 'dial':
+            return Sorting.dijkstra_dial(grafo, inicio, fim)
+        return Sorting.dijkstra(grafo, inicio, fim)
+
+    @staticmethod
+    def dijkstra_dial(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice):
+        """Dijkstra com fila de buckets (Dial) sobre os pesos escalados para inteiros.
+
+        Como toda distância pendente está em ``[atual, atual + peso_maximo]``,
+        bastam ``peso_maximo + 1`` buckets circulares; cada operação da fila
+        é um ``append``/``pop`` de lista. Retorna o mesmo ``(distancia, caminho)``
+        de ``dijkstra``.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._dijkstra_dial_csr(grafo, inicio, fim)
+
+        perfil = Sorting._perfil_inteiro(grafo)
+        inteiros = perfil.inteiros
+        origem, destino = str(inicio), str(fim)
+        tamanho = perfil.peso_maximo + 1
+        buckets: List[List[str]] = [[] for _ in range(tamanho)]
+        buckets[0].append(origem)
+        distancias = {origem: 0}
+        anterior = {}
+        visitados = set()
+        atual, pendentes = 0, 1
+
+        while pendentes:
+            bucket = buckets[atual % tamanho]
+            if not bucket:
+                atual += 1
+                continue
+            nome_atual = bucket.pop()
+            pendentes -= 1
+            if nome_atual in visitados or distancias[nome_atual] != atual:
+                continue
+            visitados.add(nome_atual)
+            if nome_atual == destino:
                 break
-        
-        caminho.reverse()
-        
-        return distancias[fim.nome], caminho
+
+            for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome_atual].items():
+                nova_distancia = atual + inteiros[id_aresta]
+                if nova_distancia < distancias.get(nome_vizinho, nova_distancia + 1):
+                    distancias[nome_vizinho] = nova_distancia
+                    anterior[nome_vizinho] = nome_atual
+                    buckets[nova_distancia % tamanho].append(nome_vizinho)
+                    pendentes += 1
+
+        if destino not in visitados:
+            return float('inf'), []
+
+        caminho = Sorting._reconstruir_caminho(anterior, origem, destino)
+        return Sorting._distancia_caminho(grafo, caminho), caminho
 
     @staticmethod
-    def bellman_ford(grafo: Union[Grafo, GrafoDirecionado], inicio: Vertice, fim: Vertice = None):
+    def dijkstra_radix(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice):
+        """Dijkstra com radix heap sobre os pesos escalados para inteiros.
+
+        O bucket ``i`` guarda as chaves cujo bit mais alto diferente da última
+        chave removida é ``i``; só o primeiro bucket não vazio é redistribuído
+        quando o bucket 0 esvazia. Não depende do peso máximo como o Dial.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._dijkstra_radix_csr(grafo, inicio, fim)
+
+        perfil = Sorting._perfil_inteiro(grafo)
+        inteiros = perfil.inteiros
+        origem, destino = str(inicio), str(fim)
+        buckets: List[List[Tuple[int, str]]] = [[] for _ in range((perfil.peso_maximo * grafo.ordem).bit_length() + 2)]
+        buckets[0].append((0, origem))
+        distancias = {origem: 0}
+        anterior = {}
+        visitados = set()
+        ultimo, pendentes = 0, 1
+
+        while pendentes:
+            if not buckets[0]:
+                i = 1
+                while not buckets[i]:
+                    i += 1
+                itens, buckets[i] = buckets[i], []
+                ultimo = min(chave for chave, _ in itens)
+                for item in itens:
+                    buckets[(item[0] ^ ultimo).bit_length()].append(item)
+            distancia_atual, nome_atual = buckets[0].pop()
+            pendentes -= 1
+            if nome_atual in visitados or distancias[nome_atual] != distancia_atual:
+                continue
+            visitados.add(nome_atual)
+            if nome_atual == destino:
+                break
+
+            for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome_atual].items():
+                nova_distancia = distancia_atual + inteiros[id_aresta]
+                if nova_distancia < distancias.get(nome_vizinho, nova_distancia + 1):
+                    distancias[nome_vizinho] = nova_distancia
+                    anterior[nome_vizinho] = nome_atual
+                    buckets[(nova_distancia ^ ultimo).bit_length()].append((nova_distancia, nome_vizinho))
+                    pendentes += 1
+
+        if destino not in visitados:
+            return float('inf'), []
+
+        caminho = Sorting._reconstruir_caminho(anterior, origem, destino)
+        return Sorting._distancia_caminho(grafo, caminho), caminho
+
+    @staticmethod
+    def calcular_tabelas_marcos(grafo: Union[Grafo, GrafoCSR], k: int = 8, estrategia: str = 'distante') -> TabelasMarcos:
+        """Escolhe ``k`` marcos e calcula as distâncias de/para cada um.
+
+        ``estrategia='grau'`` usa os vértices de maior grau; ``'distante'``
+        (farthest-point) começa pelo vértice mais distante do de maior grau e
+        segue escolhendo o mais distante dos marcos já escolhidos, priorizando
+        componentes ainda não cobertos.
+        """
+        if estrategia not in ('distante', 'grau'):
+            raise ValueError(f"Estratégia de marcos desconhecida: '{estrategia}'. Use 'distante' ou 'grau'.")
+
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        reverso = csr.transposto()
+        n = csr.ordem
+        infinito = float('inf')
+        graus = [csr.offsets[i + 1] - csr.offsets[i] for i in range(n)]
+        if csr.direcionado:
+            graus = [g + reverso.offsets[i + 1] - reverso.offsets[i] for i, g in enumerate(graus)]
+
+        candidatos = [i for i in range(n) if graus[i] > 0]
+        k = min(k, len(candidatos))
+        marcos, ida, volta = [], [], []
+
+        def adicionar_marco(marco: int):
+            marcos.append(marco)
+            ida.append(Sorting._arvore_dijkstra_csr(csr, marco)[0])
+            volta.append(Sorting._arvore_dijkstra_csr(reverso, marco)[0] if csr.direcionado else ida[-1])
+
+        if estrategia == 'grau':
+            for marco in sorted(candidatos, key=lambda i: (-graus[i], i))[:k]:
+                adicionar_marco(marco)
+        elif k:
+            semente = min(candidatos, key=lambda i: (-graus[i], i))
+            minimo = list(Sorting._arvore_dijkstra_csr(csr, semente)[0])
+            escolhidos = set()
+            while len(marcos) < k:
+                marco = max(
+                    (i for i in candidatos if i not in escolhidos),
+                    key=lambda i: (minimo[i] == infinito, graus[i] if minimo[i] == infinito else minimo[i], -i),
+                )
+                escolhidos.add(marco)
+                if not marcos:
+                    minimo = [infinito] * n
+                adicionar_marco(marco)
+                for v in range(n):
+                    distancia = min(ida[-1][v], volta[-1][v])
+                    if distancia < minimo[v]:
+                        minimo[v] = distancia
+
+        return TabelasMarcos(csr.nomes, marcos, ida, volta, csr.direcionado, estrategia)
+
+    @staticmethod
+    def a_estrela_marcos(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, fim: Vertice, tabelas: TabelasMarcos, num_ativos: int = 4):
+        """A* ponto a ponto com a heurística ALT (marcos + desigualdade triangular).
+
+        Retorna o mesmo ``(distancia, caminho)`` de ``dijkstra``, fixando
+        bem menos vértices. ``tabelas`` vem de ``calcular_tabelas_marcos``
+        sobre este mesmo grafo.
+        """
+        if len(tabelas.nomes) != grafo.ordem:
+            raise ValueError("As tabelas de marcos não correspondem ao grafo.")
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._a_estrela_marcos_csr(grafo, inicio, fim, tabelas, num_ativos)
+
+        origem, destino = str(inicio), str(fim)
+        indices = tabelas.indices
+        h = tabelas.heuristica(tabelas.indice(origem), tabelas.indice(destino), num_ativos)
+        infinito = float('inf')
+
+        estimativa = h(indices[origem])
+        if estimativa == infinito:
+            return infinito, []
+
+        distancias = {origem: 0}
+        anterior = {}
+        visitados = set()
+        fila: List[Tuple[float, str]] = [(estimativa, origem)]
+        pesos = grafo.colunas_arestas.pesos
+
+        while fila:
+            _, nome_atual = heapq.heappop(fila)
+            if nome_atual in visitados:
+                continue
+            visitados.add(nome_atual)
+            if nome_atual == destino:
+                break
+
+            distancia_atual = distancias[nome_atual]
+            for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome_atual].items():
+                if nome_vizinho in visitados:
+                    continue
+
+                peso_aresta = pesos[id_aresta]
+                if peso_aresta < 0:
+                    raise ValueError("A* não suporta pesos negativos")
+
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < distancias.get(nome_vizinho, infinito):
+                    estimativa = h(indices[nome_vizinho])
+                    if estimativa == infinito:
+                        continue
+                    distancias[nome_vizinho] = nova_distancia
+                    anterior[nome_vizinho] = nome_atual
+                    heapq.heappush(fila, (nova_distancia + estimativa, nome_vizinho))
+
+        if destino not in visitados:
+            return infinito, []
+
+        return distancias[destino], Sorting._reconstruir_caminho(anterior, origem, destino)
+
+    @staticmethod
+    def bellman_ford(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], inicio: Vertice, fim: Vertice = None):
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._bellman_ford_csr(grafo, inicio, fim)
+
         distancias = {}
         anterior = {}
         
@@ -72,16 +980,13 @@ class Sorting:
         
         distancias[inicio.nome] = 0
         
-       
+        # O mapa de adjacência já contém os dois sentidos das arestas não direcionadas.
+        pesos = grafo.colunas_arestas.pesos
+
         def obter_arestas_para_relaxar():
-            if isinstance(grafo, GrafoDirecionado):
-                yield from grafo.obter_arestas_direcionadas()
-            else: 
-                for (u, v), atributos in grafo.arestas.items():
-                    peso = atributos.get('peso', 1.0)
-                    # Como é não-direcionado, a aresta (u,v) implica relaxar u->v e v->u
-                    yield u, v, peso
-                    yield v, u, peso
+            for u, vizinhos in grafo.mapa_adjacencia.items():
+                for v, id_aresta in vizinhos.items():
+                    yield u, v, pesos[id_aresta]
 
         
         for _ in range(len(grafo.vertices)):
@@ -135,123 +1040,1175 @@ class Sorting:
         return distancias[fim.nome], caminho
     
     @staticmethod
-    def breadth_first_search(grafo: Grafo, inicio: Vertice):
-        visitado = set([inicio.nome])
-        fila = deque([inicio.nome])
-        anterior = {inicio.nome: None}
-        niveis = {inicio.nome: 0}
-        distancias = {inicio.nome: 0}
-        arvore = {inicio.nome: []}
-        ordem_visita = [inicio.nome]
-        
-        for nome in grafo.vertices:
-            if nome != inicio.nome:
-                niveis[nome] = float('inf')
-                distancias[nome] = float('inf')
-                arvore[nome] = []
+    def bellman_ford_spfa(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], inicio: Vertice, fim: Vertice = None):
+        """Bellman-Ford com fila FIFO (SPFA) e detecção de ciclo por desmontagem de subárvore.
+
+        Só as arestas de saída de vértices cuja distância mudou são
+        relaxadas. Quando ``v`` melhora, a subárvore de ``v`` na árvore de
+        caminhos é desmontada (seus vértices ficam fora da fila até serem
+        rotulados de novo); se ``u`` estiver nela, ``u -> v`` fecha um ciclo
+        negativo e a busca para na hora. Sem ``fim`` retorna
+        ``(distancias, anterior, ciclo)``, com ``ciclo`` vazio quando não há
+        ciclo negativo; com ``fim``, o ciclo é levantado em ``CicloNegativoError``.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._bellman_ford_spfa_csr(grafo, inicio, fim)
+
+        origem = str(inicio)
+        pesos = grafo.colunas_arestas.pesos
+        infinito = float('inf')
+        distancias = {origem: 0}
+        anterior = {}
+        filhos = {}
+        na_arvore = {origem}
+        fila = deque([origem])
+        na_fila = {origem}
+        ciclo = []
+
+        while fila and not ciclo:
+            u = fila.popleft()
+            na_fila.discard(u)
+            if u not in na_arvore:
+                continue
+            distancia_u = distancias[u]
+            for v, id_aresta in grafo.mapa_adjacencia[u].items():
+                nova_distancia = distancia_u + pesos[id_aresta]
+                if nova_distancia >= distancias.get(v, infinito):
+                    continue
+
+                # Desmonta a subárvore de v; encontrar u nela fecha um ciclo negativo.
+                pilha = [v]
+                while pilha and not ciclo:
+                    x = pilha.pop()
+                    if x == u:
+                        ciclo = [u]
+                        while ciclo[-1] != v:
+                            ciclo.append(anterior[ciclo[-1]])
+                        ciclo.reverse()
+                        break
+                    for filho in filhos.pop(x, ()):
+                        na_arvore.discard(filho)
+                        pilha.append(filho)
+                if ciclo:
+                    break
+
+                if v in na_arvore and v in anterior:
+                    filhos[anterior[v]].discard(v)
+                distancias[v] = nova_distancia
+                anterior[v] = u
+                filhos.setdefault(u, set()).add(v)
+                na_arvore.add(v)
+                if v not in na_fila:
+                    na_fila.add(v)
+                    fila.append(v)
+
+        if fim is None:
+            return {nome: distancias.get(nome, infinito) for nome in grafo.vertices}, anterior, ciclo
+
+        if ciclo:
+            raise CicloNegativoError(ciclo)
+
+        destino = str(fim)
+        if destino not in distancias:
+            return infinito, []
+        return distancias[destino], Sorting._reconstruir_caminho(anterior, origem, destino)
+
+    @staticmethod
+    def johnson(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], anteriores: bool = False, processos: int = None) -> MatrizDistancias:
+        """Distâncias entre todos os pares, aceitando pesos negativos (algoritmo de Johnson).
+
+        Um SPFA com todos os vértices como fonte (o vértice auxiliar ligado a
+        todos com peso 0) dá os potenciais ``h``; com
+        ``w'(u, v) = w(u, v) + h(u) - h(v) >= 0`` roda um Dijkstra por
+        origem, repartidos entre ``processos`` processos (padrão: um por
+        núcleo; grafos com menos de ``MINIMO_ORIGENS_PARALELO`` vértices rodam
+        no próprio processo). Levanta ``CicloNegativoError`` se houver ciclo negativo.
+        """
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        n = csr.ordem
+        potenciais, _, ciclo = Sorting._spfa_csr(csr, list(range(n)))
+        if ciclo:
+            raise CicloNegativoError([csr.nomes[i] for i in ciclo])
+
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+        reponderados = array('d', pesos)
+        for u in range(n):
+            h_u = potenciais[u]
+            for k in range(offsets[u], offsets[u + 1]):
+                # Arredondamentos podem deixar -1e-15 onde o peso reduzido é 0.
+                reponderados[k] = max(0.0, pesos[k] + h_u - potenciais[vizinhos[k]])
+        reponderado = GrafoCSR(csr.nomes, offsets, vizinhos, reponderados, csr.direcionado)
+
+        processos = processos or os.cpu_count() or 1
+        if processos > 1 and n >= MINIMO_ORIGENS_PARALELO:
+            blocos = [list(range(i, n, processos * 4)) for i in range(processos * 4)]
+            with ProcessPoolExecutor(processos, initializer=_iniciar_processo_johnson, initargs=(reponderado,)) as executor:
+                resultados = list(executor.map(_linhas_johnson, blocos, repeat(anteriores)))
+        else:
+            blocos = [list(range(n))]
+            resultados = [_linhas_johnson(blocos[0], anteriores, reponderado)]
+
+        distancias = np.empty((n, n), dtype=np.float64)
+        matriz_anteriores = np.empty((n, n), dtype=np.int32) if anteriores else None
+        for origens, linhas in zip(blocos, resultados):
+            for s, (linha, linha_anteriores) in zip(origens, linhas):
+                distancias[s] = np.frombuffer(linha, dtype=np.float64)
+                if anteriores:
+                    matriz_anteriores[s] = np.frombuffer(linha_anteriores, dtype=np.int64)
+
+        # Desfaz a reponderação: d(u, v) = d'(u, v) - h(u) + h(v).
+        h = np.asarray(potenciais, dtype=np.float64)
+        distancias += h[np.newaxis, :] - h[:, np.newaxis]
+        return MatrizDistancias(csr.nomes, distancias, matriz_anteriores)
+
+    @staticmethod
+    def floyd_warshall(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR]) -> MatrizDistancias:
+        """Distâncias e predecessores entre todos os pares por Floyd–Warshall vetorizado.
+
+        Para cada ``k`` a coluna ``D[:, k]`` e a linha ``D[k, :]`` são somadas
+        por broadcast e o mínimo é aplicado à matriz inteira de uma vez.
+        Aceita pesos negativos; levanta ``CicloNegativoError`` se houver ciclo negativo.
+        """
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        n = csr.ordem
+        origens = np.repeat(np.arange(n), np.diff(np.asarray(csr.offsets)))
+        destinos = np.asarray(csr.vizinhos, dtype=np.intp)
+
+        distancias = np.full((n, n), np.inf)
+        # Arestas paralelas ficam com o menor peso.
+        np.minimum.at(distancias, (origens, destinos), np.asarray(csr.pesos, dtype=np.float64))
+        anteriores = np.where(np.isfinite(distancias), np.arange(n, dtype=np.int32)[:, np.newaxis], np.int32(-1))
+        diagonal = np.arange(n)
+
+        if (distancias[diagonal, diagonal] >= 0).all():
+            distancias[diagonal, diagonal] = 0
+            anteriores[diagonal, diagonal] = -1
+            via_k = np.empty((n, n))
+            melhor = np.empty((n, n), dtype=bool)
+            for k in range(n):
+                np.add(distancias[:, k, np.newaxis], distancias[k], out=via_k)
+                np.less(via_k, distancias, out=melhor)
+                np.copyto(distancias, via_k, where=melhor)
+                np.copyto(anteriores, np.broadcast_to(anteriores[k], (n, n)), where=melhor)
+
+        if (distancias[diagonal, diagonal] < 0).any():
+            # O SPFA de todas as fontes devolve o ciclo já na ordem das arestas.
+            _, _, ciclo = Sorting._spfa_csr(csr, list(range(n)))
+            raise CicloNegativoError([csr.nomes[i] for i in ciclo])
+
+        return MatrizDistancias(csr.nomes, distancias, anteriores)
+
+    @staticmethod
+    def todos_os_pares(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], limite: int = LIMITE_FLOYD_WARSHALL) -> MatrizDistancias:
+        """Matriz com predecessores: Floyd–Warshall em grafos pequenos ou densos, senão um Dijkstra por origem (``johnson``)."""
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        n = csr.ordem
+        if n <= limite and n * n <= CELULAS_POR_ARESTA_FLOYD * len(csr.vizinhos):
+            return Sorting.floyd_warshall(csr)
+        return Sorting.johnson(csr, anteriores=True)
+
+    @staticmethod
+    def breadth_first_search(grafo: Union[Grafo, GrafoCSR], inicio: Vertice):
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._breadth_first_search_csr(grafo, inicio)
+
+        # Só os vértices alcançados entram nos dicts; os demais valem
+        # inf (níveis/distâncias) ou [] (árvore) pelo MapaEsparso.
+        origem = inicio.nome
+        fila = deque([origem])
+        anterior = {origem: None}
+        niveis = {origem: 0}
+        arvore = {}
+        ordem_visita = [origem]
 
         while fila:
             u = fila.popleft()
-            vertice_atual = grafo.vertices[u]
-            
-            for vizinho in vertice_atual.vizinhos:
-                v = vizinho.nome
-                if v not in visitado:
-                    visitado.add(v)
+            proximo_nivel = niveis[u] + 1
+            filhos = None
+            for v in grafo.mapa_adjacencia[u]:
+                if v not in niveis:
                     anterior[v] = u
-                    niveis[v] = niveis[u] + 1
-                    distancias[v] = distancias[u] + 1
-                    arvore[u].append(v)
+                    niveis[v] = proximo_nivel
+                    if filhos is None:
+                        filhos = arvore[u] = []
+                    filhos.append(v)
                     fila.append(v)
                     ordem_visita.append(v)
-        
+
         return {
-            'niveis': niveis,
-            'distancias': distancias,
+            'niveis': MapaEsparso(niveis, grafo.vertices, _infinito, origem),
+            'distancias': MapaEsparso(niveis, grafo.vertices, _infinito, origem),
             'anterior': anterior,
-            'arvore': arvore,
+            'arvore': MapaEsparso(arvore, grafo.vertices, list, origem),
             'ordem_visita': ordem_visita
         }
 
     @staticmethod
-    def bfs_shortest_path(grafo: Grafo, inicio: Vertice, fim: Vertice) -> Tuple[float, List[str]]:
-        
-        vertice_inicio = grafo.vertices.get(inicio)
-        if not vertice_inicio:
+    def bfs_direcional(grafo: Union[Grafo, GrafoCSR], inicio: Vertice):
+        """``breadth_first_search`` pela BFS por níveis em NumPy (ver ``BFSDirecional``).
+
+        Para muitas origens no mesmo grafo, crie um ``BFSDirecional`` e chame
+        ``percorrer`` em cada uma, sem remontar os vetores.
+        """
+        return BFSDirecional(grafo).executar(inicio)
+
+    @staticmethod
+    def bfs_shortest_path(grafo: Union[Grafo, GrafoDirecionado, GrafoCSR], inicio: Vertice, fim: Vertice) -> Tuple[float, List[str]]:
+        """Menor caminho em número de arestas, por BFS bidirecional.
+
+        A cada passo a fronteira menor avança um nível inteiro (a do destino
+        pelo ``mapa_adjacencia_reverso``); a busca para no primeiro vértice
+        já visitado pelo outro lado, que fecha um caminho mínimo. Retorna
+        ``(arestas, caminho)`` ou ``(inf, [])``.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._bfs_shortest_path_csr(grafo, inicio, fim)
+
+        origem, destino = str(inicio), str(fim)
+        if origem not in grafo.vertices or destino not in grafo.vertices:
             return float('inf'), []
-        
-        resultado = Sorting.breadth_first_search(grafo, vertice_inicio)
-        
-        if fim.nome not in resultado['distancias'] or resultado['distancias'][fim.nome] == float('inf'):
+        if origem == destino:
+            return 0, [origem]
+
+        mapas = (grafo.mapa_adjacencia, grafo.mapa_adjacencia_reverso)
+        # anteriores[1][v] é o vértice seguinte a v no caminho até o destino.
+        anteriores = ({origem: None}, {destino: None})
+        fronteiras = [[origem], [destino]]
+        encontro = None
+
+        while encontro is None and fronteiras[0] and fronteiras[1]:
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            mapa, anterior, outro = mapas[lado], anteriores[lado], anteriores[1 - lado]
+            proxima = []
+            for u in fronteiras[lado]:
+                for v in mapa[u]:
+                    if v in anterior:
+                        continue
+                    anterior[v] = u
+                    if v in outro:
+                        encontro = v
+                        break
+                    proxima.append(v)
+                if encontro is not None:
+                    break
+            fronteiras[lado] = proxima
+
+        if encontro is None:
             return float('inf'), []
-        
-        
-        caminho = []
-        atual = fim.nome
+
+        caminho = Sorting._reconstruir_caminho(anteriores[0], origem, encontro)
+        atual = anteriores[1][encontro]
         while atual is not None:
             caminho.append(atual)
-            atual = resultado['anterior'].get(atual)
-        
-        return resultado['distancias'][fim.nome], list(reversed(caminho))
+            atual = anteriores[1][atual]
+        return len(caminho) - 1, caminho
 
     @staticmethod
-    def depth_first_search(grafo: Grafo, inicio: Vertice):
-        estado = {nome: 'nao_visitado' for nome in grafo.vertices}
+    def depth_first_search(grafo: Union[Grafo, GrafoCSR], inicio: Vertice, classificar: bool = False, eventos=None):
+        """DFS iterativa (pilha explícita) a partir de ``inicio`` e depois dos demais vértices não visitados.
+
+        Com ``classificar=True`` preenche ``classificacao_arestas`` (chave com
+        os nomes em ordem); sem ela o dicionário volta vazio. ``eventos``, se
+        dado, é chamado como ``eventos(evento, u, v)``: ``'descoberta'`` e
+        ``'finalizacao'`` com ``v`` = pai de ``u`` (None na raiz), e um evento
+        por aresta ``u-v`` examinada. Sem ``classificar`` esse evento é
+        ``'aresta'``, a cada vez que a aresta é examinada (exceto a volta de um
+        filho para o pai); com ``classificar`` é o tipo da aresta (``'arvore'``,
+        ``'retorno'``, ``'avanco'``, ``'cruzamento'``), uma vez por aresta classificada.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._depth_first_search_csr(grafo, inicio, classificar, eventos)
+
+        mapa = grafo.mapa_adjacencia
+        # Descoberto e não finalizado = na pilha ("visitando").
         descoberta = {}
         finalizacao = {}
-        anterior = {nome: None for nome in grafo.vertices}
+        anterior = dict.fromkeys(grafo.vertices)
         classificacao_arestas = {}
         ordem_visita = []
-        tempo = [0]
-        tem_ciclo = False
         componentes = []
-        
-        def dfs_visitar(u: str, pai: str = None):
-            nonlocal tem_ciclo
-            
-            estado[u] = 'visitando'
-            tempo[0] += 1
-            descoberta[u] = tempo[0]
-            ordem_visita.append(u)
-            
-            vertice_atual = grafo.vertices[u]
-            
-            for vizinho in vertice_atual.vizinhos:
-                v = vizinho.nome
-                aresta = tuple(sorted([u, v]))
-                
-                if estado[v] == 'nao_visitado':
-                    anterior[v] = u
-                    classificacao_arestas[aresta] = 'arvore'
-                    dfs_visitar(v, u)
-                    
-                elif estado[v] == 'visitando' and v != pai:
+        tempo = 0
+        tem_ciclo = False
+
+        for raiz in (str(inicio), *grafo.vertices):
+            if raiz in descoberta:
+                continue
+
+            vertices_antes = len(ordem_visita)
+            tempo += 1
+            descoberta[raiz] = tempo
+            ordem_visita.append(raiz)
+            if eventos is not None:
+                eventos('descoberta', raiz, None)
+            # Pilhas paralelas em vez de tuplas: menos objetos para o coletor
+            # de lixo varrer quando a pilha tem milhões de vértices.
+            pilha = [raiz]
+            iteradores = [iter(mapa[raiz])]
+
+            while pilha:
+                u = pilha[-1]
+                for v in iteradores[-1]:
+                    if v not in descoberta:
+                        anterior[v] = u
+                        if classificar:
+                            aresta = (u, v) if u <= v else (v, u)
+                            classificacao_arestas[aresta] = 'arvore'
+                        if eventos is not None:
+                            eventos('arvore' if classificar else 'aresta', u, v)
+                        tempo += 1
+                        descoberta[v] = tempo
+                        ordem_visita.append(v)
+                        if eventos is not None:
+                            eventos('descoberta', v, u)
+                        pilha.append(v)
+                        iteradores.append(iter(mapa[v]))
+                        break
+
+                    visitando = v not in finalizacao
+                    if visitando:
+                        if v == anterior[u]:
+                            continue
+                        tem_ciclo = True
+                    if not classificar:
+                        if eventos is not None:
+                            eventos('aresta', u, v)
+                        continue
+
+                    if visitando:
+                        tipo = 'retorno'
+                    elif descoberta[u] < descoberta[v]:
+                        tipo = 'avanco'
+                    else:
+                        tipo = 'cruzamento'
+                    aresta = (u, v) if u <= v else (v, u)
                     if aresta not in classificacao_arestas:
-                        classificacao_arestas[aresta] = 'retorno'
-                    tem_ciclo = True
-                    
-                elif estado[v] == 'visitado':
+                        classificacao_arestas[aresta] = tipo
+                        if eventos is not None:
+                            eventos(tipo, u, v)
+                else:
+                    pilha.pop()
+                    iteradores.pop()
+                    tempo += 1
+                    finalizacao[u] = tempo
+                    if eventos is not None:
+                        eventos('finalizacao', u, anterior[u])
+
+            componentes.append(ordem_visita[vertices_antes:])
+
+        return {
+            'descoberta': descoberta,
+            'finalizacao': finalizacao,
+            'anterior': anterior,
+            'classificacao_arestas': classificacao_arestas,
+            'ordem_visita': ordem_visita,
+            'tem_ciclo': tem_ciclo,
+            'componentes': componentes
+        }
+
+    # ------------------- Percursos sob demanda -------------------
+
+    @staticmethod
+    def iter_bfs(grafo: Union[Grafo, GrafoCSR], inicio: Vertice) -> Iterator[Tuple[str, int, Optional[str]]]:
+        """Gera ``(vertice, nivel, anterior)`` na ordem de descoberta da BFS.
+
+        A busca só avança quando o consumidor pede o próximo vértice; parar
+        de iterar encerra a busca. A ordem é a de ``ordem_visita`` em
+        ``breadth_first_search``. Origem inexistente levanta ``ValueError``
+        já na chamada.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._iter_bfs_csr(grafo, grafo.indice(inicio))
+        return Sorting._iter_bfs(grafo, Sorting._nome_existente(grafo, inicio))
+
+    @staticmethod
+    def iter_dfs(grafo: Union[Grafo, GrafoCSR], inicio: Vertice) -> Iterator[Tuple[str, int, Optional[str]]]:
+        """Gera ``(vertice, profundidade, anterior)`` na ordem de descoberta da DFS, só na parte alcançável de ``inicio``."""
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._iter_dfs_csr(grafo, grafo.indice(inicio))
+        return Sorting._iter_dfs(grafo, Sorting._nome_existente(grafo, inicio))
+
+    @staticmethod
+    def iter_dijkstra(grafo: Union[Grafo, GrafoCSR], inicio: Vertice) -> Iterator[Tuple[str, float, Optional[str]]]:
+        """Gera ``(vertice, distancia, anterior)`` à medida que o Dijkstra fixa cada vértice, em distância crescente."""
+        if isinstance(grafo, GrafoCSR):
+            return Sorting._iter_dijkstra_csr(grafo, grafo.indice(inicio))
+        return Sorting._iter_dijkstra(grafo, Sorting._nome_existente(grafo, inicio))
+
+    @staticmethod
+    def _nome_existente(grafo: Grafo, vertice: Vertice) -> str:
+        nome = str(vertice)
+        if nome not in grafo.vertices:
+            raise ValueError(f"Vértice '{nome}' não encontrado no grafo.")
+        return nome
+
+    @staticmethod
+    def _iter_bfs(grafo: Grafo, origem: str):
+        mapa = grafo.mapa_adjacencia
+        niveis = {origem: 0}
+        fila = deque([origem])
+        yield origem, 0, None
+
+        while fila:
+            u = fila.popleft()
+            proximo_nivel = niveis[u] + 1
+            for v in mapa[u]:
+                if v not in niveis:
+                    niveis[v] = proximo_nivel
+                    fila.append(v)
+                    yield v, proximo_nivel, u
+
+    @staticmethod
+    def _iter_dfs(grafo: Grafo, origem: str):
+        mapa = grafo.mapa_adjacencia
+        descobertos = {origem}
+        pilha = [origem]
+        iteradores = [iter(mapa[origem])]
+        yield origem, 0, None
+
+        while pilha:
+            u = pilha[-1]
+            for v in iteradores[-1]:
+                if v not in descobertos:
+                    descobertos.add(v)
+                    pilha.append(v)
+                    iteradores.append(iter(mapa[v]))
+                    yield v, len(pilha) - 1, u
+                    break
+            else:
+                pilha.pop()
+                iteradores.pop()
+
+    @staticmethod
+    def _iter_dijkstra(grafo: Grafo, origem: str):
+        mapa = grafo.mapa_adjacencia
+        pesos = grafo.colunas_arestas.pesos
+        infinito = float('inf')
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        fixados = set()
+        fila: List[Tuple[float, str]] = [(0, origem)]
+
+        while fila:
+            distancia_atual, u = heapq.heappop(fila)
+            if u in fixados:
+                continue
+            fixados.add(u)
+            yield u, distancia_atual, anterior[u]
+
+            for v, id_aresta in mapa[u].items():
+                if v in fixados:
+                    continue
+                peso_aresta = pesos[id_aresta]
+                if peso_aresta < 0:
+                    raise ValueError("Dijkstra não suporta pesos negativos")
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < distancias.get(v, infinito):
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    heapq.heappush(fila, (nova_distancia, v))
+
+    # ------------------- Versões sobre o snapshot CSR -------------------
+
+    @staticmethod
+    def _iter_bfs_csr(grafo: GrafoCSR, s: int):
+        nomes = grafo.nomes
+        offsets, vizinhos = grafo.offsets, grafo.vizinhos
+        nivel = [-1] * grafo.ordem
+        nivel[s] = 0
+        fila = deque([s])
+        yield nomes[s], 0, None
+
+        while fila:
+            u = fila.popleft()
+            proximo_nivel = nivel[u] + 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                if nivel[v] == -1:
+                    nivel[v] = proximo_nivel
+                    fila.append(v)
+                    yield nomes[v], proximo_nivel, nomes[u]
+
+    @staticmethod
+    def _iter_dfs_csr(grafo: GrafoCSR, s: int):
+        nomes = grafo.nomes
+        offsets, vizinhos = grafo.offsets, grafo.vizinhos
+        descobertos = bytearray(grafo.ordem)
+        descobertos[s] = 1
+        pilha = [s]
+        posicoes = [offsets[s]]
+        yield nomes[s], 0, None
+
+        while pilha:
+            u = pilha[-1]
+            k, fim = posicoes[-1], offsets[u + 1]
+            while k < fim:
+                v = vizinhos[k]
+                k += 1
+                if not descobertos[v]:
+                    descobertos[v] = 1
+                    posicoes[-1] = k
+                    pilha.append(v)
+                    posicoes.append(offsets[v])
+                    yield nomes[v], len(pilha) - 1, nomes[u]
+                    break
+            else:
+                pilha.pop()
+                posicoes.pop()
+
+    @staticmethod
+    def _iter_dijkstra_csr(grafo: GrafoCSR, s: int):
+        nomes = grafo.nomes
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        infinito = float('inf')
+        distancias = [infinito] * grafo.ordem
+        anterior = [-1] * grafo.ordem
+        fixados = bytearray(grafo.ordem)
+        distancias[s] = 0
+        fila: List[Tuple[float, int]] = [(0, s)]
+
+        while fila:
+            distancia_atual, u = heapq.heappop(fila)
+            if fixados[u]:
+                continue
+            fixados[u] = 1
+            yield nomes[u], distancia_atual, nomes[anterior[u]] if anterior[u] != -1 else None
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                if fixados[v]:
+                    continue
+                peso_aresta = pesos[k]
+                if peso_aresta < 0:
+                    raise ValueError("Dijkstra não suporta pesos negativos")
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < distancias[v]:
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    heapq.heappush(fila, (nova_distancia, v))
+
+    @staticmethod
+    def _reconstruir_caminho_csr(grafo: GrafoCSR, anterior: List[int], inicio: int, fim: int) -> List[str]:
+        caminho = []
+        atual = fim
+        while atual != -1:
+            caminho.append(grafo.nomes[atual])
+            if atual == inicio:
+                break
+            atual = anterior[atual]
+            if len(caminho) > grafo.ordem:
+                return []
+
+        if not caminho or caminho[-1] != grafo.nomes[inicio]:
+            return []
+
+        caminho.reverse()
+        return caminho
+
+    @staticmethod
+    def _dijkstra_csr(grafo: GrafoCSR, inicio, fim):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        distancias, anterior = Sorting._arvore_dijkstra_csr(grafo, s, (t,))
+        infinito = float('inf')
+        if distancias[t] == infinito:
+            return infinito, []
+
+        return distancias[t], Sorting._reconstruir_caminho_csr(grafo, anterior, s, t)
+
+    @staticmethod
+    def _caminhos_em_lote_csr(grafo: GrafoCSR, pares: List[Tuple[str, str]]) -> List[Tuple[float, List[str]]]:
+        destinos_por_origem: Dict[int, set] = {}
+        for origem, destino in pares:
+            destinos_por_origem.setdefault(grafo.indice(origem), set()).add(grafo.indice(destino))
+
+        infinito = float('inf')
+        resultados = {}
+        for s, destinos in destinos_por_origem.items():
+            distancias, anterior = Sorting._arvore_dijkstra_csr(grafo, s, destinos)
+            nome_origem = grafo.nomes[s]
+            for t in destinos:
+                if distancias[t] != infinito:
+                    caminho = Sorting._reconstruir_caminho_csr(grafo, anterior, s, t)
+                    resultados[nome_origem, grafo.nomes[t]] = (distancias[t], caminho)
+                else:
+                    resultados[nome_origem, grafo.nomes[t]] = (infinito, [])
+
+        return [resultados[par] for par in pares]
+
+    @staticmethod
+    def _distancia_caminho_csr(grafo: GrafoCSR, caminho: List[int]) -> float:
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        distancia = 0
+        for u, v in zip(caminho, caminho[1:]):
+            # Entre arestas paralelas, a de menor peso (a que a busca usou).
+            distancia += min(pesos[k] for k in range(offsets[u], offsets[u + 1]) if vizinhos[k] == v)
+        return distancia
+
+    @staticmethod
+    def _dijkstra_dial_csr(grafo: GrafoCSR, inicio, fim):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        perfil = Sorting._perfil_inteiro(grafo)
+        offsets, vizinhos, inteiros = grafo.offsets, grafo.vizinhos, perfil.inteiros
+        tamanho = perfil.peso_maximo + 1
+        buckets: List[List[int]] = [[] for _ in range(tamanho)]
+        buckets[0].append(s)
+        distancias: List[Union[int, float]] = [float('inf')] * grafo.ordem
+        anterior = [-1] * grafo.ordem
+        visitados = bytearray(grafo.ordem)
+        distancias[s] = 0
+        atual, pendentes = 0, 1
+
+        while pendentes:
+            bucket = buckets[atual % tamanho]
+            if not bucket:
+                atual += 1
+                continue
+            u = bucket.pop()
+            pendentes -= 1
+            if visitados[u] or distancias[u] != atual:
+                continue
+            visitados[u] = 1
+            if u == t:
+                break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                nova_distancia = atual + inteiros[k]
+                if nova_distancia < distancias[v]:
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    buckets[nova_distancia % tamanho].append(v)
+                    pendentes += 1
+
+        if not visitados[t]:
+            return float('inf'), []
+
+        caminho = [t]
+        while caminho[-1] != s:
+            caminho.append(anterior[caminho[-1]])
+        caminho.reverse()
+        return Sorting._distancia_caminho_csr(grafo, caminho), [grafo.nomes[i] for i in caminho]
+
+    @staticmethod
+    def _dijkstra_radix_csr(grafo: GrafoCSR, inicio, fim):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        perfil = Sorting._perfil_inteiro(grafo)
+        offsets, vizinhos, inteiros = grafo.offsets, grafo.vizinhos, perfil.inteiros
+        buckets: List[List[Tuple[int, int]]] = [[] for _ in range((perfil.peso_maximo * grafo.ordem).bit_length() + 2)]
+        buckets[0].append((0, s))
+        distancias: List[Union[int, float]] = [float('inf')] * grafo.ordem
+        anterior = [-1] * grafo.ordem
+        visitados = bytearray(grafo.ordem)
+        distancias[s] = 0
+        ultimo, pendentes = 0, 1
+
+        while pendentes:
+            if not buckets[0]:
+                i = 1
+                while not buckets[i]:
+                    i += 1
+                itens, buckets[i] = buckets[i], []
+                ultimo = min(chave for chave, _ in itens)
+                for item in itens:
+                    buckets[(item[0] ^ ultimo).bit_length()].append(item)
+            distancia_atual, u = buckets[0].pop()
+            pendentes -= 1
+            if visitados[u] or distancias[u] != distancia_atual:
+                continue
+            visitados[u] = 1
+            if u == t:
+                break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                nova_distancia = distancia_atual + inteiros[k]
+                if nova_distancia < distancias[v]:
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    buckets[(nova_distancia ^ ultimo).bit_length()].append((nova_distancia, v))
+                    pendentes += 1
+
+        if not visitados[t]:
+            return float('inf'), []
+
+        caminho = [t]
+        while caminho[-1] != s:
+            caminho.append(anterior[caminho[-1]])
+        caminho.reverse()
+        return Sorting._distancia_caminho_csr(grafo, caminho), [grafo.nomes[i] for i in caminho]
+
+    @staticmethod
+    def _arvore_dijkstra_csr(grafo: GrafoCSR, s: int, destinos: Collection[int] = ()) -> Tuple[array, array]:
+        """Distâncias e predecessores de ``s`` (Dijkstra sobre o snapshot).
+
+        Sem ``destinos`` percorre tudo o que é alcançável; com ``destinos``
+        para assim que todos eles forem fixados, e os demais vértices podem
+        ficar com distâncias provisórias.
+        """
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        distancias = [float('inf')] * grafo.ordem
+        anterior = [-1] * grafo.ordem
+        visitados = bytearray(grafo.ordem)
+        distancias[s] = 0.0
+        fila: List[Tuple[float, int]] = [(0.0, s)]
+        restantes = len(destinos)
+
+        while fila:
+            distancia_atual, u = heapq.heappop(fila)
+            if visitados[u]:
+                continue
+            visitados[u] = 1
+            if restantes and u in destinos:
+                restantes -= 1
+                if not restantes:
+                    break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                if visitados[v]:
+                    continue
+
+                peso_aresta = pesos[k]
+                if peso_aresta < 0:
+                    raise ValueError("Dijkstra não suporta pesos negativos")
+
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < distancias[v]:
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    heapq.heappush(fila, (nova_distancia, v))
+
+        return array('d', distancias), array('q', anterior)
+
+    @staticmethod
+    def _a_estrela_marcos_csr(grafo: GrafoCSR, inicio, fim, tabelas: TabelasMarcos, num_ativos: int):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        h = tabelas.heuristica(s, t, num_ativos)
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        infinito = float('inf')
+
+        estimativa = h(s)
+        if estimativa == infinito:
+            return infinito, []
+
+        distancias = [infinito] * grafo.ordem
+        anterior = [-1] * grafo.ordem
+        visitados = bytearray(grafo.ordem)
+        distancias[s] = 0
+        fila: List[Tuple[float, int]] = [(estimativa, s)]
+
+        while fila:
+            _, u = heapq.heappop(fila)
+            if visitados[u]:
+                continue
+            visitados[u] = 1
+            if u == t:
+                break
+
+            distancia_atual = distancias[u]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                if visitados[v]:
+                    continue
+
+                peso_aresta = pesos[k]
+                if peso_aresta < 0:
+                    raise ValueError("A* não suporta pesos negativos")
+
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < distancias[v]:
+                    estimativa = h(v)
+                    if estimativa == infinito:
+                        continue
+                    distancias[v] = nova_distancia
+                    anterior[v] = u
+                    heapq.heappush(fila, (nova_distancia + estimativa, v))
+
+        if not visitados[t]:
+            return infinito, []
+
+        return distancias[t], Sorting._reconstruir_caminho_csr(grafo, anterior, s, t)
+
+    @staticmethod
+    def _dijkstra_bidirecional_csr(grafo: GrafoCSR, inicio, fim):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        if s == t:
+            return 0, [grafo.nomes[s]]
+
+        reverso = grafo.transposto()
+        infinito = float('inf')
+        n = grafo.ordem
+        estruturas = ((grafo.offsets, grafo.vizinhos, grafo.pesos), (reverso.offsets, reverso.vizinhos, reverso.pesos))
+        distancias = ([infinito] * n, [infinito] * n)
+        anteriores = ([-1] * n, [-1] * n)
+        # Peso da aresta até o predecessor, lido na relaxação (pesos[k]).
+        pesos_anteriores = ([0.0] * n, [0.0] * n)
+        visitados = (bytearray(n), bytearray(n))
+        distancias[0][s] = 0
+        distancias[1][t] = 0
+        filas = ([(0, s)], [(0, t)])
+        melhor, encontro = infinito, -1
+
+        while filas[0] and filas[1]:
+            topo_ida, topo_volta = filas[0][0][0], filas[1][0][0]
+            if topo_ida + topo_volta >= melhor:
+                break
+
+            lado = 0 if topo_ida <= topo_volta else 1
+            distancia_atual, u = heapq.heappop(filas[lado])
+            if visitados[lado][u]:
+                continue
+            visitados[lado][u] = 1
+
+            offsets, vizinhos, pesos = estruturas[lado]
+            fila, dist, anterior = filas[lado], distancias[lado], anteriores[lado]
+            peso_anterior = pesos_anteriores[lado]
+            dist_outro = distancias[1 - lado]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                peso_aresta = pesos[k]
+                if peso_aresta < 0:
+                    raise ValueError("Dijkstra não suporta pesos negativos")
+
+                nova_distancia = distancia_atual + peso_aresta
+                if nova_distancia < dist[v]:
+                    dist[v] = nova_distancia
+                    anterior[v] = u
+                    peso_anterior[v] = peso_aresta
+                    heapq.heappush(fila, (nova_distancia, v))
+
+                total = dist[v] + dist_outro[v]
+                if total < melhor:
+                    melhor, encontro = total, v
+
+        if encontro == -1:
+            return infinito, []
+
+        (anterior_ida, anterior_volta), (peso_ida, peso_volta) = anteriores, pesos_anteriores
+        caminho = [encontro]
+        while caminho[-1] != s:
+            caminho.append(anterior_ida[caminho[-1]])
+        caminho.reverse()
+
+        # Da origem para o destino: primeiro os pesos da ida, depois os da volta.
+        distancia = 0
+        for v in caminho[1:]:
+            distancia += peso_ida[v]
+        atual = encontro
+        while atual != t:
+            distancia += peso_volta[atual]
+            atual = anterior_volta[atual]
+            caminho.append(atual)
+        return distancia, [grafo.nomes[i] for i in caminho]
+
+    @staticmethod
+    def _bellman_ford_csr(grafo: GrafoCSR, inicio, fim=None):
+        s = grafo.indice(inicio)
+        n = grafo.ordem
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        infinito = float('inf')
+
+        distancias = [infinito] * n
+        anterior = [-1] * n
+        distancias[s] = 0
+
+        for _ in range(n):
+            relaxou_nesta_passada = False
+            for u in range(n):
+                distancia_u = distancias[u]
+                if distancia_u == infinito:
+                    continue
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = vizinhos[k]
+                    nova_distancia = distancia_u + pesos[k]
+                    if nova_distancia < distancias[v]:
+                        distancias[v] = nova_distancia
+                        anterior[v] = u
+                        relaxou_nesta_passada = True
+
+            if not relaxou_nesta_passada:
+                break
+
+        tem_ciclo_negativo = any(
+            distancias[u] != infinito and distancias[u] + pesos[k] < distancias[vizinhos[k]]
+            for u in range(n)
+            for k in range(offsets[u], offsets[u + 1])
+        )
+
+        if fim is None:
+            nomes = grafo.nomes
+            return (
+                {nomes[i]: distancias[i] for i in range(n)},
+                {nomes[i]: nomes[anterior[i]] for i in range(n) if anterior[i] != -1},
+                tem_ciclo_negativo,
+            )
+
+        if tem_ciclo_negativo:
+            raise ValueError("Grafo contém ciclo negativo")
+
+        t = grafo.indice(fim)
+        if distancias[t] == infinito:
+            return infinito, []
+
+        caminho = Sorting._reconstruir_caminho_csr(grafo, anterior, s, t)
+        if not caminho:
+            return infinito, []
+
+        return distancias[t], caminho
+
+    @staticmethod
+    def _spfa_csr(grafo: GrafoCSR, fontes: List[int]) -> Tuple[List[float], List[int], List[int]]:
+        """SPFA a partir de várias fontes com distância 0 (uma floresta de caminhos mínimos).
+
+        Retorna ``(distancias, anterior, ciclo)`` por índice; ``ciclo`` é
+        vazio quando nenhum ciclo negativo é alcançável pelas fontes.
+        """
+        n = grafo.ordem
+        offsets, vizinhos, pesos = grafo.offsets, grafo.vizinhos, grafo.pesos
+        infinito = float('inf')
+
+        distancias = [infinito] * n
+        anterior = [-1] * n
+        filhos: List[set] = [None] * n
+        na_arvore = bytearray(n)
+        na_fila = bytearray(n)
+        for s in fontes:
+            distancias[s] = 0
+            na_arvore[s] = na_fila[s] = 1
+        fila = deque(fontes)
+        ciclo = []
+
+        while fila and not ciclo:
+            u = fila.popleft()
+            na_fila[u] = 0
+            if not na_arvore[u]:
+                continue
+            distancia_u = distancias[u]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                nova_distancia = distancia_u + pesos[k]
+                if nova_distancia >= distancias[v]:
+                    continue
+
+                pilha = [v]
+                while pilha and not ciclo:
+                    x = pilha.pop()
+                    if x == u:
+                        ciclo = [u]
+                        while ciclo[-1] != v:
+                            ciclo.append(anterior[ciclo[-1]])
+                        ciclo.reverse()
+                        break
+                    if filhos[x]:
+                        for filho in filhos[x]:
+                            na_arvore[filho] = 0
+                            pilha.append(filho)
+                        filhos[x] = None
+                if ciclo:
+                    break
+
+                if na_arvore[v] and anterior[v] != -1:
+                    filhos[anterior[v]].discard(v)
+                distancias[v] = nova_distancia
+                anterior[v] = u
+                if filhos[u] is None:
+                    filhos[u] = set()
+                filhos[u].add(v)
+                na_arvore[v] = 1
+                if not na_fila[v]:
+                    na_fila[v] = 1
+                    fila.append(v)
+
+        return distancias, anterior, ciclo
+
+    @staticmethod
+    def _bellman_ford_spfa_csr(grafo: GrafoCSR, inicio, fim=None):
+        s = grafo.indice(inicio)
+        n = grafo.ordem
+        distancias, anterior, ciclo = Sorting._spfa_csr(grafo, [s])
+
+        nomes = grafo.nomes
+        ciclo = [nomes[i] for i in ciclo]
+        if fim is None:
+            return (
+                {nomes[i]: distancias[i] for i in range(n)},
+                {nomes[i]: nomes[anterior[i]] for i in range(n) if anterior[i] != -1},
+                ciclo,
+            )
+
+        if ciclo:
+            raise CicloNegativoError(ciclo)
+
+        t = grafo.indice(fim)
+        if distancias[t] == float('inf'):
+            return float('inf'), []
+        return distancias[t], Sorting._reconstruir_caminho_csr(grafo, anterior, s, t)
+
+    @staticmethod
+    def _breadth_first_search_csr(grafo: GrafoCSR, inicio):
+        s = grafo.indice(inicio)
+        offsets, vizinhos = grafo.offsets, grafo.vizinhos
+
+        nivel = [-1] * grafo.ordem
+        pai = [-1] * grafo.ordem
+        nivel[s] = 0
+        fila = deque([s])
+        ordem_visita = [s]
+
+        while fila:
+            u = fila.popleft()
+            proximo_nivel = nivel[u] + 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = vizinhos[k]
+                if nivel[v] == -1:
+                    nivel[v] = proximo_nivel
+                    pai[v] = u
+                    fila.append(v)
+                    ordem_visita.append(v)
+
+        return _resultado_bfs_csr(grafo, ordem_visita, nivel, pai)
+
+    @staticmethod
+    def _bfs_shortest_path_csr(grafo: GrafoCSR, inicio, fim):
+        s = grafo.indice(inicio)
+        t = grafo.indice(fim)
+        if s == t:
+            return 0, [grafo.nomes[s]]
+
+        grafos = (grafo, grafo.transposto())
+        anteriores = ({s: -1}, {t: -1})
+        fronteiras = [[s], [t]]
+        encontro = -1
+
+        while encontro == -1 and fronteiras[0] and fronteiras[1]:
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            offsets, vizinhos = grafos[lado].offsets, grafos[lado].vizinhos
+            anterior, outro = anteriores[lado], anteriores[1 - lado]
+            proxima = []
+            for u in fronteiras[lado]:
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = vizinhos[k]
+                    if v in anterior:
+                        continue
+                    anterior[v] = u
+                    if v in outro:
+                        encontro = v
+                        break
+                    proxima.append(v)
+                if encontro != -1:
+                    break
+            fronteiras[lado] = proxima
+
+        if encontro == -1:
+            return float('inf'), []
+
+        caminho = [encontro]
+        while caminho[-1] != s:
+            caminho.append(anteriores[0][caminho[-1]])
+        caminho.reverse()
+        while caminho[-1] != t:
+            caminho.append(anteriores[1][caminho[-1]])
+        return len(caminho) - 1, [grafo.nomes[v] for v in caminho]
+
+    @staticmethod
+    def _depth_first_search_csr(grafo: GrafoCSR, inicio, classificar: bool = False, eventos=None):
+        nomes = grafo.nomes
+        offsets, vizinhos = grafo.offsets, grafo.vizinhos
+        n = grafo.ordem
+
+        # 0 = não visitado, 1 = visitando, 2 = visitado
+        estado = bytearray(n)
+        pais = array('q', [-1]) * n
+        ordem_descoberta = array('q', [0]) * n
+        descoberta = {}
+        finalizacao = {}
+        anterior = dict.fromkeys(nomes)
+        classificacao_arestas = {}
+        ordem_visita = []
+        componentes = []
+        tempo = 0
+        tem_ciclo = False
+
+        for raiz in (grafo.indice(inicio), *range(n)):
+            if estado[raiz]:
+                continue
+
+            vertices_antes = len(ordem_visita)
+            tempo += 1
+            estado[raiz] = 1
+            ordem_descoberta[raiz] = tempo
+            descoberta[nomes[raiz]] = tempo
+            ordem_visita.append(nomes[raiz])
+            if eventos is not None:
+                eventos('descoberta', nomes[raiz], None)
+            pilha = [raiz]
+            posicoes = [offsets[raiz]]
+
+            while pilha:
+                u = pilha[-1]
+                k = posicoes[-1]
+                fim = offsets[u + 1]
+                while k < fim:
+                    v = vizinhos[k]
+                    k += 1
+                    if estado[v] == 0:
+                        nome_u, nome_v = nomes[u], nomes[v]
+                        anterior[nome_v] = nome_u
+                        if classificar:
+                            aresta = (nome_u, nome_v) if nome_u <= nome_v else (nome_v, nome_u)
+                            classificacao_arestas[aresta] = 'arvore'
+                        if eventos is not None:
+                            eventos('arvore' if classificar else 'aresta', nome_u, nome_v)
+                        tempo += 1
+                        estado[v] = 1
+                        ordem_descoberta[v] = tempo
+                        descoberta[nome_v] = tempo
+                        ordem_visita.append(nome_v)
+                        if eventos is not None:
+                            eventos('descoberta', nome_v, nome_u)
+                        pais[v] = u
+                        posicoes[-1] = k
+                        pilha.append(v)
+                        posicoes.append(offsets[v])
+                        break
+
+                    visitando = estado[v] == 1
+                    if visitando:
+                        if v == pais[u]:
+                            continue
+                        tem_ciclo = True
+                    if not classificar:
+                        if eventos is not None:
+                            eventos('aresta', nomes[u], nomes[v])
+                        continue
+
+                    if visitando:
+                        tipo = 'retorno'
+                    elif ordem_descoberta[u] < ordem_descoberta[v]:
+                        tipo = 'avanco'
+                    else:
+                        tipo = 'cruzamento'
+                    nome_u, nome_v = nomes[u], nomes[v]
+                    aresta = (nome_u, nome_v) if nome_u <= nome_v else (nome_v, nome_u)
                     if aresta not in classificacao_arestas:
-                        if descoberta[u] < descoberta[v]:
-                            classificacao_arestas[aresta] = 'avanco'
-                        else:
-                            classificacao_arestas[aresta] = 'cruzamento'
-            
-            estado[u] = 'visitado'
-            tempo[0] += 1
-            finalizacao[u] = tempo[0]
-        
-        dfs_visitar(inicio.nome)
-        componentes.append(ordem_visita.copy())
-        
-        for nome in grafo.vertices:
-            if estado[nome] == 'nao_visitado':
-                componente_atual = []
-                vertices_antes = len(ordem_visita)
-                dfs_visitar(nome)
-                componente_atual = ordem_visita[vertices_antes:]
-                componentes.append(componente_atual)
-        
+                        classificacao_arestas[aresta] = tipo
+                        if eventos is not None:
+                            eventos(tipo, nome_u, nome_v)
+                else:
+                    pilha.pop()
+                    posicoes.pop()
+                    estado[u] = 2
+                    tempo += 1
+                    finalizacao[nomes[u]] = tempo
+                    if eventos is not None:
+                        eventos('finalizacao', nomes[u], nomes[pais[u]] if pais[u] != -1 else None)
+
+            componentes.append(ordem_visita[vertices_antes:])
+
         return {
             'descoberta': descoberta,
             'finalizacao': finalizacao,
@@ -261,4 +2218,3 @@ class Sorting:
             'tem_ciclo': tem_ciclo,
             'componentes': componentes
         }
-    
\ No newline at end of file
@@ -0,0 +1,419 @@
+import hashlib
+import json
+import os
+import sys
+import warnings
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config import CACHE_DIR
+from src.graphs.algorithms import MatrizDistancias, TabelasMarcos
+from src.graphs.graph import _AUSENTE, ColunasArestas, Grafo, GrafoDirecionado, Vertice
+from src.graphs.hierarquia import Arestas, HierarquiaContracao
+from src.graphs.rotulos import OraculoHubs, Rotulo
+
+VERSAO_CACHE = 3
+TAMANHO_BLOCO_HASH = 1 << 20
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _impressao_digital(caminho: Path) -> Dict[str, Union[str, int]]:
+    info = caminho.stat()
+    return {
+        'caminho': str(caminho.resolve()),
+        'tamanho': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+        'sha256': _hash_arquivo(caminho),
+    }
+
+
+def _fonte_inalterada(registrada: Dict, caminho: Path) -> bool:
+    # Tamanho e mtime iguais dispensam reler o arquivo; se só o mtime mudou
+    # (ex.: checkout ou touch), o hash do conteúdo decide.
+    try:
+        info = caminho.stat()
+    except OSError:
+        return False
+    if info.st_size != registrada['tamanho']:
+        return False
+    if info.st_mtime_ns == registrada['mtime_ns']:
+        return True
+    return _hash_arquivo(caminho) == registrada['sha256']
+
+
+def caminho_cache(fontes: Iterable[str], nome: str, opcoes: Optional[Dict] = None, diretorio: Path = None) -> Path:
+    """Arquivo de cache de um grafo construído a partir de ``fontes`` com ``opcoes``."""
+    chave = json.dumps(
+        {'fontes': [str(Path(f).resolve()) for f in fontes], 'opcoes': opcoes or {}},
+        sort_keys=True, default=str,
+    )
+    sufixo = hashlib.sha1(chave.encode('utf-8')).hexdigest()[:16]
+    return Path(diretorio or CACHE_DIR) / f"{nome}_{sufixo}.npz"
+
+
+def caminho_derivado(arquivo_grafo: Path, sufixo: str) -> Path:
+    """Arquivo de uma estrutura pré-computada guardada ao lado do cache do grafo."""
+    arquivo_grafo = Path(arquivo_grafo)
+    return arquivo_grafo.with_name(f"{arquivo_grafo.stem}.{sufixo}.npz")
+
+
+def _fontes_inalteradas(metadados: Dict, fontes: Iterable[str]) -> bool:
+    fontes = [Path(f) for f in fontes]
+    registradas = {r['caminho']: r for r in metadados['fontes']}
+    if len(registradas) != len(fontes):
+        return False
+    for fonte in fontes:
+        registrada = registradas.get(str(fonte.resolve()))
+        if registrada is None or not _fonte_inalterada(registrada, fonte):
+            return False
+    return True
+
+
+def _salvar_npz(caminho: Path, tipo: str, arrays: Dict[str, np.ndarray], fontes: Iterable[str] = (), **metadados) -> None:
+    """Grava ``arrays`` com os metadados comuns (versão, tipo, impressão digital das fontes)."""
+    metadados = {
+        'versao': VERSAO_CACHE,
+        'tipo': tipo,
+        'fontes': [_impressao_digital(Path(f)) for f in fontes],
+        **metadados,
+    }
+    arrays['metadados'] = np.asarray(json.dumps(metadados, default=str))
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(f"{caminho.stem}.{os.getpid()}.tmp.npz")
+    np.savez(temporario, **arrays)
+    os.replace(temporario, caminho)
+
+
+def _carregar_npz(caminho: Path, tipo: str, fontes: Optional[Iterable[str]] = None) -> Optional[Tuple[Dict[str, np.ndarray], Dict]]:
+    """``(arrays, metadados)`` gravados por ``_salvar_npz``.
+
+    Retorna ``None`` se o arquivo não existe, é inválido, é de outra versão
+    ou outro ``tipo``, ou se alguma das ``fontes`` mudou desde a gravação.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return None
+
+    try:
+        with np.load(caminho, allow_pickle=False) as dados:
+            metadados = json.loads(str(dados['metadados']))
+            if metadados.get('versao') != VERSAO_CACHE or metadados.get('tipo') != tipo:
+                return None
+            if fontes is not None and not _fontes_inalteradas(metadados, fontes):
+                return None
+            return {nome: dados[nome] for nome in dados.files if nome != 'metadados'}, metadados
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class _TabelaStrings:
+    def __init__(self):
+        self.strings: List[str] = []
+        self.indices: Dict[str, int] = {}
+
+    def indice(self, texto: str) -> int:
+        i = self.indices.get(texto)
+        if i is None:
+            i = self.indices[texto] = len(self.strings)
+            self.strings.append(texto)
+        return i
+
+
+def _avisar_sem_cache(motivo: str) -> None:
+    warnings.warn(f"Grafo não gravado no cache binário: {motivo}.", RuntimeWarning, stacklevel=3)
+
+
+def _codificar_coluna(valores: List, tabela: _TabelaStrings) -> Optional[Tuple[str, np.ndarray]]:
+    presentes = [v for v in valores if v is not _AUSENTE]
+    completa = len(presentes) == len(valores)
+
+    if completa and all(type(v) is int for v in presentes):
+        return 'int', np.asarray(valores, dtype=np.int64)
+    if completa and all(type(v) in (int, float) for v in presentes):
+        return 'float', np.asarray(valores, dtype=np.float64)
+    if all(type(v) is str for v in presentes):
+        return 'str', np.asarray(
+            [tabela.indice(v) if v is not _AUSENTE else -1 for v in valores], dtype=np.int64
+        )
+    return None
+
+
+def _decodificar_coluna(tipo: str, dados: np.ndarray, strings: List[str]) -> Union[array, list]:
+    if tipo == 'int':
+        return array('q', dados.astype(np.int64).tobytes())
+    if tipo == 'float':
+        return array('d', dados.astype(np.float64).tobytes())
+    return [strings[i] if i >= 0 else _AUSENTE for i in dados.tolist()]
+
+
+def salvar_grafo_binario(grafo: Grafo, caminho: Path, fontes: Iterable[str] = (), opcoes: Optional[Dict] = None) -> bool:
+    """Serializa o grafo em um ``.npz`` (CSR + tabela de strings internadas).
+
+    Retorna ``False`` sem gravar nada (com um ``RuntimeWarning``) se algum
+    atributo não puder ser representado nas colunas binárias.
+    """
+    tabela = _TabelaStrings()
+    nomes = list(grafo.vertices)
+    if not all(type(nome) is str for nome in nomes):
+        _avisar_sem_cache("há nomes de vértice que não são str")
+        return False
+    for nome in nomes:
+        tabela.indice(nome)
+
+    indices = {nome: i for i, nome in enumerate(nomes)}
+    offsets = [0]
+    vizinhos: List[int] = []
+    ids_arestas: List[int] = []
+    for nome in nomes:
+        for nome_vizinho, id_aresta in grafo.mapa_adjacencia[nome].items():
+            vizinhos.append(indices[nome_vizinho])
+            ids_arestas.append(id_aresta)
+        offsets.append(len(vizinhos))
+
+    chaves_vertices: List[str] = []
+    for vertice in grafo.vertices.values():
+        for chave in vertice.atributos:
+            if chave not in chaves_vertices:
+                chaves_vertices.append(chave)
+
+    arrays = {
+        'offsets': np.asarray(offsets, dtype=np.int64),
+        'vizinhos': np.asarray(vizinhos, dtype=np.int64),
+        'ids_arestas': np.asarray(ids_arestas, dtype=np.int64),
+        'pesos': np.frombuffer(grafo.colunas_arestas.pesos, dtype=np.float64),
+    }
+    tipos_vertices = []
+    for k, chave in enumerate(chaves_vertices):
+        valores = [v.atributos.get(chave, _AUSENTE) for v in grafo.vertices.values()]
+        codificada = _codificar_coluna(valores, tabela)
+        if codificada is None:
+            _avisar_sem_cache(f"o atributo de vértice '{chave}' mistura tipos")
+            return False
+        tipos_vertices.append((chave, codificada[0]))
+        arrays[f'vertice_{k}'] = codificada[1]
+
+    tipos_arestas = []
+    for k, (chave, coluna) in enumerate(grafo.colunas_arestas.colunas.items()):
+        if isinstance(coluna, array):
+            tipo = 'int' if coluna.typecode == 'q' else 'float'
+            dados = np.frombuffer(coluna, dtype=np.int64 if tipo == 'int' else np.float64)
+        else:
+            codificada = _codificar_coluna(coluna, tabela)
+            if codificada is None:
+                _avisar_sem_cache(f"o atributo de aresta '{chave}' mistura tipos")
+                return False
+            tipo, dados = codificada
+        tipos_arestas.append((chave, tipo))
+        arrays[f'aresta_{k}'] = dados
+
+    arrays['strings'] = np.asarray(tabela.strings, dtype=str)
+    _salvar_npz(
+        caminho, 'grafo', arrays, fontes,
+        direcionado=grafo.direcionado,
+        num_vertices=len(nomes),
+        num_arestas=grafo.tamanho,
+        ids_livres=list(grafo.colunas_arestas._livres),
+        atributos_vertices=tipos_vertices,
+        atributos_arestas=tipos_arestas,
+        aliases=grafo._indice_nomes.aliases if grafo._indice_nomes is not None else {},
+        opcoes=opcoes or {},
+    )
+    return True
+
+
+def carregar_grafo_binario(caminho: Path, fontes: Optional[Iterable[str]] = None) -> Optional[Grafo]:
+    """Reconstrói o grafo salvo por ``salvar_grafo_binario``.
+
+    Se ``fontes`` for informado, retorna ``None`` quando algum arquivo de
+    origem mudou desde a gravação (ou quando o cache não existe/é inválido).
+    """
+    carregado = _carregar_npz(caminho, 'grafo', fontes)
+    if carregado is None:
+        return None
+    dados, metadados = carregado
+
+    strings = [sys.intern(s) for s in dados['strings'].tolist()]
+    offsets = dados['offsets'].tolist()
+    vizinhos = dados['vizinhos'].tolist()
+    ids_arestas = dados['ids_arestas'].tolist()
+
+    colunas_vertices = [
+        (chave, _decodificar_coluna(tipo, dados[f'vertice_{k}'], strings))
+        for k, (chave, tipo) in enumerate(metadados['atributos_vertices'])
+    ]
+
+    colunas_arestas = ColunasArestas()
+    colunas_arestas.pesos = array('d', dados['pesos'].astype(np.float64).tobytes())
+    colunas_arestas._livres = list(metadados['ids_livres'])
+    for k, (chave, tipo) in enumerate(metadados['atributos_arestas']):
+        colunas_arestas.colunas[chave] = _decodificar_coluna(tipo, dados[f'aresta_{k}'], strings)
+
+    grafo = GrafoDirecionado() if metadados['direcionado'] else Grafo()
+    nomes = strings[:metadados['num_vertices']]
+    for i, nome in enumerate(nomes):
+        vertice = Vertice(nome)
+        for chave, coluna in colunas_vertices:
+            valor = coluna[i]
+            if valor is not _AUSENTE:
+                vertice.atributos[chave] = valor
+        grafo.adicionar_vertice(vertice)
+        inicio, fim = offsets[i], offsets[i + 1]
+        grafo.mapa_adjacencia[nome] = dict(zip([nomes[j] for j in vizinhos[inicio:fim]], ids_arestas[inicio:fim]))
+
+    grafo.colunas_arestas = colunas_arestas
+    grafo._num_arestas = metadados['num_arestas']
+    for alias, nome in metadados.get('aliases', {}).items():
+        grafo.indice_nomes.adicionar_alias(alias, nome)
+    return grafo
+
+
+def salvar_tabelas_marcos(tabelas: TabelasMarcos, caminho: Path, fontes: Iterable[str] = ()) -> None:
+    """Grava as tabelas ALT; ``fontes`` costuma ser o próprio cache do grafo."""
+    arrays = {
+        'nomes': np.asarray(tabelas.nomes, dtype=str),
+        'marcos': np.asarray(tabelas.marcos, dtype=np.int64),
+        'ida': np.asarray([np.frombuffer(d, dtype=np.float64) for d in tabelas.ida], dtype=np.float64).reshape(len(tabelas), len(tabelas.nomes)),
+    }
+    if tabelas.direcionado:
+        arrays['volta'] = np.asarray([np.frombuffer(d, dtype=np.float64) for d in tabelas.volta], dtype=np.float64).reshape(len(tabelas), len(tabelas.nomes))
+    _salvar_npz(caminho, 'marcos', arrays, fontes, direcionado=tabelas.direcionado, estrategia=tabelas.estrategia)
+
+
+def carregar_tabelas_marcos(caminho: Path, fontes: Optional[Iterable[str]] = None) -> Optional[TabelasMarcos]:
+    carregado = _carregar_npz(caminho, 'marcos', fontes)
+    if carregado is None:
+        return None
+    dados, metadados = carregado
+
+    nomes = [sys.intern(s) for s in dados['nomes'].tolist()]
+    ida = [array('d', linha.tobytes()) for linha in dados['ida'].astype(np.float64)]
+    volta = [array('d', linha.tobytes()) for linha in dados['volta'].astype(np.float64)] if metadados['direcionado'] else ida
+    marcos = dados['marcos'].tolist()
+    return TabelasMarcos(nomes, marcos, ida, volta, metadados['direcionado'], metadados['estrategia'])
+
+
+def _codificar_arestas(arestas: List[Arestas], prefixo: str, arrays: Dict[str, np.ndarray]) -> None:
+    offsets, destinos, pesos, meios = [0], [], [], []
+    for saida in arestas:
+        for w, (peso, meio) in saida.items():
+            destinos.append(w)
+            pesos.append(peso)
+            meios.append(meio)
+        offsets.append(len(destinos))
+    arrays[f'{prefixo}_offsets'] = np.asarray(offsets, dtype=np.int64)
+    arrays[f'{prefixo}_destinos'] = np.asarray(destinos, dtype=np.int64)
+    arrays[f'{prefixo}_pesos'] = np.asarray(pesos, dtype=np.float64)
+    arrays[f'{prefixo}_meios'] = np.asarray(meios, dtype=np.int64)
+
+
+def _decodificar_arestas(dados, prefixo: str) -> List[Arestas]:
+    offsets = dados[f'{prefixo}_offsets'].tolist()
+    destinos = dados[f'{prefixo}_destinos'].tolist()
+    pares = list(zip(dados[f'{prefixo}_pesos'].tolist(), dados[f'{prefixo}_meios'].tolist()))
+    return [
+        dict(zip(destinos[offsets[v]:offsets[v + 1]], pares[offsets[v]:offsets[v + 1]]))
+        for v in range(len(offsets) - 1)
+    ]
+
+
+def salvar_hierarquia(hierarquia: HierarquiaContracao, caminho: Path, fontes: Iterable[str] = ()) -> None:
+    """Grava a hierarquia de contração (níveis + arestas ascendentes com atalhos)."""
+    arrays = {
+        'nomes': np.asarray(hierarquia.nomes, dtype=str),
+        'nivel': np.asarray(hierarquia.nivel, dtype=np.int64),
+    }
+    _codificar_arestas(hierarquia.acima, 'acima', arrays)
+    _codificar_arestas(hierarquia.acima_reverso, 'reverso', arrays)
+    _salvar_npz(caminho, 'hierarquia', arrays, fontes, direcionado=hierarquia.direcionado)
+
+
+def carregar_hierarquia(caminho: Path, fontes: Optional[Iterable[str]] = None) -> Optional[HierarquiaContracao]:
+    carregado = _carregar_npz(caminho, 'hierarquia', fontes)
+    if carregado is None:
+        return None
+    dados, metadados = carregado
+
+    nomes = [sys.intern(s) for s in dados['nomes'].tolist()]
+    nivel = dados['nivel'].tolist()
+    acima = _decodificar_arestas(dados, 'acima')
+    acima_reverso = _decodificar_arestas(dados, 'reverso')
+    return HierarquiaContracao(nomes, nivel, acima, acima_reverso, metadados['direcionado'])
+
+
+def _codificar_rotulos(rotulos: List[Rotulo], prefixo: str, arrays: Dict[str, np.ndarray]) -> None:
+    arrays[f'{prefixo}_offsets'] = np.cumsum([0] + [len(r) for r in rotulos], dtype=np.int64)
+    for campo, tipo in (('hubs', np.int64), ('distancias', np.float64), ('anteriores', np.int64)):
+        arrays[f'{prefixo}_{campo}'] = np.concatenate(
+            [np.frombuffer(getattr(r, campo), dtype=tipo) for r in rotulos] or [np.empty(0, dtype=tipo)]
+        ).astype(tipo)
+
+
+def _decodificar_rotulos(dados, prefixo: str) -> List[Rotulo]:
+    offsets = dados[f'{prefixo}_offsets'].tolist()
+    hubs = dados[f'{prefixo}_hubs'].tolist()
+    distancias = dados[f'{prefixo}_distancias'].tolist()
+    anteriores = dados[f'{prefixo}_anteriores'].tolist()
+    return [
+        Rotulo(hubs[inicio:fim], distancias[inicio:fim], anteriores[inicio:fim])
+        for inicio, fim in zip(offsets, offsets[1:])
+    ]
+
+
+def salvar_oraculo_hubs(oraculo: OraculoHubs, caminho: Path, fontes: Iterable[str] = ()) -> None:
+    """Grava os rótulos 2-hop do oráculo; ``fontes`` costuma ser o próprio cache do grafo."""
+    arrays = {
+        'nomes': np.asarray(oraculo.nomes, dtype=str),
+        'hubs': np.asarray(oraculo.hubs, dtype=np.int64),
+    }
+    _codificar_rotulos(oraculo.saida, 'saida', arrays)
+    if oraculo.direcionado:
+        _codificar_rotulos(oraculo.entrada, 'entrada', arrays)
+    _salvar_npz(caminho, 'oraculo', arrays, fontes, direcionado=oraculo.direcionado)
+
+
+def carregar_oraculo_hubs(caminho: Path, fontes: Optional[Iterable[str]] = None) -> Optional[OraculoHubs]:
+    carregado = _carregar_npz(caminho, 'oraculo', fontes)
+    if carregado is None:
+        return None
+    dados, metadados = carregado
+
+    nomes = [sys.intern(s) for s in dados['nomes'].tolist()]
+    hubs = dados['hubs'].tolist()
+    saida = _decodificar_rotulos(dados, 'saida')
+    entrada = _decodificar_rotulos(dados, 'entrada') if metadados['direcionado'] else saida
+    return OraculoHubs(nomes, hubs, saida, entrada, metadados['direcionado'])
+
+
+def salvar_matriz_distancias(matriz: MatrizDistancias, caminho: Path, fontes: Iterable[str] = ()) -> None:
+    """Grava a matriz de distâncias (e predecessores, se houver); ``fontes`` costuma ser o próprio cache do grafo."""
+    arrays = {
+        'nomes': np.asarray(matriz.nomes, dtype=str),
+        'distancias': matriz.distancias,
+    }
+    if matriz.anteriores is not None:
+        arrays['anteriores'] = matriz.anteriores
+    _salvar_npz(caminho, 'matriz', arrays, fontes)
+
+
+def carregar_matriz_distancias(caminho: Path, fontes: Optional[Iterable[str]] = None) -> Optional[MatrizDistancias]:
+    carregado = _carregar_npz(caminho, 'matriz', fontes)
+    if carregado is None:
+        return None
+    dados, _ = carregado
+
+    nomes = [sys.intern(s) for s in dados['nomes'].tolist()]
+    distancias = dados['distancias']
+    anteriores = dados.get('anteriores')
+    return MatrizDistancias(nomes, distancias, anteriores)
@@ -1,51 +1,353 @@
-from typing import Generator, List, Dict, Set, Iterable, Union, Tuple
+import sys
+import warnings
+from array import array
+from collections.abc import Mapping
+from typing import Generator, List, Dict, Set, Iterable, Union, Tuple, Optional
+
+def _aviso_obsoleto(antigo: str, novo: str) -> None:
+    warnings.warn(f"Vertice.{antigo} está obsoleto; use {novo}.", DeprecationWarning, stacklevel=3)
+
 
 class Vertice:
+    __slots__ = ('nome', 'atributos', '_grafo')
+
     def __init__(self, nome: str):
         self.nome = nome
-        self.vizinhos: List['Vertice'] = []
         self.atributos: Dict[str, Union[str, int, float]] = {}
-    
-    
+        self._grafo: Optional['Grafo'] = None
+
+    @property
+    def vizinhos(self) -> List['Vertice']:
+        # Visão somente leitura: a topologia vive em Grafo.mapa_adjacencia.
+        if self._grafo is None:
+            return []
+        vertices = self._grafo.vertices
+        return [vertices[nome] for nome in self._grafo.mapa_adjacencia[self.nome]]
+
+    @property
+    def grau(self) -> int:
+        # Sem montar a lista de ``vizinhos``.
+        if self._grafo is None:
+            return 0
+        return len(self._grafo.mapa_adjacencia[self.nome])
+
+    def esta_conectado_a(self, vertice: 'Vertice') -> bool:
+        if self._grafo is None:
+            return False
+        return vertice.nome in self._grafo.mapa_adjacencia[self.nome]
+
+    # Mutadores antigos: a lista de vizinhos agora vive no grafo dono do
+    # vértice, então eles só repassam para as arestas desse grafo.
+
+    def _grafo_dono(self) -> 'Grafo':
+        if self._grafo is None:
+            raise ValueError(f"Vértice '{self.nome}' não pertence a nenhum grafo.")
+        return self._grafo
+
     def adicionar_vizinho(self, vizinho: 'Vertice') -> bool:
-        adicionou = False
-        if vizinho not in self.vizinhos:
-            self.vizinhos.append(vizinho)
-            self.vizinhos.sort(key=lambda vertice: vertice.nome)
-            adicionou = True
-        return adicionou
-    
+        _aviso_obsoleto('adicionar_vizinho', 'Grafo.adicionar_aresta')
+        grafo = self._grafo_dono()
+        if vizinho.nome in grafo.mapa_adjacencia[self.nome]:
+            return False
+        return grafo.adicionar_aresta(self, vizinho)
+
     def adicionar_vizinhos(self, vizinhos: List['Vertice']):
+        _aviso_obsoleto('adicionar_vizinhos', 'Grafo.adicionar_aresta')
+        grafo = self._grafo_dono()
         for vizinho in vizinhos:
-            self.adicionar_vizinho(vizinho)
-    
+            if vizinho.nome not in grafo.mapa_adjacencia[self.nome]:
+                grafo.adicionar_aresta(self, vizinho)
+
     def remover_vizinho(self, vizinho: 'Vertice') -> bool:
-        removeu = False
-        if vizinho in self.vizinhos:
-            self.vizinhos.remove(vizinho)
-            removeu = True
-        return removeu
-    
+        _aviso_obsoleto('remover_vizinho', 'Grafo.remover_aresta')
+        return self._grafo_dono().remover_aresta(self, vizinho)
+
     def remover_vizinhos(self, vizinhos: List['Vertice']):
+        _aviso_obsoleto('remover_vizinhos', 'Grafo.remover_aresta')
+        grafo = self._grafo_dono()
         for vizinho in vizinhos:
-            self.remover_vizinho(vizinho)
+            grafo.remover_aresta(self, vizinho)
 
     def limpar_vizinhos(self):
-        self.vizinhos.clear()
-
-    def esta_conectado_a(self, vertice: 'Vertice') -> bool:
-        return vertice in self.vizinhos
+        _aviso_obsoleto('limpar_vizinhos', 'Grafo.remover_aresta')
+        grafo = self._grafo_dono()
+        for vizinho in self.vizinhos:
+            grafo.remover_aresta(self, vizinho)
     
     def __str__(self):
         return self.nome
 
 
+_AUSENTE = object()
+
+# Tipo exato aceito por cada coluna tipada.
+_TIPO_COLUNA = {'q': int, 'd': float}
+
+
+class ColunasArestas:
+    """Atributos das arestas em formato colunar, indexados pelo id da aresta.
+
+    Os pesos ficam em um ``array('d')``. Cada outro atributo vira uma coluna:
+    ``array('q')`` enquanto todos os valores forem ``int`` de 64 bits,
+    ``array('d')`` enquanto forem ``float`` e lista para o resto, com strings
+    internadas. Uma coluna tipada que recebe qualquer outro valor (ou um
+    ausente) é convertida para lista, para que a leitura devolva o tipo gravado.
+    """
+
+    __slots__ = ('pesos', 'colunas', '_livres')
+
+    def __init__(self):
+        self.pesos = array('d')
+        self.colunas: Dict[str, Union[array, list]] = {}
+        self._livres: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.pesos) - len(self._livres)
+
+    @staticmethod
+    def _nova_coluna(valor, tamanho: int) -> Union[array, list]:
+        # Só dá para tipar a coluna se nenhuma outra aresta precisar ficar ausente.
+        if tamanho == 1 and type(valor) is int:
+            return array('q', [0])
+        if tamanho == 1 and type(valor) is float:
+            return array('d', [0.0])
+        return [_AUSENTE] * tamanho
+
+    def _escrever(self, nome: str, id_aresta: int, valor):
+        coluna = self.colunas[nome]
+        if type(coluna) is array:
+            if type(valor) is _TIPO_COLUNA[coluna.typecode]:
+                try:
+                    if id_aresta == len(coluna):
+                        coluna.append(valor)
+                    else:
+                        coluna[id_aresta] = valor
+                    return
+                except OverflowError:
+                    pass
+            coluna = self.colunas[nome] = list(coluna)
+
+        if type(valor) is str:
+            valor = sys.intern(valor)
+        if id_aresta == len(coluna):
+            coluna.append(valor)
+        else:
+            coluna[id_aresta] = valor
+
+    def _gravar(self, id_aresta: int, peso: float, atributos: Dict):
+        if id_aresta == len(self.pesos):
+            self.pesos.append(peso)
+        else:
+            self.pesos[id_aresta] = peso
+
+        for nome, valor in atributos.items():
+            if nome not in self.colunas:
+                self.colunas[nome] = self._nova_coluna(valor, len(self.pesos))
+            self._escrever(nome, id_aresta, valor)
+
+        for nome in self.colunas:
+            if nome not in atributos:
+                self._escrever(nome, id_aresta, _AUSENTE)
+
+    def adicionar(self, peso: float, atributos: Dict) -> int:
+        id_aresta = self._livres.pop() if self._livres else len(self.pesos)
+        self._gravar(id_aresta, peso, atributos)
+        return id_aresta
+
+    def atualizar(self, id_aresta: int, peso: float, atributos: Dict):
+        self._gravar(id_aresta, peso, atributos)
+
+    def remover(self, id_aresta: int):
+        self._livres.append(id_aresta)
+
+    def registro(self, id_aresta: int) -> Dict[str, Union[str, int, float]]:
+        registro = {'peso': self.pesos[id_aresta]}
+        for nome, coluna in self.colunas.items():
+            valor = coluna[id_aresta]
+            if valor is not _AUSENTE:
+                registro[nome] = valor
+        return registro
+
+
+class _VisaoArestas(Mapping):
+    """Visão somente leitura de ``chave_aresta -> registro`` sobre o mapa de adjacência."""
+
+    def __init__(self, grafo: 'Grafo'):
+        self._grafo = grafo
+
+    def __getitem__(self, chave):
+        try:
+            u, v = chave
+        except (TypeError, ValueError):
+            raise KeyError(chave)
+        if not self._grafo.direcionado and u > v:
+            raise KeyError(chave)
+        return self._grafo.colunas_arestas.registro(self._grafo.mapa_adjacencia[u][v])
+
+    def __iter__(self):
+        direcionado = self._grafo.direcionado
+        for u, vizinhos in self._grafo.mapa_adjacencia.items():
+            for v in vizinhos:
+                if direcionado or u <= v:
+                    yield (u, v)
+
+    def __len__(self):
+        return self._grafo.tamanho
+
+
+class _VisaoAdjacencias(Mapping):
+    """Visão somente leitura de ``nome -> nomes dos vizinhos`` (set-like)."""
+
+    def __init__(self, grafo: 'Grafo'):
+        self._grafo = grafo
+
+    def __getitem__(self, nome):
+        return self._grafo.mapa_adjacencia[nome].keys()
+
+    def __iter__(self):
+        return iter(self._grafo.mapa_adjacencia)
+
+    def __len__(self):
+        return len(self._grafo.mapa_adjacencia)
+
+
+class GrafoCSR:
+    """Snapshot imutável de um grafo em formato CSR (Compressed Sparse Row).
+
+    Os vértices são internados em ids inteiros densos (na ordem de inserção do
+    grafo original). Os vizinhos do vértice ``i`` ficam em
+    ``vizinhos[offsets[i]:offsets[i + 1]]``, ordenados pelo nome, com os pesos
+    correspondentes em ``pesos``.
+    """
+
+    __slots__ = ('nomes', 'indices', 'offsets', 'vizinhos', 'pesos', 'direcionado', '_transposto', '_perfil_pesos', '_arvores')
+
+    def __init__(self, nomes: Iterable[str], offsets: array, vizinhos: array, pesos: array, direcionado: bool = False):
+        self.nomes: Tuple[str, ...] = tuple(nomes)
+        self.indices: Dict[str, int] = {nome: i for i, nome in enumerate(self.nomes)}
+        self.offsets = offsets
+        self.vizinhos = vizinhos
+        self.pesos = pesos
+        self.direcionado = direcionado
+        self._transposto: Optional['GrafoCSR'] = None
+        self._perfil_pesos = None
+        self._arvores = None
+
+    def transposto(self) -> 'GrafoCSR':
+        """Snapshot com as arestas invertidas (o próprio snapshot se não direcionado)."""
+        if not self.direcionado:
+            return self
+        if self._transposto is None:
+            n = self.ordem
+            offsets, vizinhos, pesos = self.offsets, self.vizinhos, self.pesos
+            contagem = [0] * (n + 1)
+            for v in vizinhos:
+                contagem[v + 1] += 1
+            for i in range(n):
+                contagem[i + 1] += contagem[i]
+
+            novos_offsets = array('q', contagem)
+            novos_vizinhos = array('q', bytes(8 * len(vizinhos)))
+            novos_pesos = array('d', bytes(8 * len(pesos)))
+            proxima = contagem[:-1]
+            for u in range(n):
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = vizinhos[k]
+                    novos_vizinhos[proxima[v]] = u
+                    novos_pesos[proxima[v]] = pesos[k]
+                    proxima[v] += 1
+
+            self._transposto = GrafoCSR(self.nomes, novos_offsets, novos_vizinhos, novos_pesos, direcionado=True)
+            self._transposto._transposto = self
+        return self._transposto
+
+    def indice(self, vertice: Union[Vertice, str, int]) -> int:
+        if isinstance(vertice, int):
+            return vertice
+        nome = str(vertice)
+        if nome not in self.indices:
+            raise ValueError(f"Vértice '{nome}' não encontrado no grafo.")
+        return self.indices[nome]
+
+    def contem_vertice(self, vertice: Union[Vertice, str]) -> bool:
+        return str(vertice) in self.indices
+
+    def obter_vizinhos(self, nome_vertice: str) -> List[str]:
+        i = self.indice(nome_vertice)
+        nomes = self.nomes
+        return [nomes[j] for j in self.vizinhos[self.offsets[i]:self.offsets[i + 1]]]
+
+    def grau(self, nome_vertice: str) -> int:
+        i = self.indice(nome_vertice)
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def obter_peso(self, nome_vertice_a: str, nome_vertice_b: str) -> float:
+        a = self.indices.get(nome_vertice_a)
+        b = self.indices.get(nome_vertice_b)
+        if a is None or b is None:
+            return float('inf')
+        for k in range(self.offsets[a], self.offsets[a + 1]):
+            if self.vizinhos[k] == b:
+                return self.pesos[k]
+        return float('inf')
+
+    @property
+    def ordem(self) -> int:
+        return len(self.nomes)
+
+    @property
+    def tamanho(self) -> int:
+        if self.direcionado:
+            return len(self.vizinhos)
+        lacos = sum(
+            1 for i in range(self.ordem)
+            for k in range(self.offsets[i], self.offsets[i + 1])
+            if self.vizinhos[k] == i
+        )
+        return (len(self.vizinhos) + lacos) // 2
+
+    @property
+    def densidade(self) -> float:
+        if self.ordem < 2:
+            return 0.0
+        arestas_maximas = self.ordem * (self.ordem - 1)
+        if not self.direcionado:
+            arestas_maximas /= 2
+        return self.tamanho / arestas_maximas
+
+
 class Grafo:
+    direcionado = False
+
     def __init__(self):
         self.vertices: Dict[str, Vertice] = {}
-        self.arestas: Dict[tuple[str, str], Dict[str, Union[str, int, float]]] = {}
-        self.adjacencias: Dict[str, Set[str]] = {}
+        # Única estrutura de topologia: nome -> {vizinho: id da aresta}.
+        # Em grafos não direcionados os dois sentidos compartilham o mesmo id.
+        # Peso e demais atributos ficam em colunas_arestas, indexados pelo id.
+        self.mapa_adjacencia: Dict[str, Dict[str, int]] = {}
+        self.colunas_arestas = ColunasArestas()
         self.atributos_vertices: Dict[str, Dict] = {}
+        self._num_arestas = 0
+        self._indice_nomes = None
+        self._mapa_reverso = None
+        # Perfil dos pesos (Sorting.perfil_pesos); descartado quando uma aresta muda.
+        self._perfil_pesos = None
+        # Incrementada a cada vértice ou aresta adicionado/removido; invalida
+        # as árvores de caminhos mínimos em cache (Sorting.cache_arvores).
+        self.versao = 0
+        self._arvores = None
+        # Arquivo .npz de onde o grafo veio (ou para onde foi salvo), se houver.
+        # Esquecido a cada alteração, junto com as estruturas derivadas dele
+        # (marcos, oráculo, matriz), que deixam de valer para o grafo.
+        self.arquivo_cache: Optional[str] = None
+
+    @property
+    def arestas(self) -> Mapping:
+        return _VisaoArestas(self)
+
+    @property
+    def adjacencias(self) -> Mapping:
+        return _VisaoAdjacencias(self)
 
     def contem_vertice(self, vertice: Vertice) -> bool:
         return vertice.nome in self.vertices
@@ -56,42 +358,153 @@ class Grafo:
             
         if vertice.nome in self.vertices:
             return False
+        if vertice._grafo is not None and vertice._grafo is not self:
+            # vizinhos/esta_conectado_a consultam um único grafo dono.
+            raise ValueError(f"Vértice '{vertice.nome}' já pertence a outro grafo; use um novo Vertice (ex.: Vertice(nome)).")
         
         self.vertices[vertice.nome] = vertice
-        self.adjacencias[vertice.nome] = set()
+        self.mapa_adjacencia[vertice.nome] = {}
         self.atributos_vertices[vertice.nome] = vertice.atributos
+        vertice._grafo = self
+        self._mapa_reverso = None
+        self.versao += 1
+        self.arquivo_cache = None
+        if self._indice_nomes is not None:
+            self._indice_nomes.adicionar(vertice.nome)
         return True
+
+    @property
+    def indice_nomes(self):
+        if self._indice_nomes is None:
+            from .indices import IndiceNomes
+            self._indice_nomes = IndiceNomes(self.vertices)
+        return self._indice_nomes
+
+    def resolver_vertice(self, texto: Union[Vertice, str]) -> Optional[str]:
+        return self.indice_nomes.resolver(str(texto))
+
+    def sugerir_vertices(self, texto: str, k: int = 10) -> List[str]:
+        return self.indice_nomes.sugerir(texto, k)
+
+    @property
+    def mapa_adjacencia_reverso(self) -> Dict[str, Dict[str, int]]:
+        """nome -> {predecessor: id da aresta}. Em grafos não direcionados é o próprio mapa."""
+        if not self.direcionado:
+            return self.mapa_adjacencia
+        if self._mapa_reverso is None:
+            reverso = {nome: {} for nome in self.mapa_adjacencia}
+            for nome_origem, vizinhos in self.mapa_adjacencia.items():
+                for nome_destino, id_aresta in vizinhos.items():
+                    reverso[nome_destino][nome_origem] = id_aresta
+            self._mapa_reverso = reverso
+        return self._mapa_reverso
+
+    def _ligar(self, nome_origem: str, nome_destino: str, id_aresta: int, ordenar: bool = True):
+        self._mapa_reverso = None
+        vizinhos = self.mapa_adjacencia[nome_origem]
+        fora_de_ordem = ordenar and vizinhos and nome_destino < next(reversed(vizinhos))
+        vizinhos[nome_destino] = id_aresta
+        if fora_de_ordem:
+            self._ordenar_vizinhos(nome_origem)
+
+    def _gravar_aresta(self, nome_origem: str, nome_destino: str, peso: float, atributos: Dict, ordenar: bool = True) -> bool:
+        self._perfil_pesos = None
+        self.versao += 1
+        self.arquivo_cache = None
+        id_existente = self.mapa_adjacencia[nome_origem].get(nome_destino)
+        if id_existente is not None:
+            self.colunas_arestas.atualizar(id_existente, peso, atributos)
+            return False
+
+        id_aresta = self.colunas_arestas.adicionar(peso, atributos)
+        self._ligar(nome_origem, nome_destino, id_aresta, ordenar)
+        if not self.direcionado:
+            self._ligar(nome_destino, nome_origem, id_aresta, ordenar)
+        self._num_arestas += 1
+        return True
+
+    def _ordenar_vizinhos(self, nome: str):
+        vizinhos = self.mapa_adjacencia[nome]
+        itens = sorted(vizinhos.items())
+        vizinhos.clear()
+        vizinhos.update(itens)
     
     def adicionar_aresta(self, vertice_origem: Vertice, vertice_destino: Vertice, peso: float = 1.0, **atributos) -> bool:
         if not self.contem_vertice(vertice_origem) or not self.contem_vertice(vertice_destino):
             return False
         
-        self.vertices[vertice_origem.nome].adicionar_vizinho(vertice_destino)
-        self.vertices[vertice_destino.nome].adicionar_vizinho(vertice_origem)
-        
-        chave_aresta = tuple(sorted([vertice_origem.nome, vertice_destino.nome]))
-        self.arestas[chave_aresta] = {'peso': peso, **atributos}
-        
-        self.adjacencias[vertice_origem.nome].add(vertice_destino.nome)
-        self.adjacencias[vertice_destino.nome].add(vertice_origem.nome)
-        
+        self._gravar_aresta(vertice_origem.nome, vertice_destino.nome, peso, atributos)
+        return True
+
+    def adicionar_arestas_em_lote(self, arestas: Iterable[tuple]) -> int:
+        """Adiciona várias arestas de uma vez.
+
+        Cada item é ``(origem, destino)``, ``(origem, destino, peso)`` ou
+        ``(origem, destino, peso, atributos)``. Os vizinhos são inseridos sem
+        reordenar e cada lista de adjacência é ordenada uma única vez no fim,
+        mantendo a mesma ordem que ``adicionar_aresta`` produziria.
+        """
+        tocados: Set[str] = set()
+        adicionadas = 0
+
+        for aresta in arestas:
+            origem, destino = str(aresta[0]), str(aresta[1])
+            peso = aresta[2] if len(aresta) > 2 else 1.0
+            atributos = aresta[3] if len(aresta) > 3 else {}
+
+            if origem not in self.vertices or destino not in self.vertices:
+                continue
+
+            self._gravar_aresta(origem, destino, peso, atributos, ordenar=False)
+            tocados.add(origem)
+            if not self.direcionado:
+                tocados.add(destino)
+            adicionadas += 1
+
+        for nome in tocados:
+            self._ordenar_vizinhos(nome)
+
+        return adicionadas
+
+    def remover_aresta(self, vertice_origem: Vertice, vertice_destino: Vertice) -> bool:
+        if not self.contem_vertice(vertice_origem) or not self.contem_vertice(vertice_destino):
+            return False
+
+        id_aresta = self.mapa_adjacencia[vertice_origem.nome].pop(vertice_destino.nome, None)
+        if id_aresta is None:
+            return False
+        if not self.direcionado:
+            self.mapa_adjacencia[vertice_destino.nome].pop(vertice_origem.nome, None)
+        self._mapa_reverso = None
+        self._perfil_pesos = None
+        self.versao += 1
+        self.arquivo_cache = None
+
+        self.colunas_arestas.remover(id_aresta)
+        self._num_arestas -= 1
         return True
 
     def obter_peso(self, nome_vertice_a: str, nome_vertice_b: str) -> float:
-        chave = tuple(sorted([nome_vertice_a, nome_vertice_b]))
-        aresta = self.arestas.get(chave)
-        return aresta['peso'] if aresta else float('inf')
+        vizinhos = self.mapa_adjacencia.get(nome_vertice_a)
+        id_aresta = vizinhos.get(nome_vertice_b) if vizinhos else None
+        return self.colunas_arestas.pesos[id_aresta] if id_aresta is not None else float('inf')
     
     def obter_informacoes_aresta(self, nome_vertice_a: str, nome_vertice_b: str) -> Dict:
-        chave = tuple(sorted([nome_vertice_a, nome_vertice_b]))
-        return self.arestas.get(chave, {})
+        vizinhos = self.mapa_adjacencia.get(nome_vertice_a)
+        id_aresta = vizinhos.get(nome_vertice_b) if vizinhos else None
+        return self.colunas_arestas.registro(id_aresta) if id_aresta is not None else {}
     
     def obter_vizinhos(self, nome_vertice: str) -> List[str]:
         if nome_vertice not in self.vertices:
             raise ValueError(f"Vértice '{nome_vertice}' não encontrado no grafo.")
         
-        vertice = self.vertices[nome_vertice]
-        return sorted([vizinho.nome for vizinho in vertice.vizinhos])
+        return list(self.mapa_adjacencia[nome_vertice])
+
+    def grau(self, nome_vertice: str) -> int:
+        vizinhos = self.mapa_adjacencia.get(nome_vertice)
+        if vizinhos is None:
+            raise ValueError(f"Vértice '{nome_vertice}' não encontrado no grafo.")
+        return len(vizinhos)
 
     def criar_subgrafo(self, nos_para_incluir: Iterable[Union[Vertice, str]]) -> 'Grafo':
         subgrafo = Grafo()
@@ -104,33 +517,50 @@ class Grafo:
                 novo_vertice.atributos = self.vertices[nome].atributos.copy()
                 subgrafo.adicionar_vertice(novo_vertice)
 
-        for nome in nomes_incluidos:
-            vertice_original = self.vertices.get(nome)
-            if not vertice_original:
-                continue
+        def arestas_incluidas():
+            for nome in nomes_incluidos:
+                for nome_vizinho, id_aresta in self.mapa_adjacencia.get(nome, {}).items():
+                    if nome_vizinho in nomes_incluidos:
+                        atributos = self.colunas_arestas.registro(id_aresta)
+                        peso = atributos.pop('peso')
+                        yield nome, nome_vizinho, peso, atributos
 
-            for vizinho in vertice_original.vizinhos:
-                if vizinho.nome in nomes_incluidos:
-                    chave_aresta = tuple(sorted([nome, vizinho.nome]))
-                    info_aresta = self.arestas.get(chave_aresta, {'peso': 1.0}).copy()
-                    peso_aresta = info_aresta.pop('peso', 1.0)
-                    
-                    subgrafo.adicionar_aresta(
-                        subgrafo.vertices[nome],
-                        subgrafo.vertices[vizinho.nome],
-                        peso=peso_aresta,
-                        **info_aresta
-                    )
+        subgrafo.adicionar_arestas_em_lote(arestas_incluidas())
 
         return subgrafo
         
+    def to_csr(self, chave_peso: str = 'peso') -> GrafoCSR:
+        """Snapshot CSR; ``chave_peso`` escolhe o atributo numérico das arestas usado como peso."""
+        if chave_peso == 'peso':
+            coluna = self.colunas_arestas.pesos
+        else:
+            coluna = self.colunas_arestas.colunas.get(chave_peso)
+            if type(coluna) is not array:
+                raise ValueError(f"Atributo '{chave_peso}' não é numérico em todas as arestas.")
+        nomes = list(self.vertices)
+        indices = {nome: i for i, nome in enumerate(nomes)}
+        offsets = array('q', [0])
+        vizinhos = array('q')
+        pesos = array('d')
+
+        for nome in nomes:
+            for nome_vizinho, id_aresta in self.mapa_adjacencia[nome].items():
+                vizinhos.append(indices[nome_vizinho])
+                pesos.append(coluna[id_aresta])
+            offsets.append(len(vizinhos))
+
+        return GrafoCSR(nomes, offsets, vizinhos, pesos, direcionado=self.direcionado)
+
+    def freeze(self) -> GrafoCSR:
+        return self.to_csr()
+
     @property
     def ordem(self) -> int:
         return len(self.vertices)
     
     @property
     def tamanho(self) -> int:
-        return len(self.arestas)
+        return self._num_arestas
 
     @property
     def densidade(self) -> float:
@@ -140,14 +570,16 @@ class Grafo:
         arestas_maximas = (self.ordem * (self.ordem - 1)) / 2
         return self.tamanho / arestas_maximas
     
-    def caminho_mais_curto_dijkstra(self, origem: Union[Vertice, str], destino: Union[Vertice, str]) -> Tuple[float, List[str]]:
+    def caminho_mais_curto_dijkstra(self, origem: Union[Vertice, str], destino: Union[Vertice, str], bidirecional: bool = True) -> Tuple[float, List[str]]:
        
         from .algorithms import Sorting
         
         v_origem = self.vertices[str(origem)] if isinstance(origem, str) else origem
         v_destino = self.vertices[str(destino)] if isinstance(destino, str) else destino
         
-        return Sorting.dijkstra(self, v_origem, v_destino)
+        if bidirecional:
+            return Sorting.dijkstra_bidirecional(self, v_origem, v_destino)
+        return Sorting.dijkstra_automatico(self, v_origem, v_destino)
     
     def caminho_mais_curto_bellman_ford(self, origem: Union[Vertice, str], destino: Union[Vertice, str] = None):
         
@@ -156,10 +588,19 @@ class Grafo:
         v_origem = self.vertices[str(origem)] if isinstance(origem, str) else origem
         
         if destino is None:
-            return Sorting.bellman_ford(self, v_origem)
+            # Mesmo retorno de Sorting.bellman_ford: (distancias, anterior, tem_ciclo).
+            distancias, anterior, ciclo = Sorting.bellman_ford_spfa(self, v_origem)
+            return distancias, anterior, bool(ciclo)
         
         v_destino = self.vertices[str(destino)] if isinstance(destino, str) else destino
-        return Sorting.bellman_ford(self, v_origem, v_destino)
+        return Sorting.bellman_ford_spfa(self, v_origem, v_destino)
+
+    def ciclo_negativo(self, origem: Union[Vertice, str]) -> List[str]:
+        """Vértices de um ciclo negativo alcançável a partir de ``origem`` (vazio se não houver)."""
+        from .algorithms import Sorting
+
+        v_origem = self.vertices[str(origem)] if isinstance(origem, str) else origem
+        return Sorting.bellman_ford_spfa(self, v_origem)[2]
     
     def busca_em_largura(self, origem: Union[Vertice, str]):
        
@@ -168,63 +609,20 @@ class Grafo:
         v_origem = self.vertices[str(origem)] if isinstance(origem, str) else origem
         return Sorting.breadth_first_search(self, v_origem)
     
-    def busca_em_profundidade(self, origem: Union[Vertice, str]):
+    def busca_em_profundidade(self, origem: Union[Vertice, str], classificar: bool = False, eventos=None):
         
         from .algorithms import Sorting
         
         v_origem = self.vertices[str(origem)] if isinstance(origem, str) else origem
-        return Sorting.depth_first_search(self, v_origem)
+        return Sorting.depth_first_search(self, v_origem, classificar, eventos)
 
 
 class GrafoDirecionado(Grafo):
-    def adicionar_aresta(self, vertice_origem: Vertice, vertice_destino: Vertice, peso: float = 1.0, **atributos) -> bool:
-        if not self.contem_vertice(vertice_origem) or not self.contem_vertice(vertice_destino):
-            return False
-        
-        
-        self.vertices[vertice_origem.nome].adicionar_vizinho(vertice_destino)
-        
-        
-        chave_aresta = (vertice_origem.nome, vertice_destino.nome)
-        self.arestas[chave_aresta] = {'peso': peso, **atributos}
-        
-        self.adjacencias[vertice_origem.nome].add(vertice_destino.nome)
-        
-        return True
-
-    def remover_aresta(self, vertice_origem: Vertice, vertice_destino: Vertice) -> bool:
-        if not self.contem_vertice(vertice_origem) or not self.contem_vertice(vertice_destino):
-            return False
-        
-        removeu_origem = self.vertices[vertice_origem.nome].remover_vizinho(vertice_destino)
-        
-        chave_aresta = (vertice_origem.nome, vertice_destino.nome)
-        if chave_aresta in self.arestas:
-            del self.arestas[chave_aresta]
-        
-        self.adjacencias[vertice_origem.nome].discard(vertice_destino.nome)
-        
-        return removeu_origem
-
-
-    def obter_peso(self, nome_vertice_a: str, nome_vertice_b: str) -> float:
-        chave = (nome_vertice_a, nome_vertice_b)
-        
-        if chave in self.arestas:
-            return self.arestas[chave]['peso']
-        else:
-            return float('inf')
-    
-    def obter_informacoes_aresta(self, nome_vertice_a: str, nome_vertice_b: str) -> Dict:
-        chave = (nome_vertice_a, nome_vertice_b)
-        
-        if chave in self.arestas:
-            return self.arestas[chave]
-        else:
-            return {}
+    direcionado = True
 
     def obter_arestas_direcionadas(self) -> Generator[Tuple[str, str, float], None, None]:
         
-        for (u_name, v_name), attrs in self.arestas.items():
-            peso = attrs.get('peso', 1.0)
-            yield u_name, v_name, peso
\ No newline at end of file
+        pesos = self.colunas_arestas.pesos
+        for u_name, vizinhos in self.mapa_adjacencia.items():
+            for v_name, id_aresta in vizinhos.items():
+                yield u_name, v_name, pesos[id_aresta]
@@ -0,0 +1,249 @@
+import heapq
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.graphs.graph import Grafo, GrafoCSR, Vertice
+
+# Vértices fixados por busca de testemunha; buscas truncadas só geram atalhos a mais.
+LIMITE_TESTEMUNHA = 50
+# Limite menor usado só para estimar a prioridade (a contração usa o completo).
+LIMITE_ESTIMATIVA = 10
+
+# Aresta da hierarquia: vizinho -> (peso, vértice do meio). -1 indica aresta original.
+Arestas = Dict[int, Tuple[float, int]]
+
+
+class HierarquiaContracao:
+    """Contraction Hierarchies para consultas ponto a ponto.
+
+    Os vértices são contraídos do menos para o mais importante (diferença de
+    arestas + vizinhos já contraídos + profundidade, com atualização
+    preguiçosa estimada por buscas de testemunha curtas); cada
+    contração adiciona atalhos entre os vizinhos restantes quando a busca de
+    testemunha não acha caminho alternativo tão curto. ``acima[v]`` guarda as
+    arestas ``v -> w`` e ``acima_reverso[v]`` as arestas ``u -> v`` com ``w``/``u``
+    de nível maior que ``v``; as consultas só sobem na hierarquia.
+    """
+
+    def __init__(self, nomes, nivel: List[int], acima: List[Arestas], acima_reverso: List[Arestas], direcionado: bool):
+        self.nomes = tuple(nomes)
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}
+        self.nivel = nivel
+        self.acima = acima
+        self.acima_reverso = acima_reverso
+        self.direcionado = direcionado
+
+    @classmethod
+    def construir(cls, grafo: Union[Grafo, GrafoCSR], limite_testemunha: int = LIMITE_TESTEMUNHA) -> 'HierarquiaContracao':
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        n = csr.ordem
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+        infinito = float('inf')
+
+        saida: List[Arestas] = [{} for _ in range(n)]
+        entrada: List[Arestas] = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v, peso = vizinhos[k], pesos[k]
+                if peso < 0:
+                    raise ValueError("Contraction Hierarchies não suportam pesos negativos")
+                if u != v and (v not in saida[u] or peso < saida[u][v][0]):
+                    saida[u][v] = entrada[v][u] = (peso, -1)
+
+        def testemunhas(origem: int, ignorado: int, alvos: Dict[int, float], limite: float, maximo: int) -> Dict[int, float]:
+            distancias = {origem: 0}
+            fila = [(0, origem)]
+            fixados = set()
+            restantes = len(alvos)
+            while fila:
+                distancia, x = heapq.heappop(fila)
+                if x in fixados:
+                    continue
+                if distancia > limite or len(fixados) >= maximo:
+                    break
+                fixados.add(x)
+                if x in alvos:
+                    restantes -= 1
+                    if not restantes:
+                        break
+                for y, (peso, _) in saida[x].items():
+                    if y == ignorado:
+                        continue
+                    nova_distancia = distancia + peso
+                    if nova_distancia < distancias.get(y, infinito):
+                        distancias[y] = nova_distancia
+                        heapq.heappush(fila, (nova_distancia, y))
+            return distancias
+
+        def atalhos(v: int, maximo: int) -> List[Tuple[int, int, float]]:
+            necessarios = []
+            if not saida[v]:
+                return necessarios
+            for u, (peso_uv, _) in entrada[v].items():
+                # Arestas diretas u -> w já servem de testemunha sem busca.
+                diretas = saida[u]
+                alvos = {
+                    w: peso_uv + peso_vw for w, (peso_vw, _) in saida[v].items()
+                    if w != u and (w not in diretas or diretas[w][0] > peso_uv + peso_vw)
+                }
+                if not alvos:
+                    continue
+                distancias = testemunhas(u, v, alvos, max(alvos.values()), maximo)
+                for w, via_v in alvos.items():
+                    if distancias.get(w, infinito) > via_v:
+                        necessarios.append((u, w, via_v))
+            return necessarios
+
+        vizinhos_contraidos = [0] * n
+        profundidade = [0] * n
+        nivel = [0] * n
+        acima: List[Optional[Arestas]] = [None] * n
+        acima_reverso: List[Optional[Arestas]] = [None] * n
+
+        def prioridade(v: int, novos: list) -> int:
+            return len(novos) - len(saida[v]) - len(entrada[v]) + vizinhos_contraidos[v] + profundidade[v]
+
+        estimativa = min(limite_testemunha, LIMITE_ESTIMATIVA)
+        fila = [(prioridade(v, atalhos(v, estimativa)), v) for v in range(n)]
+        heapq.heapify(fila)
+        proximo_nivel = 0
+
+        while fila:
+            _, v = heapq.heappop(fila)
+            atual = prioridade(v, atalhos(v, estimativa))
+            if fila and atual > fila[0][0]:
+                heapq.heappush(fila, (atual, v))
+                continue
+
+            novos = atalhos(v, limite_testemunha)
+            nivel[v] = proximo_nivel
+            proximo_nivel += 1
+            acima[v], acima_reverso[v] = saida[v], entrada[v]
+            saida[v], entrada[v] = {}, {}
+            for w in acima[v]:
+                del entrada[w][v]
+                vizinhos_contraidos[w] += 1
+                profundidade[w] = max(profundidade[w], profundidade[v] + 1)
+            for u in acima_reverso[v]:
+                del saida[u][v]
+                vizinhos_contraidos[u] += 1
+                profundidade[u] = max(profundidade[u], profundidade[v] + 1)
+
+            for u, w, peso in novos:
+                existente = saida[u].get(w)
+                if existente is None or peso < existente[0]:
+                    saida[u][w] = entrada[w][u] = (peso, v)
+
+        return cls(csr.nomes, nivel, acima, acima_reverso, csr.direcionado)
+
+    @property
+    def ordem(self) -> int:
+        return len(self.nomes)
+
+    @property
+    def num_atalhos(self) -> int:
+        return sum(
+            1 for arestas in (*self.acima, *self.acima_reverso)
+            for _, meio in arestas.values() if meio != -1
+        )
+
+    def indice(self, vertice: Union[Vertice, str]) -> int:
+        nome = str(vertice)
+        if nome not in self.indices:
+            raise ValueError(f"Vértice '{nome}' não encontrado na hierarquia.")
+        return self.indices[nome]
+
+    def _buscar(self, s: int, t: int) -> Tuple[float, int, dict, dict]:
+        infinito = float('inf')
+        grafos = (self.acima, self.acima_reverso)
+        opostos = (self.acima_reverso, self.acima)
+        distancias = ({s: 0}, {t: 0})
+        anteriores = ({s: -1}, {t: -1})
+        fixados = (set(), set())
+        filas = ([(0, s)], [(0, t)])
+        melhor, encontro = infinito, -1
+
+        while filas[0] or filas[1]:
+            if filas[0] and filas[1]:
+                lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+            else:
+                lado = 0 if filas[0] else 1
+
+            distancia, u = heapq.heappop(filas[lado])
+            if u in fixados[lado]:
+                continue
+            if distancia >= melhor:
+                # Nada mais deste lado pode melhorar o encontro.
+                filas[lado].clear()
+                continue
+            fixados[lado].add(u)
+
+            outro = distancias[1 - lado].get(u)
+            if outro is not None and distancia + outro < melhor:
+                melhor, encontro = distancia + outro, u
+
+            dist, anterior = distancias[lado], anteriores[lado]
+            # Stall-on-demand: se um vértice de nível maior chega a u por
+            # menos, u não está em nenhum caminho mínimo ascendente.
+            if any(dist.get(w, infinito) + peso < distancia for w, (peso, _) in opostos[lado][u].items()):
+                continue
+            for w, (peso, _) in grafos[lado][u].items():
+                nova_distancia = distancia + peso
+                if nova_distancia < dist.get(w, infinito):
+                    dist[w] = nova_distancia
+                    anterior[w] = u
+                    heapq.heappush(filas[lado], (nova_distancia, w))
+
+        return melhor, encontro, anteriores[0], anteriores[1]
+
+    def _aresta(self, u: int, w: int) -> Tuple[float, int]:
+        if self.nivel[w] > self.nivel[u]:
+            return self.acima[u][w]
+        return self.acima_reverso[w][u]
+
+    def _desempacotar(self, u: int, w: int, caminho: List[int], pesos: List[float]):
+        pilha = [(u, w)]
+        while pilha:
+            x, y = pilha.pop()
+            peso, meio = self._aresta(x, y)
+            if meio == -1:
+                caminho.append(y)
+                pesos.append(peso)
+            else:
+                pilha.append((meio, y))
+                pilha.append((x, meio))
+
+    def distancia(self, origem: Union[Vertice, str], destino: Union[Vertice, str]) -> float:
+        s, t = self.indice(origem), self.indice(destino)
+        if s == t:
+            return 0
+        return self._buscar(s, t)[0]
+
+    def caminho_mais_curto(self, origem: Union[Vertice, str], destino: Union[Vertice, str]) -> Tuple[float, List[str]]:
+        """Mesmo ``(distancia, caminho)`` de ``Sorting.dijkstra``, com os atalhos desempacotados."""
+        s, t = self.indice(origem), self.indice(destino)
+        if s == t:
+            return 0, [self.nomes[s]]
+
+        melhor, encontro, anterior_ida, anterior_volta = self._buscar(s, t)
+        if encontro == -1:
+            return float('inf'), []
+
+        subida = [encontro]
+        while subida[-1] != s:
+            subida.append(anterior_ida[subida[-1]])
+        subida.reverse()
+        descida = [encontro]
+        while descida[-1] != t:
+            descida.append(anterior_volta[descida[-1]])
+
+        caminho, pesos = [s], []
+        for trecho in (subida, descida):
+            for u, w in zip(trecho, trecho[1:]):
+                self._desempacotar(u, w, caminho, pesos)
+
+        # Os pesos já estão na ordem do caminho; somados um a um, como em
+        # Sorting._distancia_caminho, e não com sum() (que compensa arredondamentos no 3.12+).
+        distancia = 0
+        for peso in pesos:
+            distancia += peso
+        return distancia, [self.nomes[i] for i in caminho]
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import unidecode
+
+SIMILARIDADE_MINIMA = 0.1
+
+
+@lru_cache(maxsize=65536)
+def normalizar_nome(texto: str) -> str:
+    return unidecode.unidecode(texto).lower().strip()
+
+
+def _trigramas(chave: str) -> frozenset:
+    texto = f"  {chave} "
+    return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+
+
+class IndiceSugestoes:
+    """Autocompletar sobre os nomes normalizados dos vértices.
+
+    Prefixos são resolvidos por busca binária na lista ordenada de chaves
+    (equivalente a descer uma trie, sem um dict por nó); o restante das
+    ``k`` posições é preenchido pelo índice de trigramas, ordenado pela
+    similaridade de Jaccard entre os conjuntos de trigramas (descartando
+    candidatos abaixo de ``SIMILARIDADE_MINIMA``).
+    """
+
+    def __init__(self, nomes: Iterable[str]):
+        pares = sorted((normalizar_nome(nome), nome) for nome in nomes if isinstance(nome, str))
+        self._chaves: List[str] = [chave for chave, _ in pares]
+        self._nomes: List[str] = [nome for _, nome in pares]
+        num_trigramas = []
+        listas: Dict[str, List[int]] = {}
+        for posicao, chave in enumerate(self._chaves):
+            trigramas = _trigramas(chave)
+            num_trigramas.append(len(trigramas))
+            for trigrama in trigramas:
+                listas.setdefault(trigrama, []).append(posicao)
+        self._num_trigramas = np.asarray(num_trigramas, dtype=np.int32)
+        self._trigramas: Dict[str, np.ndarray] = {
+            trigrama: np.asarray(posicoes, dtype=np.int32) for trigrama, posicoes in listas.items()
+        }
+
+    def por_prefixo(self, prefixo: str, k: int) -> List[int]:
+        posicoes = []
+        i = bisect_left(self._chaves, prefixo)
+        while i < len(self._chaves) and len(posicoes) < k and self._chaves[i].startswith(prefixo):
+            posicoes.append(i)
+            i += 1
+        return posicoes
+
+    def por_trigramas(self, chave: str, k: int, ignorar=()) -> List[int]:
+        consulta = _trigramas(chave)
+        listas = [self._trigramas[t] for t in consulta if t in self._trigramas]
+        if not listas:
+            return []
+
+        posicoes, comuns = np.unique(np.concatenate(listas), return_counts=True)
+        similaridade = comuns / (len(consulta) + self._num_trigramas[posicoes] - comuns)
+
+        filtro = similaridade >= SIMILARIDADE_MINIMA
+        if ignorar:
+            filtro &= ~np.isin(posicoes, list(ignorar))
+        posicoes, similaridade = posicoes[filtro], similaridade[filtro]
+        ordem = np.lexsort((posicoes, -similaridade))[:k]
+        return posicoes[ordem].tolist()
+
+    def sugerir(self, texto: str, k: int = 10) -> List[str]:
+        if k <= 0:
+            return []
+        chave = normalizar_nome(texto)
+        posicoes = self.por_prefixo(chave, k) if chave else []
+        if len(posicoes) < k and chave:
+            posicoes += self.por_trigramas(chave, k - len(posicoes), ignorar=set(posicoes))
+        return [self._nomes[p] for p in posicoes]
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+
+class IndiceNomes:
+    """Resolve nomes digitados (com acento, maiúsculas, espaços) para o nome do vértice.
+
+    Cada vértice é indexado pelo próprio nome e pela forma normalizada;
+    ``adicionar_alias`` registra variantes conhecidas (ex.: o nome acentuado
+    do CSV original). Uma consulta exata não chama ``unidecode``; as demais
+    passam uma vez pelo normalizador memoizado.
+    """
+
+    def __init__(self, nomes: Iterable[str] = ()):
+        self._por_chave: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self._nomes: Dict[str, None] = {}
+        self._sugestoes: Optional[IndiceSugestoes] = None
+        for nome in nomes:
+            self.adicionar(nome)
+
+    def adicionar(self, nome: str) -> None:
+        if nome not in self._nomes:
+            self._nomes[nome] = None
+            self._sugestoes = None
+        self._por_chave[nome] = nome
+        if isinstance(nome, str):
+            self._por_chave.setdefault(normalizar_nome(nome), nome)
+
+    def adicionar_alias(self, alias: str, nome: str) -> None:
+        if alias in self._por_chave or not isinstance(alias, str):
+            return
+        self._por_chave[alias] = nome
+        self.aliases[alias] = nome
+
+    def resolver(self, texto: str) -> Optional[str]:
+        nome = self._por_chave.get(texto)
+        if nome is None and isinstance(texto, str):
+            nome = self._por_chave.get(normalizar_nome(texto))
+        return nome
+
+    def sugerir(self, texto: str, k: int = 10) -> List[str]:
+        """Até ``k`` nomes de vértices parecidos com ``texto``: prefixos primeiro, depois trigramas."""
+        if self._sugestoes is None:
+            self._sugestoes = IndiceSugestoes(self._nomes)
+        return self._sugestoes.sugerir(str(texto), k)
+
+    def __contains__(self, texto: str) -> bool:
+        return self.resolver(texto) is not None
+
+    def __len__(self) -> int:
+        return len(self._por_chave)
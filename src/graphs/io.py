@@ -1,12 +1,131 @@
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
 import pandas as pd
-import unidecode
+from src.graphs.algorithms import MatrizDistancias, Sorting, TabelasMarcos
+from src.graphs.cache import (
+    caminho_cache, caminho_derivado, carregar_grafo_binario, carregar_matriz_distancias, carregar_oraculo_hubs,
+    carregar_tabelas_marcos, salvar_grafo_binario, salvar_matriz_distancias, salvar_oraculo_hubs, salvar_tabelas_marcos,
+)
 from src.graphs.graph import GrafoDirecionado, Vertice, Grafo
+from src.graphs.indices import normalizar_nome
+from src.graphs.rotulos import OraculoHubs
+
+COLUNAS_ARESTAS_BAIRROS = ['Bairro', 'Vizinho', 'Logradouro', 'Tipo', 'Peso', 'Tipo Normalizado', 'Id Rua']
+COLUNAS_ROTAS = {
+    'Origin_airport': 'category',
+    'Destination_airport': 'category',
+    'Origin_city': 'category',
+    'Destination_city': 'category',
+    'Passengers': 'int64',
+    'Flights': 'int64',
+    'Distance': 'float32',
+}
+# Atributo da aresta -> coluna do CSV de rotas.
+ATRIBUTOS_ROTA = {
+    'passageiros': 'Passengers',
+    'voos': 'Flights',
+    'distancia': 'Distance',
+}
+REDUTORES = ('sum', 'mean', 'min', 'max', 'last')
+# Mesmo padrão com e sem blocos: o tamanho do bloco só muda a memória, não o resultado.
+AGREGACAO_PADRAO = {'passageiros': 'sum', 'voos': 'sum', 'distancia': 'last'}
 
 def normalizar_texto(texto):
     if not isinstance(texto, str):
         return texto
-    texto = unidecode.unidecode(texto)
-    return texto.lower().strip()
+    return normalizar_nome(texto)
+
+
+def normalizar_serie(serie: pd.Series) -> pd.Series:
+    # O normalizador roda uma vez por valor distinto; o resto é vetorizado pelo pandas.
+    distintos = serie.dropna().unique()
+    return serie.map({valor: normalizar_texto(valor) for valor in distintos})
+
+
+def _ler_csv(caminho: str, **kwargs) -> pd.DataFrame:
+    try:
+        return pd.read_csv(caminho, encoding='utf-8', header=0, **kwargs)
+    except UnicodeDecodeError:
+        return pd.read_csv(caminho, encoding='latin-1', header=0, **kwargs)
+
+
+def _carregar_com_cache(nome: str, fontes: List[str], construir: Callable[[], Grafo], usar_cache: bool, opcoes: Optional[Dict] = None) -> Grafo:
+    if not usar_cache:
+        return construir()
+
+    arquivo_cache = caminho_cache(fontes, nome, opcoes)
+    grafo = carregar_grafo_binario(arquivo_cache, fontes)
+    if grafo is not None:
+        grafo.arquivo_cache = str(arquivo_cache)
+        return grafo
+
+    grafo = construir()
+    try:
+        if salvar_grafo_binario(grafo, arquivo_cache, fontes, opcoes):
+            grafo.arquivo_cache = str(arquivo_cache)
+    except OSError:
+        pass
+    return grafo
+
+
+def carregar_marcos(grafo: Grafo, k: int = 8, estrategia: str = 'distante', usar_cache: bool = True) -> TabelasMarcos:
+    """Tabelas ALT do grafo, guardadas ao lado do seu cache binário.
+
+    Só há cache quando o grafo veio de ``carregar_grafo``/``carregar_dataset_parte2``
+    com cache; as tabelas são invalidadas junto com o arquivo do grafo, e um
+    grafo alterado depois de carregado perde ``arquivo_cache``.
+    """
+    arquivo = None
+    if usar_cache and grafo.arquivo_cache:
+        arquivo = caminho_derivado(grafo.arquivo_cache, f"marcos_{estrategia}_{k}")
+        tabelas = carregar_tabelas_marcos(arquivo, [grafo.arquivo_cache])
+        if tabelas is not None and len(tabelas.nomes) == grafo.ordem:
+            return tabelas
+
+    tabelas = Sorting.calcular_tabelas_marcos(grafo, k, estrategia)
+    if arquivo is not None:
+        try:
+            salvar_tabelas_marcos(tabelas, arquivo, [grafo.arquivo_cache])
+        except OSError:
+            pass
+    return tabelas
+
+
+def carregar_oraculo(grafo: Grafo, usar_cache: bool = True) -> OraculoHubs:
+    """Oráculo de distâncias 2-hop do grafo, guardado ao lado do seu cache binário (como em ``carregar_marcos``)."""
+    arquivo = None
+    if usar_cache and grafo.arquivo_cache:
+        arquivo = caminho_derivado(grafo.arquivo_cache, "hubs")
+        oraculo = carregar_oraculo_hubs(arquivo, [grafo.arquivo_cache])
+        if oraculo is not None and len(oraculo.nomes) == grafo.ordem:
+            return oraculo
+
+    oraculo = OraculoHubs.construir(grafo)
+    if arquivo is not None:
+        try:
+            salvar_oraculo_hubs(oraculo, arquivo, [grafo.arquivo_cache])
+        except OSError:
+            pass
+    return oraculo
+
+
+def carregar_matriz(grafo: Grafo, usar_cache: bool = True) -> MatrizDistancias:
+    """Matriz de distâncias entre todos os pares (``Sorting.todos_os_pares``), guardada ao lado do cache do grafo."""
+    arquivo = None
+    if usar_cache and grafo.arquivo_cache:
+        arquivo = caminho_derivado(grafo.arquivo_cache, "apsp")
+        matriz = carregar_matriz_distancias(arquivo, [grafo.arquivo_cache])
+        if matriz is not None and matriz.ordem == grafo.ordem:
+            return matriz
+
+    matriz = Sorting.todos_os_pares(grafo)
+    if arquivo is not None:
+        try:
+            salvar_matriz_distancias(matriz, arquivo, [grafo.arquivo_cache])
+        except OSError:
+            pass
+    return matriz
 
 
 def processar_arquivo_bairros(caminho_entrada: str, caminho_saida: str) -> None:
@@ -18,91 +137,213 @@ def processar_arquivo_bairros(caminho_entrada: str, caminho_saida: str) -> None:
     df = df[df['bairro'].str.strip() != '']
     
     df['microrregiao'] = df['microrregiao_cod'].str.split('.').str[0]
-    df['bairro'] = df['bairro'].apply(normalizar_texto)
+    df['bairro'] = normalizar_serie(df['bairro'])
     
     dados_finais = df[['bairro', 'microrregiao']].drop_duplicates(subset=['bairro']).sort_values(by='bairro')
     
     dados_finais.to_csv(caminho_saida, index=False)
     
 
-def carregar_grafo(caminho_arquivo_nos: str, caminho_arquivo_arestas: str) -> Grafo:
+def carregar_grafo(caminho_arquivo_nos: str, caminho_arquivo_arestas: str, usar_cache: bool = True) -> Grafo:
+    return _carregar_com_cache(
+        'bairros',
+        [caminho_arquivo_nos, caminho_arquivo_arestas],
+        lambda: _construir_grafo_bairros(caminho_arquivo_nos, caminho_arquivo_arestas),
+        usar_cache,
+    )
+
+
+def _construir_grafo_bairros(caminho_arquivo_nos: str, caminho_arquivo_arestas: str) -> Grafo:
     grafo = Grafo()
-    try:
-        dados_nos = pd.read_csv(caminho_arquivo_nos, encoding='utf-8', header=0)
-    except UnicodeDecodeError:
-        dados_nos = pd.read_csv(caminho_arquivo_nos, encoding='latin-1', header=0)
+    dados_nos = _ler_csv(caminho_arquivo_nos, usecols=['bairro', 'microrregiao'])
         
-    for _, linha in dados_nos.iterrows():
-        nome_bairro = linha['bairro']
+    for nome_bairro, microrregiao in zip(dados_nos['bairro'].tolist(), dados_nos['microrregiao'].tolist()):
         vertice = Vertice(nome_bairro)
-        vertice.atributos['microrregiao'] = linha['microrregiao']
+        vertice.atributos['microrregiao'] = microrregiao
         grafo.adicionar_vertice(vertice)
     
-    try:
-        dados_arestas = pd.read_csv(caminho_arquivo_arestas, encoding='utf-8', header=0)
-    except UnicodeDecodeError:
-        dados_arestas = pd.read_csv(caminho_arquivo_arestas, encoding='latin-1', header=0)
+    dados_arestas = _ler_csv(
+        caminho_arquivo_arestas,
+        usecols=COLUNAS_ARESTAS_BAIRROS,
+        dtype={'Peso': 'float64'},
+    )
     
-    for _, linha in dados_arestas.iterrows():
-        nome_origem = normalizar_texto(linha['Bairro'])
-        nome_destino = normalizar_texto(linha['Vizinho'])
-        peso = float(linha['Peso'])
-        
-        vertice_origem = grafo.vertices.get(nome_origem)
-        vertice_destino = grafo.vertices.get(nome_destino)
-        
-        if vertice_origem and vertice_destino:
-            atributos = {
-                'logradouro': linha['Logradouro'],
-                'tipo': linha['Tipo'],
-                'tipo_normalizado': linha['Tipo Normalizado'],
-                'id_rua': linha['Id Rua']
+    origens = normalizar_serie(dados_arestas['Bairro'])
+    destinos = normalizar_serie(dados_arestas['Vizinho'])
+
+    # Os nomes como aparecem no CSV (acentuados, com maiúsculas) viram aliases.
+    indice = grafo.indice_nomes
+    for coluna_original, normalizados in ((dados_arestas['Bairro'], origens), (dados_arestas['Vizinho'], destinos)):
+        for alias, nome in dict(zip(coluna_original.tolist(), normalizados.tolist())).items():
+            if nome in grafo.vertices:
+                indice.adicionar_alias(alias, nome)
+
+    arestas = (
+        (
+            origem,
+            destino,
+            peso,
+            {
+                'logradouro': logradouro,
+                'tipo': tipo,
+                'tipo_normalizado': tipo_normalizado,
+                'id_rua': id_rua
             }
-            grafo.adicionar_aresta(vertice_origem, vertice_destino, peso=peso, **atributos)
+        )
+        for origem, destino, peso, logradouro, tipo, tipo_normalizado, id_rua in zip(
+            origens.tolist(),
+            destinos.tolist(),
+            dados_arestas['Peso'].tolist(),
+            dados_arestas['Logradouro'].tolist(),
+            dados_arestas['Tipo'].tolist(),
+            dados_arestas['Tipo Normalizado'].tolist(),
+            dados_arestas['Id Rua'].tolist(),
+        )
+    )
+    grafo.adicionar_arestas_em_lote(arestas)
     
     return grafo
 
 
-def carregar_dataset_parte2(caminho_csv: str = None) -> GrafoDirecionado:
-    grafo = GrafoDirecionado()
-    
-    dados = pd.read_csv(caminho_csv)
-    
-    aeroportos_origem = dados[['Origin_airport', 'Origin_city']].rename(
-        columns={'Origin_airport': 'aeroporto', 'Origin_city': 'cidade'}
-    )
-    aeroportos_destino = dados[['Destination_airport', 'Destination_city']].rename(
-        columns={'Destination_airport': 'aeroporto', 'Destination_city': 'cidade'}
+def carregar_dataset_parte2(caminho_csv: str = None, usar_cache: bool = True, tamanho_bloco: Optional[int] = None,
+                            agregacao: Optional[Dict[str, str]] = None) -> GrafoDirecionado:
+    """Carrega o grafo de aeroportos com uma aresta por rota distinta.
+
+    As linhas repetidas de uma mesma rota (origem, destino) são combinadas
+    com um ``groupby`` antes de montar o grafo. ``agregacao`` escolhe o
+    redutor de cada atributo (``passageiros``, ``voos``, ``distancia``) entre
+    ``sum``, ``mean``, ``min``, ``max`` e ``last``; a ``distancia`` agregada
+    também é o peso da aresta. Atributos omitidos usam ``AGREGACAO_PADRAO``
+    (soma de passageiros e voos, última distância), com ou sem blocos.
+
+    Com ``tamanho_bloco`` o CSV é lido em blocos desse número de linhas e os
+    parciais de cada bloco são combinados, de modo que a memória de pico
+    depende do número de rotas distintas e não do número de linhas.
+    """
+    agregacao = {**AGREGACAO_PADRAO, **(agregacao or {})}
+    for atributo, redutor in agregacao.items():
+        if atributo not in ATRIBUTOS_ROTA:
+            raise ValueError(f"Atributo de rota desconhecido: '{atributo}'. Use um de {list(ATRIBUTOS_ROTA)}.")
+        if redutor not in REDUTORES:
+            raise ValueError(f"Redutor desconhecido para '{atributo}': '{redutor}'. Use um de {list(REDUTORES)}.")
+
+    return _carregar_com_cache(
+        'aeroportos',
+        [caminho_csv],
+        lambda: _construir_grafo_aeroportos(caminho_csv, agregacao, tamanho_bloco),
+        usar_cache,
+        opcoes={'agregacao': agregacao},
     )
-    
-    aeroportos_unicos = pd.concat([aeroportos_origem, aeroportos_destino]).drop_duplicates(subset=['aeroporto'])
-    
-    for _, linha in aeroportos_unicos.iterrows():
-        codigo = linha['aeroporto']
+
+
+def _adicionar_aeroportos(grafo: GrafoDirecionado, codigos: List[str], cidades: List[str]) -> None:
+    for codigo, cidade in zip(codigos, cidades):
         vertice = Vertice(codigo)
-        vertice.atributos['rotulo'] = linha['cidade']
-        vertice.atributos['cidade'] = linha['cidade']
+        vertice.atributos['rotulo'] = cidade
+        vertice.atributos['cidade'] = cidade
         grafo.adicionar_vertice(vertice)
-    
-    arestas_adicionadas = 0
-    for _, linha in dados.iterrows():
-        origem_codigo = linha['Origin_airport']
-        destino_codigo = linha['Destination_airport']
-        
-        vertice_origem = grafo.vertices.get(origem_codigo)
-        vertice_destino = grafo.vertices.get(destino_codigo)
-        
-        if vertice_origem and vertice_destino:
-            peso = float(linha['Distance'])
-            
-            atributos = {
-                'passageiros': int(linha['Passengers']),
-                'voos': int(linha['Flights']),
-                'distancia': float(linha['Distance'])
+
+
+class _AcumuladorRotas:
+    """Combina os parciais por rota de cada bloco em colunas tipadas."""
+
+    def __init__(self, agregacao: Dict[str, str]):
+        self.agregacao = agregacao
+        self.rotas: Dict[Tuple[str, str], int] = {}
+        self.linhas = array('q')
+        self.colunas = {
+            atributo: array('d' if redutor == 'mean' or atributo == 'distancia' else 'q')
+            for atributo, redutor in agregacao.items()
+        }
+
+    def reduzir_bloco(self, bloco: pd.DataFrame) -> pd.DataFrame:
+        # "mean" só pode ser combinado entre blocos a partir de soma e contagem.
+        especificacao = {
+            atributo: (ATRIBUTOS_ROTA[atributo], 'sum' if redutor == 'mean' else redutor)
+            for atributo, redutor in self.agregacao.items()
+        }
+        especificacao['linhas'] = ('Origin_airport', 'size')
+        return bloco.groupby(['Origin_airport', 'Destination_airport'], observed=True, sort=False).agg(**especificacao)
+
+    def adicionar_bloco(self, bloco: pd.DataFrame) -> None:
+        parcial = self.reduzir_bloco(bloco)
+        atributos = list(self.agregacao)
+        valores = [parcial[atributo].tolist() for atributo in atributos]
+        combinadores = [(self.colunas[atributo], self.agregacao[atributo]) for atributo in atributos]
+
+        for chave, linhas, *valores_rota in zip(parcial.index.tolist(), parcial['linhas'].tolist(), *valores):
+            indice = self.rotas.get(chave)
+            if indice is None:
+                self.rotas[chave] = len(self.linhas)
+                self.linhas.append(linhas)
+                for (coluna, _), valor in zip(combinadores, valores_rota):
+                    coluna.append(valor)
+                continue
+
+            self.linhas[indice] += linhas
+            for (coluna, redutor), valor in zip(combinadores, valores_rota):
+                if redutor in ('sum', 'mean'):
+                    coluna[indice] += valor
+                elif redutor == 'min':
+                    coluna[indice] = min(coluna[indice], valor)
+                elif redutor == 'max':
+                    coluna[indice] = max(coluna[indice], valor)
+                else:
+                    coluna[indice] = valor
+
+    def resultado(self, atributo: str) -> List:
+        valores = self.colunas[atributo].tolist()
+        if self.agregacao[atributo] == 'mean':
+            return [valor / linhas for valor, linhas in zip(valores, self.linhas)]
+        return valores
+
+
+def _construir_grafo_aeroportos(caminho_csv: str, agregacao: Dict[str, str], tamanho_bloco: Optional[int] = None) -> GrafoDirecionado:
+    # Origens e destinos ficam separados para que a ordem final dos vértices
+    # seja sempre todas as origens e depois os destinos, com ou sem blocos.
+    cidades_origem: Dict[str, str] = {}
+    cidades_destino: Dict[str, str] = {}
+    acumulador = _AcumuladorRotas(agregacao)
+
+    if tamanho_bloco:
+        blocos = pd.read_csv(caminho_csv, usecols=list(COLUNAS_ROTAS), dtype=COLUNAS_ROTAS, chunksize=tamanho_bloco)
+    else:
+        blocos = [pd.read_csv(caminho_csv, usecols=list(COLUNAS_ROTAS), dtype=COLUNAS_ROTAS)]
+
+    for bloco in blocos:
+        for coluna_codigo, coluna_cidade, cidades in (
+            ('Origin_airport', 'Origin_city', cidades_origem),
+            ('Destination_airport', 'Destination_city', cidades_destino),
+        ):
+            novos = bloco[[coluna_codigo, coluna_cidade]].drop_duplicates(subset=[coluna_codigo])
+            for codigo, cidade in zip(novos[coluna_codigo].tolist(), novos[coluna_cidade].tolist()):
+                cidades.setdefault(codigo, cidade)
+
+        acumulador.adicionar_bloco(bloco)
+
+    grafo = GrafoDirecionado()
+    for codigo, cidade in cidades_destino.items():
+        cidades_origem.setdefault(codigo, cidade)
+    _adicionar_aeroportos(grafo, list(cidades_origem), list(cidades_origem.values()))
+
+    distancias = acumulador.resultado('distancia')
+    passageiros = acumulador.resultado('passageiros')
+    voos = acumulador.resultado('voos')
+    arestas = (
+        (
+            origem,
+            destino,
+            distancia,
+            {
+                'passageiros': total_passageiros,
+                'voos': total_voos,
+                'distancia': distancia
             }
-            
-            # Isso agora chamará adicionar_aresta do DirectedGrafo, criando arestas direcionadas
-            if grafo.adicionar_aresta(vertice_origem, vertice_destino, peso=peso, **atributos):
-                arestas_adicionadas += 1
-    
-    return grafo
\ No newline at end of file
+        )
+        for (origem, destino), distancia, total_passageiros, total_voos in zip(
+            acumulador.rotas, distancias, passageiros, voos
+        )
+    )
+    grafo.adicionar_arestas_em_lote(arestas)
+
+    return grafo
@@ -0,0 +1,187 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import List, Tuple, Union
+
+from src.graphs.graph import Grafo, GrafoCSR, Vertice
+
+
+class Rotulo:
+    """Rótulo de um vértice: hubs (em ordem crescente de posto) com distância e vizinho no caminho.
+
+    ``anteriores[i]`` é o vértice seguinte no caminho mínimo até o hub
+    ``hubs[i]`` (rótulo de saída) ou vindo dele (rótulo de entrada).
+    """
+
+    __slots__ = ('hubs', 'distancias', 'anteriores')
+
+    def __init__(self, hubs=(), distancias=(), anteriores=()):
+        self.hubs = array('q', hubs)
+        self.distancias = array('d', distancias)
+        self.anteriores = array('q', anteriores)
+
+    def adicionar(self, hub: int, distancia: float, anterior: int) -> None:
+        self.hubs.append(hub)
+        self.distancias.append(distancia)
+        self.anteriores.append(anterior)
+
+    def anterior(self, hub: int) -> int:
+        return self.anteriores[bisect_left(self.hubs, hub)]
+
+    def __len__(self) -> int:
+        return len(self.hubs)
+
+
+def _cruzar(saida: Rotulo, entrada: Rotulo) -> Tuple[float, int]:
+    """Intercala dois rótulos ordenados; retorna ``(distancia, hub)`` do melhor hub comum."""
+    hubs_s, hubs_t = saida.hubs, entrada.hubs
+    dist_s, dist_t = saida.distancias, entrada.distancias
+    melhor, hub = float('inf'), -1
+    i = j = 0
+    fim_s, fim_t = len(hubs_s), len(hubs_t)
+    while i < fim_s and j < fim_t:
+        a, b = hubs_s[i], hubs_t[j]
+        if a == b:
+            distancia = dist_s[i] + dist_t[j]
+            if distancia < melhor:
+                melhor, hub = distancia, a
+            i += 1
+            j += 1
+        elif a < b:
+            i += 1
+        else:
+            j += 1
+    return melhor, hub
+
+
+class OraculoHubs:
+    """Oráculo de distâncias por rotulação 2-hop (Pruned Landmark Labeling).
+
+    Cada vértice guarda um rótulo de saída (hubs que alcança) e um de
+    entrada (hubs que o alcançam); ``d(s, t)`` é o mínimo de
+    ``saida[s][h] + entrada[t][h]`` sobre os hubs comuns. Os hubs são
+    processados por grau decrescente, cada um com um Dijkstra podado
+    sempre que os rótulos já existentes cobrem a distância. Em grafos não
+    direcionados os dois rótulos são o mesmo objeto.
+    """
+
+    def __init__(self, nomes, hubs: List[int], saida: List[Rotulo], entrada: List[Rotulo], direcionado: bool):
+        self.nomes = tuple(nomes)
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}
+        # hubs[posto] = vértice; os rótulos guardam o posto do hub.
+        self.hubs = hubs
+        self.saida = saida
+        self.entrada = entrada
+        self.direcionado = direcionado
+
+    @classmethod
+    def construir(cls, grafo: Union[Grafo, GrafoCSR]) -> 'OraculoHubs':
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.to_csr()
+        if any(peso < 0 for peso in csr.pesos):
+            raise ValueError("Rotulação por hubs não suporta pesos negativos")
+        n = csr.ordem
+        transposto = csr.transposto()
+
+        grau = [csr.offsets[v + 1] - csr.offsets[v] + transposto.offsets[v + 1] - transposto.offsets[v] for v in range(n)]
+        hubs = sorted(range(n), key=lambda v: (-grau[v], v))
+
+        saida = [Rotulo() for _ in range(n)]
+        entrada = [Rotulo() for _ in range(n)] if csr.direcionado else saida
+        infinito = float('inf')
+        distancia_hub = [infinito] * n
+        distancias = [infinito] * n
+        anterior = [-1] * n
+        fixado = bytearray(n)
+
+        def busca_podada(posto: int, raiz: int, grafo_busca: GrafoCSR, rotulo_raiz: Rotulo, rotulos: List[Rotulo]):
+            # distancia_hub[h] = distância raiz <-> hub h já coberta pelo rótulo da raiz.
+            for h, d in zip(rotulo_raiz.hubs, rotulo_raiz.distancias):
+                distancia_hub[h] = d
+            offsets, vizinhos, pesos = grafo_busca.offsets, grafo_busca.vizinhos, grafo_busca.pesos
+            distancias[raiz] = 0.0
+            anterior[raiz] = raiz
+            alcancados = [raiz]
+            fila = [(0.0, raiz)]
+            while fila:
+                distancia, u = heapq.heappop(fila)
+                if distancia > distancias[u] or fixado[u]:
+                    continue
+                fixado[u] = 1
+                rotulo = rotulos[u]
+                if any(distancia_hub[h] + d <= distancia for h, d in zip(rotulo.hubs, rotulo.distancias)):
+                    continue
+                rotulo.adicionar(posto, distancia, anterior[u])
+                for k in range(offsets[u], offsets[u + 1]):
+                    w = vizinhos[k]
+                    nova_distancia = distancia + pesos[k]
+                    if nova_distancia < distancias[w]:
+                        if distancias[w] == infinito:
+                            alcancados.append(w)
+                        distancias[w] = nova_distancia
+                        anterior[w] = u
+                        heapq.heappush(fila, (nova_distancia, w))
+            # Só os vértices tocados são reinicializados.
+            for w in alcancados:
+                distancias[w] = infinito
+                fixado[w] = 0
+            for h in rotulo_raiz.hubs:
+                distancia_hub[h] = infinito
+
+        for posto, raiz in enumerate(hubs):
+            # Busca direta preenche rótulos de entrada; a reversa, os de saída.
+            busca_podada(posto, raiz, csr, saida[raiz], entrada)
+            if csr.direcionado:
+                busca_podada(posto, raiz, transposto, entrada[raiz], saida)
+
+        return cls(csr.nomes, hubs, saida, entrada, csr.direcionado)
+
+    @property
+    def ordem(self) -> int:
+        return len(self.nomes)
+
+    @property
+    def tamanho_medio_rotulo(self) -> float:
+        rotulos = self.saida + self.entrada if self.direcionado else self.saida
+        return sum(len(r) for r in rotulos) / max(len(rotulos), 1)
+
+    def indice(self, vertice: Union[Vertice, str]) -> int:
+        nome = str(vertice)
+        if nome not in self.indices:
+            raise ValueError(f"Vértice '{nome}' não encontrado no oráculo.")
+        return self.indices[nome]
+
+    def distancia(self, origem: Union[Vertice, str], destino: Union[Vertice, str]) -> float:
+        s, t = self.indice(origem), self.indice(destino)
+        if s == t:
+            return 0
+        return _cruzar(self.saida[s], self.entrada[t])[0]
+
+    def matriz_distancias(self, origens, destinos) -> List[List[float]]:
+        """``matriz[i][j] = distancia(origens[i], destinos[j])``, só com cruzamento de rótulos."""
+        ts = [self.indice(d) for d in destinos]
+        matriz = []
+        for origem in origens:
+            s = self.indice(origem)
+            rotulo = self.saida[s]
+            matriz.append([0 if s == t else _cruzar(rotulo, self.entrada[t])[0] for t in ts])
+        return matriz
+
+    def caminho_mais_curto(self, origem: Union[Vertice, str], destino: Union[Vertice, str]) -> Tuple[float, List[str]]:
+        """``(distancia, caminho)`` como em ``Sorting.dijkstra``, recuperado pelos vizinhos guardados nos rótulos."""
+        s, t = self.indice(origem), self.indice(destino)
+        if s == t:
+            return 0, [self.nomes[s]]
+
+        melhor, posto = _cruzar(self.saida[s], self.entrada[t])
+        if posto == -1:
+            return float('inf'), []
+
+        hub = self.hubs[posto]
+        ida = [s]
+        while ida[-1] != hub:
+            ida.append(self.saida[ida[-1]].anterior(posto))
+        volta = [t]
+        while volta[-1] != hub:
+            volta.append(self.entrada[volta[-1]].anterior(posto))
+        caminho = ida + volta[-2::-1]
+        return melhor, [self.nomes[i] for i in caminho]
@@ -1,17 +1,25 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, Response, request, jsonify, send_from_directory, render_template
 import sys
 import os
+import json
+import threading
+from itertools import islice
 from pathlib import Path
 
 ROOT_PATH = Path(__file__).parent.parent
 sys.path.append(str(ROOT_PATH))
 
-from src.graphs.io import carregar_grafo, carregar_dataset_parte2
-from src.graphs.algorithms import Sorting
+from src.graphs.io import carregar_grafo, carregar_dataset_parte2, carregar_marcos, carregar_matriz, carregar_oraculo
+from src.graphs.algorithms import LIMITE_FLOYD_WARSHALL, Sorting
+from src.graphs.cache import carregar_hierarquia
 from src.config import OUT_DIR, TEMPLATES_DIR, BAIRROS_FILE, ARESTAS_FILE, HTML_METADATA, PNG_METADATA, PORT, DATASET_2_CSV
 
 app = Flask(__name__, template_folder=str(TEMPLATES_DIR))
 
+MAX_SUGESTOES = 50
+MAX_CELULAS_MATRIZ = 10000
+MAX_PARES_LOTE = 10000
+
 GRAFOS = {
     'recife': None,
     'usa': None
@@ -33,14 +41,86 @@ try:
 except Exception as e:
     print(f"[ERRO] Falha ao carregar USA: {e}")
 
+# Estruturas derivadas de cada grafo, construídas no primeiro uso (e não
+# na importação): tabelas ALT, oráculos 2-hop e matrizes de todos os pares.
+MARCOS = {}
+ORACULOS = {}
+MATRIZES = {}
+_TRAVA_ESTRUTURAS = threading.Lock()
+
+# Oráculo e matriz só para grafos pequenos: a construção cresce bem mais que o grafo.
+MAX_VERTICES_TABELAS = LIMITE_FLOYD_WARSHALL
+
+
+def _estrutura(tabela, grafo, construir):
+    """``tabela[grafo]``, construída por ``construir(grafo)`` na primeira consulta."""
+    if grafo not in tabela:
+        with _TRAVA_ESTRUTURAS:
+            if grafo not in tabela:
+                tabela[grafo] = construir(grafo)
+    return tabela[grafo]
+
+
+def _marcos(grafo):
+    return _estrutura(MARCOS, grafo, carregar_marcos)
+
+
+def _oraculo(grafo):
+    if grafo.ordem > MAX_VERTICES_TABELAS:
+        raise ValueError(f"Oráculo de distâncias só disponível para grafos com até {MAX_VERTICES_TABELAS} vértices.")
+    return _estrutura(ORACULOS, grafo, carregar_oraculo)
+
+
+def _matriz(grafo):
+    if grafo.ordem > MAX_VERTICES_TABELAS:
+        raise ValueError(f"Matriz de todos os pares só disponível para grafos com até {MAX_VERTICES_TABELAS} vértices.")
+    return _estrutura(MATRIZES, grafo, carregar_matriz)
+
+# Hierarquias de contração carregadas por run_server(hierarquias=[...]).
+HIERARQUIAS = {}
+
+
+def carregar_hierarquias(arquivos):
+    """Associa cada arquivo de hierarquia ao dataset cujo grafo o gerou."""
+    for arquivo in arquivos:
+        for dataset_key, grafo in GRAFOS.items():
+            if grafo is None:
+                continue
+            fontes = [grafo.arquivo_cache] if grafo.arquivo_cache else None
+            hierarquia = carregar_hierarquia(arquivo, fontes)
+            if hierarquia is not None and set(hierarquia.nomes) == set(grafo.vertices):
+                HIERARQUIAS[grafo] = hierarquia
+                print(f"[OK] Hierarquia de {dataset_key} carregada de {arquivo}: {hierarquia.num_atalhos} atalhos.")
+                break
+        else:
+            print(f"[AVISO] Hierarquia {arquivo} não corresponde a nenhum grafo carregado (ausente ou desatualizada).")
+
+
+def _caminho_ch(grafo, origem, destino):
+    if grafo not in HIERARQUIAS:
+        raise ValueError("Nenhuma hierarquia carregada para este dataset (inicie o servidor com --hierarquia).")
+    return HIERARQUIAS[grafo].caminho_mais_curto(origem, destino)
+
 
 ALGORITMOS = {
-    'dijkstra': lambda g, o, d: Sorting.dijkstra(g, g.vertices[o], g.vertices[d]),
-    'bellman': lambda g, o, d: Sorting.bellman_ford(g, g.vertices[o], g.vertices[d]),
+    # Árvores por origem em cache: consultas repetidas da mesma origem só percorrem predecessores.
+    'dijkstra': lambda g, o, d: Sorting.caminho_pela_arvore(g, o, d),
+    'alt': lambda g, o, d: Sorting.a_estrela_marcos(g, o, d, _marcos(g)),
+    'ch': _caminho_ch,
+    'hubs': lambda g, o, d: _oraculo(g).caminho_mais_curto(o, d),
+    'apsp': lambda g, o, d: _matriz(g).caminho_mais_curto(o, d),
+    'bellman': lambda g, o, d: Sorting.caminho_pela_arvore(g, o, d, 'bellman_ford'),
     'bfs': lambda g, o, d: Sorting.bfs_shortest_path(g, o, d),
     'dfs': lambda g, o, d: Sorting.depth_first_search(g, g.vertices[o])
 }
 
+# Percursos sob demanda: cada vértice vira uma linha NDJSON assim que é alcançado.
+PERCURSOS = {
+    'bfs': Sorting.iter_bfs,
+    'dfs': Sorting.iter_dfs,
+    'dijkstra': Sorting.iter_dijkstra,
+}
+
 @app.route('/')
 def index():
     Path(OUT_DIR).mkdir(parents=True, exist_ok=True)
@@ -74,6 +154,116 @@ def index():
 def serve_static(filename):
     return send_from_directory(OUT_DIR, filename)
 
+@app.route('/api/sugestoes')
+def sugestoes():
+    dataset_key = request.args.get('dataset', 'recife')
+    grafo_atual = GRAFOS.get(dataset_key)
+
+    if grafo_atual is None:
+        return jsonify({"erro": f"Dataset '{dataset_key}' não disponível."}), 500
+
+    try:
+        k = int(request.args.get('k', 10))
+    except ValueError:
+        return jsonify({"erro": "Parâmetro 'k' deve ser inteiro."}), 400
+
+    consulta = request.args.get('q', '')
+    k = max(0, min(k, MAX_SUGESTOES))
+    return jsonify({"dataset": dataset_key, "q": consulta, "sugestoes": grafo_atual.sugerir_vertices(consulta, k)})
+
+@app.route('/api/matriz')
+def matriz():
+    dataset_key = request.args.get('dataset', 'recife')
+    grafo_atual = GRAFOS.get(dataset_key)
+
+    if grafo_atual is None:
+        return jsonify({"erro": f"Dataset '{dataset_key}' não disponível."}), 500
+
+    origens = [grafo_atual.resolver_vertice(nome) or nome for nome in request.args.getlist('origem')]
+    destinos = [grafo_atual.resolver_vertice(nome) or nome for nome in request.args.getlist('destino')] or origens
+    if not origens:
+        return jsonify({"erro": "Informe ao menos uma origem (?origem=...&destino=...)."}), 400
+    if len(origens) * len(destinos) > MAX_CELULAS_MATRIZ:
+        return jsonify({"erro": f"Matriz limitada a {MAX_CELULAS_MATRIZ} células."}), 400
+    faltando = [nome for nome in dict.fromkeys(origens + destinos) if nome not in grafo_atual.vertices]
+    if faltando:
+        return jsonify({"erro": f"Vértices não encontrados em {dataset_key}: {', '.join(faltando)}"}), 400
+
+    if grafo_atual.ordem <= MAX_VERTICES_TABELAS:
+        distancias = _matriz(grafo_atual).matriz_distancias(origens, destinos)
+    else:
+        distancias = [[Sorting.dijkstra_bidirecional(grafo_atual, o, d)[0] for d in destinos] for o in origens]
+    distancias = [[None if d == float('inf') else d for d in linha] for linha in distancias]
+    return jsonify({"dataset": dataset_key, "origens": origens, "destinos": destinos, "distancias": distancias})
+
+@app.route('/api/caminhos', methods=['POST'])
+def caminhos():
+    corpo = request.get_json(silent=True) or {}
+    dataset_key = corpo.get('dataset', 'recife')
+    grafo_atual = GRAFOS.get(dataset_key)
+
+    if grafo_atual is None:
+        return jsonify({"erro": f"Dataset '{dataset_key}' não disponível."}), 500
+
+    pares = corpo.get('pares')
+    if not isinstance(pares, list) or not all(isinstance(par, list) and len(par) == 2 for par in pares):
+        return jsonify({"erro": "Informe 'pares' como lista de [origem, destino]."}), 400
+    if len(pares) > MAX_PARES_LOTE:
+        return jsonify({"erro": f"Lote limitado a {MAX_PARES_LOTE} pares."}), 400
+    pares = [tuple(grafo_atual.resolver_vertice(nome) or nome for nome in par) for par in pares]
+    faltando = [nome for nome in dict.fromkeys(n for par in pares for n in par) if nome not in grafo_atual.vertices]
+    if faltando:
+        return jsonify({"erro": f"Vértices não encontrados em {dataset_key}: {', '.join(faltando)}"}), 400
+
+    try:
+        resultados = Sorting.caminhos_em_lote(grafo_atual, pares)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    return jsonify({
+        "dataset": dataset_key,
+        "resultados": [
+            {"origem": o, "destino": d, "custo": None if custo == float('inf') else custo, "caminho": caminho}
+            for (o, d), (custo, caminho) in zip(pares, resultados)
+        ],
+    })
+
+@app.route('/api/percurso')
+def percurso():
+    """Transmite ``{"vertice", "valor", "anterior"}`` por linha (NDJSON), sem montar o resultado completo."""
+    dataset_key = request.args.get('dataset', 'recife')
+    grafo_atual = GRAFOS.get(dataset_key)
+
+    if grafo_atual is None:
+        return jsonify({"erro": f"Dataset '{dataset_key}' não disponível."}), 500
+
+    alg = request.args.get('alg', '').lower()
+    if alg not in PERCURSOS:
+        return jsonify({"erro": f"Percurso '{alg}' não suportado (use {', '.join(PERCURSOS)})"}), 400
+
+    try:
+        limite = int(request.args['limite']) if 'limite' in request.args else None
+        if limite is not None and limite < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({"erro": "Parâmetro 'limite' deve ser inteiro não negativo."}), 400
+
+    origem_nome = request.args.get('origem', '')
+    origem_nome = grafo_atual.resolver_vertice(origem_nome) or origem_nome
+    if origem_nome not in grafo_atual.vertices:
+        return jsonify({"erro": f"Origem '{origem_nome}' não encontrada em {dataset_key}"}), 400
+
+    percurso_vertices = islice(PERCURSOS[alg](grafo_atual, origem_nome), limite)
+
+    def linhas():
+        try:
+            for vertice, valor, anterior in percurso_vertices:
+                yield json.dumps({"vertice": vertice, "valor": valor, "anterior": anterior}, ensure_ascii=False) + "\n"
+        except ValueError as e:
+            # Já com parte da resposta enviada, o erro vai como última linha.
+            yield json.dumps({"erro": str(e)}, ensure_ascii=False) + "\n"
+
+    return Response(linhas(), mimetype='application/x-ndjson')
+
 @app.route('/api/calcular')
 def calcular():
     dataset_key = request.args.get('dataset', 'recife')
@@ -85,6 +275,9 @@ def calcular():
     alg = request.args.get('alg', '').lower()
     origem_nome = request.args.get('origem', '')
     destino_nome = request.args.get('destino', '')
+    origem_nome = grafo_atual.resolver_vertice(origem_nome) or origem_nome
+    if destino_nome:
+        destino_nome = grafo_atual.resolver_vertice(destino_nome) or destino_nome
     
     if origem_nome not in grafo_atual.vertices:
         return jsonify({"erro": f"Origem '{origem_nome}' não encontrada em {dataset_key}"}), 400
@@ -98,7 +291,7 @@ def calcular():
         if alg in ['bfs', 'dfs'] and not destino_nome:
             if alg == 'bfs':
                 res = Sorting.breadth_first_search(grafo_atual, origem)
-                niveis = {k: v for k, v in res['niveis'].items() if v != float('inf')}
+                niveis = res['niveis'].alcancados
                 return jsonify({"tipo": "expansao", "dados_nos": niveis, "metrica": "Nível BFS", "algoritmo": "BFS"})
             elif alg == 'dfs':
                 res = Sorting.depth_first_search(grafo_atual, origem)
@@ -121,10 +314,12 @@ def calcular():
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
-def run_server(port=None):
+def run_server(port=None, hierarquias=()):
+    carregar_hierarquias(hierarquias)
     port_to_use = port if port else PORT
     print(f"Iniciando Servidor Flask na porta {port_to_use}...")
-    app.run(host='0.0.0.0', port=port_to_use, debug=True)
+    # Sem o reloader, que importaria o módulo (e carregaria os grafos) duas vezes.
+    app.run(host='0.0.0.0', port=port_to_use, debug=True, use_reloader=False)
 
 if __name__ == '__main__':
     run_server()
\ No newline at end of file
@@ -3,10 +3,12 @@ import json
 import time
 import csv
 from typing import Any, Dict, List
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from src.graphs.algorithms import Sorting
 from src.graphs.graph import Grafo, Vertice
-from src.graphs.io import carregar_grafo
+from src.graphs.io import carregar_grafo, carregar_matriz
 from src.config import ENDERECOS_FILE
 
 def calcular_metricas_globais(grafo: Grafo) -> dict:
@@ -101,15 +103,17 @@ def gerar_tabela_distancias_enderecos(grafo: Grafo, output_dir: Path):
     print(f"\n--- Gerando Matriz de Endereços (Seção 6) ---")
     resultados = []
     try:
+        # Cada par é uma consulta à matriz de todos os pares, sem busca no grafo.
+        matriz = carregar_matriz(grafo)
         with open(ENDERECOS_FILE, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                b_origem = row['bairro_origem'].strip().lower()
-                b_destino = row['bairro_destino'].strip().lower()
+                b_origem = grafo.resolver_vertice(row['bairro_origem']) or row['bairro_origem'].strip().lower()
+                b_destino = grafo.resolver_vertice(row['bairro_destino']) or row['bairro_destino'].strip().lower()
                 custo, caminho_str = "N/A", "Bairro não encontrado"
                 
                 if b_origem in grafo.vertices and b_destino in grafo.vertices:
-                    dist, path = grafo.caminho_mais_curto_dijkstra(b_origem, b_destino)
+                    dist, path = matriz.caminho_mais_curto(b_origem, b_destino)
                     custo = f"{dist:.2f}" if dist != float('inf') else "INF"
                     caminho_str = " -> ".join(path)
                 
@@ -195,9 +199,7 @@ def run_part2_full_analysis(grafo: Grafo, output_dir: Path):
                 "origem": source,
                 "destino": None,
                 "tempo_execucao_s": time_bfs,
-                "vertices_alcancados": len(
-                    [n for n in result_bfs["niveis"].values() if n != float("inf")]
-                ),
+                "vertices_alcancados": len(result_bfs["niveis"].alcancados),
             })
 
         print(f"BFS a partir de {source} concluído em {time_bfs:.6f}s.")
@@ -287,6 +289,17 @@ def run_part2_full_analysis(grafo: Grafo, output_dir: Path):
                 })
             print(f"Bellman-Ford de {vertice_origem_pn} para {vertice_destino_pn} (pesos negativos, sem ciclo) concluído em {time_bf_nw:.6f}s. Custo: {cost_nw}")
             print(f"Caminho: {' -> '.join(path_nw)}")
+
+            matriz_nw, time_johnson = _run_benchmark(Sorting.johnson, grafo_neg_weights_no_cycle)
+            benchmark_results.append({
+                    "algoritmo": "Johnson (Pesos Negativos, SEM Ciclo - Todos os Pares)",
+                    "origem": None,
+                    "destino": None,
+                    "tempo_execucao_s": time_johnson,
+                    "pares_alcancaveis": int(np.isfinite(matriz_nw.distancias).sum()),
+                    "custo": matriz_nw.distancia(vertice_origem_pn, vertice_destino_pn),
+                })
+            print(f"Johnson (todos os pares, pesos negativos) concluído em {time_johnson:.6f}s.")
         except ValueError as e:
             benchmark_results.append({
                     "algoritmo": "Bellman-Ford (Pesos Negativos, SEM Ciclo - Dataset)",
@@ -341,6 +354,7 @@ def run_part2_full_analysis(grafo: Grafo, output_dir: Path):
                 "destino": "LAX",
                 "tempo_execucao_s": end_time_cycle_new - start_time_cycle_new,
                 "resultado": str(e),
+                "ciclo": getattr(e, 'ciclo', []),
             })
         print(f"Bellman-Ford detectou corretamente o ciclo negativo. ({e})")
     else:
@@ -103,8 +103,8 @@ def visualizar_mapa_cores_grau(grafo: Grafo, caminho_saida: str = None):
         caminho_saida = str(OUT_DIR / "viz_mapa_cores_grau.png")
     
     dados_graus = []
-    for nome_bairro, vertice in grafo.vertices.items():
-        grau = len(vertice.vizinhos)
+    for nome_bairro in grafo.vertices:
+        grau = grafo.grau(nome_bairro)
         dados_graus.append({"bairro": nome_bairro, "grau": grau})
     
     df = pd.DataFrame(dados_graus).sort_values("grau", ascending=True)
@@ -191,8 +191,8 @@ def visualizar_subgrafo_top10(grafo: Grafo, caminho_saida: str = None):
         caminho_saida = str(OUT_DIR / "viz_subgrafo_top10.html")
     
     dados_graus = []
-    for nome_bairro, vertice in grafo.vertices.items():
-        grau = len(vertice.vizinhos)
+    for nome_bairro in grafo.vertices:
+        grau = grafo.grau(nome_bairro)
         dados_graus.append({"bairro": nome_bairro, "grau": grau})
     
     df = pd.DataFrame(dados_graus).sort_values("grau", ascending=False)
@@ -208,8 +208,8 @@ def visualizar_subgrafo_top10(grafo: Grafo, caminho_saida: str = None):
     net = Network(height="750px", width="100%", bgcolor="#222222", font_color="white")
     net.barnes_hut(gravity=-8000, central_gravity=0.3, spring_length=200)
     
-    for nome_vertice, vertice in subgrafo.vertices.items():
-        grau = len(vertice.vizinhos)
+    for nome_vertice in subgrafo.vertices:
+        grau = subgrafo.grau(nome_vertice)
         eh_top10 = nome_vertice in top10_bairros
         
         tamanho = 30 + (grau * 3) if eh_top10 else 15 + (grau * 2)
@@ -243,7 +243,7 @@ def visualizar_distribuicao_graus_parte1(grafo: Grafo, caminho_saida: str = None
     if caminho_saida is None:
         caminho_saida = str(OUT_DIR / "viz_distribuicao_graus.png")
     
-    graus = [len(vertice.vizinhos) for vertice in grafo.vertices.values()]
+    graus = [grafo.grau(nome) for nome in grafo.vertices]
     
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -289,7 +289,7 @@ def visualizar_arvore_bfs(grafo: Grafo, origem: str = "boa vista", caminho_saida
     net = Network(height="800px", width="100%", bgcolor="#222222", font_color="white", directed=True)
     net.barnes_hut(gravity=-5000, central_gravity=0.5, spring_length=150)
     
-    max_nivel = max([v for v in niveis.values() if v != float('inf')])
+    max_nivel = max(niveis.alcancados.values())
     cores_niveis = plt.cm.rainbow([i/max_nivel for i in range(max_nivel + 1)])
     
     for nome_vertice, nivel in niveis.items():
@@ -353,7 +353,7 @@ def visualizar_distribuicao_graus(grafo: Grafo, output_dir: Path, is_part1: bool
     """Gera um histograma da distribuição de graus do grafo."""
     filename = "parte2_distribuicao_graus.png"
     caminho_saida = output_dir / filename
-    graus = [len(v.vizinhos) for v in grafo.vertices.values()]
+    graus = [grafo.grau(nome) for nome in grafo.vertices]
     
     plt.figure(figsize=(10, 6))
     plt.hist(graus, bins=range(min(graus), max(graus) + 2), edgecolor='black', alpha=0.7)
@@ -411,7 +411,7 @@ def gerar_json_usa_limitado(limite_nos: int = 94):
     print(f"\nGerando JSON USA (Top {limite_nos})...")
     grafo = carregar_dataset_parte2(caminho_csv)
     
-    graus = sorted([(n, len(v.vizinhos)) for n, v in grafo.vertices.items()], key=lambda x: x[1], reverse=True)
+    graus = sorted([(n, grafo.grau(n)) for n in grafo.vertices], key=lambda x: x[1], reverse=True)
     top_nodes = {x[0] for x in graus[:limite_nos]}
     subgrafo = grafo.criar_subgrafo(top_nodes)
     
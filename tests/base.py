@@ -6,7 +6,9 @@ import math
 ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
-from src.graphs.graph import Grafo, Vertice
+from src.graphs.algorithms import Sorting
+from src.graphs.cache import caminho_cache, salvar_grafo_binario
+from src.graphs.graph import Grafo, GrafoDirecionado, Vertice
 from src.graphs.io import carregar_grafo
 from src.config import BAIRROS_FILE, ARESTAS_FILE
 
@@ -31,12 +33,57 @@ class HelperTest:
         
         return grafo, vertices
 
+    @staticmethod
+    def criar_grafo_direcionado_simples():
+        # A->B->C->D->E com o atalho A->D mais caro; F fica isolado.
+        grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E', 'F']:
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_arestas_em_lote([
+            ('A', 'B', 1.0), ('B', 'C', 2.0), ('C', 'D', 1.0), ('A', 'D', 6.0), ('D', 'E', 1.0),
+        ])
+        return grafo
+
     @staticmethod
     def carregar_grafo_real():
         path_nos = str(BAIRROS_FILE)
         path_arestas = str(ARESTAS_FILE)
         
-        return carregar_grafo(path_nos, path_arestas)
+        # Sem cache: os testes não gravam em .cache/ nem dependem de um cache antigo.
+        return carregar_grafo(path_nos, path_arestas, usar_cache=False)
+
+    @staticmethod
+    def carregar_grafo_real_com_cache(diretorio):
+        # Grafo real salvo em ``diretorio``, para as estruturas guardadas ao lado do cache.
+        grafo = HelperTest.carregar_grafo_real()
+        arquivo = str(caminho_cache(['bairros.csv'], 'bairros', diretorio=diretorio))
+        salvar_grafo_binario(grafo, arquivo)
+        grafo.arquivo_cache = arquivo
+        return grafo
+
+    @staticmethod
+    def assert_mesmo_resultado_que_dijkstra(grafo, caminho_mais_curto, distancia=None):
+        for origem in grafo.vertices:
+            for destino in grafo.vertices:
+                esperado = Sorting.dijkstra(grafo, origem, destino)
+                assert caminho_mais_curto(origem, destino) == esperado
+                if distancia is not None:
+                    assert distancia(origem, destino) == esperado[0]
+
+    @staticmethod
+    def assert_distancias_como_dijkstra(grafo, caminho_mais_curto, passo=5):
+        nomes = list(grafo.vertices)[::passo]
+        for origem in nomes:
+            for destino in nomes:
+                esperado, _ = Sorting.dijkstra(grafo, origem, destino)
+                distancia, caminho = caminho_mais_curto(origem, destino)
+
+                if esperado == float('inf'):
+                    assert caminho == []
+                    continue
+                HelperTest.assert_distancia_aproximada(distancia, esperado)
+                HelperTest.assert_caminho_valido(grafo, caminho, origem, destino)
+                HelperTest.assert_distancia_aproximada(HelperTest.calcular_distancia_caminho(grafo, caminho), esperado)
     
     @staticmethod
     def assert_caminho_valido(grafo, caminho, origem_esperada, destino_esperado):
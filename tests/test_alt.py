@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.algorithms import Sorting
+from src.graphs.graph import Vertice
+from tests.base import HelperTest
+
+
+class TestALTGrafoSimples:
+    """Testes do A* com marcos em grafos pequenos e controlados"""
+
+    def setup_method(self):
+        self.grafo = HelperTest.criar_grafo_direcionado_simples()
+
+    @pytest.mark.parametrize('estrategia', ['distante', 'grau'])
+    def test_mesmas_distancias_que_dijkstra(self, estrategia):
+        tabelas = Sorting.calcular_tabelas_marcos(self.grafo, k=2, estrategia=estrategia)
+        csr = self.grafo.to_csr()
+
+        assert len(tabelas) == 2
+        for grafo in (self.grafo, csr):
+            HelperTest.assert_mesmo_resultado_que_dijkstra(
+                self.grafo, lambda o, d: Sorting.a_estrela_marcos(grafo, o, d, tabelas)
+            )
+
+    def test_marcos_ignoram_vertices_isolados(self):
+        tabelas = Sorting.calcular_tabelas_marcos(self.grafo, k=10)
+        assert 'F' not in [tabelas.nomes[i] for i in tabelas.marcos]
+        assert len(tabelas) == 5
+
+    def test_tabelas_de_outro_grafo(self):
+        tabelas = Sorting.calcular_tabelas_marcos(self.grafo, k=2)
+        self.grafo.adicionar_vertice(Vertice('G'))
+        with pytest.raises(ValueError):
+            Sorting.a_estrela_marcos(self.grafo, 'A', 'E', tabelas)
+
+    def test_estrategia_invalida(self):
+        with pytest.raises(ValueError):
+            Sorting.calcular_tabelas_marcos(self.grafo, estrategia='aleatoria')
+
+
+class TestALTGrafoReal:
+    """Compara o A* com marcos ao Dijkstra no grafo dos bairros"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        cls.tabelas = Sorting.calcular_tabelas_marcos(cls.grafo, k=4)
+
+    def test_distancias(self):
+        HelperTest.assert_distancias_como_dijkstra(
+            self.grafo, lambda o, d: Sorting.a_estrela_marcos(self.grafo, o, d, self.tabelas)
+        )
@@ -4,7 +4,8 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.graphs.algorithms import Sorting
+from src.graphs.algorithms import CicloNegativoError, Sorting
+from src.graphs.graph import GrafoDirecionado, Vertice
 from tests.base import HelperTest
 
 """
@@ -182,3 +183,129 @@ class TestBellmanFordGrafoReal:
         _, _, tem_ciclo_negativo = Sorting.bellman_ford(self.grafo, no_origem)
         
         assert tem_ciclo_negativo == False
+
+
+class TestBellmanFordSPFA:
+    """Testes do Bellman-Ford com fila (SPFA) e extração de ciclos negativos"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=4.0)
+        self.grafo.adicionar_aresta(v['A'], v['C'], peso=2.0)
+        self.grafo.adicionar_aresta(v['C'], v['B'], peso=-1.0)
+        self.grafo.adicionar_aresta(v['B'], v['D'], peso=3.0)
+
+    def test_pesos_negativos_sem_ciclo(self):
+        for grafo in (self.grafo, self.grafo.to_csr()):
+            assert Sorting.bellman_ford_spfa(grafo, 'A', 'D') == (4.0, ['A', 'C', 'B', 'D'])
+            assert Sorting.bellman_ford_spfa(grafo, 'A', 'E') == (float('inf'), [])
+
+            distancias, anterior, ciclo = Sorting.bellman_ford_spfa(grafo, 'A')
+            esperado, _, _ = Sorting.bellman_ford(grafo, self.grafo.vertices['A'])
+            assert distancias == esperado
+            assert anterior['B'] == 'C'
+            assert ciclo == []
+
+    def test_ciclo_negativo_extraido(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['D'], v['C'], peso=-3.0)
+
+        for grafo in (self.grafo, self.grafo.to_csr()):
+            _, _, ciclo = Sorting.bellman_ford_spfa(grafo, 'A')
+            assert sorted(ciclo) == ['B', 'C', 'D']
+            assert sum(self.grafo.obter_peso(u, w) for u, w in zip(ciclo, ciclo[1:] + ciclo[:1])) < 0
+
+            with pytest.raises(CicloNegativoError) as erro:
+                Sorting.bellman_ford_spfa(grafo, 'A', 'E')
+            assert erro.value.ciclo == ciclo
+            assert isinstance(erro.value, ValueError)
+
+    def test_metodo_do_grafo_mantem_booleano(self):
+        assert self.grafo.caminho_mais_curto_bellman_ford('A')[2] is False
+        assert self.grafo.ciclo_negativo('A') == []
+
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['D'], v['C'], peso=-3.0)
+        distancias, anterior, tem_ciclo = self.grafo.caminho_mais_curto_bellman_ford('A')
+        assert tem_ciclo is True
+        assert sorted(self.grafo.ciclo_negativo('A')) == ['B', 'C', 'D']
+
+    def test_ciclo_inalcancavel_ignorado(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['E'], v['E'], peso=-1.0)
+        assert Sorting.bellman_ford_spfa(self.grafo, 'A', 'D') == (4.0, ['A', 'C', 'B', 'D'])
+        with pytest.raises(CicloNegativoError) as erro:
+            Sorting.bellman_ford_spfa(self.grafo, 'E', 'A')
+        assert erro.value.ciclo == ['E']
+
+    def test_grafo_real_igual_ao_classico(self):
+        grafo = HelperTest.carregar_grafo_real()
+        origem = grafo.vertices['boa viagem']
+        distancias, _, ciclo = Sorting.bellman_ford_spfa(grafo, origem)
+        esperado, _, _ = Sorting.bellman_ford(grafo, origem)
+
+        assert not ciclo
+        for nome, distancia in esperado.items():
+            HelperTest.assert_distancia_aproximada(distancias[nome], distancia)
+
+
+
+class TestJohnson:
+    """Testes do Johnson (todos os pares com pesos negativos)"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=4.0)
+        self.grafo.adicionar_aresta(v['A'], v['C'], peso=2.0)
+        self.grafo.adicionar_aresta(v['C'], v['B'], peso=-1.0)
+        self.grafo.adicionar_aresta(v['B'], v['D'], peso=3.0)
+        self.grafo.adicionar_aresta(v['D'], v['A'], peso=-2.0)
+
+    def _conferir_com_spfa(self, grafo, matriz):
+        for origem in grafo.vertices:
+            distancias, _, _ = Sorting.bellman_ford_spfa(grafo, origem)
+            for destino, esperado in distancias.items():
+                HelperTest.assert_distancia_aproximada(matriz.distancia(origem, destino), esperado)
+
+    def test_mesmo_resultado_que_spfa(self):
+        matriz = Sorting.johnson(self.grafo, anteriores=True, processos=1)
+
+        self._conferir_com_spfa(self.grafo, matriz)
+        assert matriz.caminho_mais_curto('D', 'B') == (-1.0, ['D', 'A', 'C', 'B'])
+        assert matriz.caminho_mais_curto('A', 'E') == (float('inf'), [])
+        assert matriz.caminho_mais_curto('E', 'E') == (0.0, ['E'])
+
+    def test_sem_anteriores(self):
+        matriz = Sorting.johnson(self.grafo, processos=1)
+        assert matriz.anteriores is None
+        with pytest.raises(ValueError):
+            matriz.caminho_mais_curto('A', 'D')
+        with pytest.raises(ValueError):
+            matriz.distancia('A', 'Z')
+
+    def test_ciclo_negativo(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['E'], v['E'], peso=-1.0)
+        with pytest.raises(CicloNegativoError) as erro:
+            Sorting.johnson(self.grafo)
+        assert erro.value.ciclo == ['E']
+
+    def test_pool_de_processos(self, monkeypatch):
+        from src.graphs import algorithms
+        monkeypatch.setattr(algorithms, 'MINIMO_ORIGENS_PARALELO', 0)
+
+        grafo = HelperTest.carregar_grafo_real()
+        matriz = Sorting.johnson(grafo, anteriores=True, processos=2)
+        sequencial = Sorting.johnson(grafo, anteriores=True, processos=1)
+
+        assert (matriz.distancias == sequencial.distancias).all()
+        assert (matriz.anteriores == sequencial.anteriores).all()
+        distancia, caminho = matriz.caminho_mais_curto('casa forte', 'boa viagem')
+        HelperTest.assert_distancia_aproximada(distancia, Sorting.dijkstra(grafo, 'casa forte', 'boa viagem')[0])
+        HelperTest.assert_caminho_valido(grafo, caminho, 'casa forte', 'boa viagem')
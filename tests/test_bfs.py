@@ -4,8 +4,8 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.graphs.graph import Grafo, Vertice
-from src.graphs.algorithms import Sorting
+from src.graphs.graph import Grafo, GrafoDirecionado, Vertice
+from src.graphs.algorithms import BFSDirecional, Sorting
 from tests.base import HelperTest
 
 
@@ -183,3 +183,157 @@ class TestBFS:
         assert resultado['niveis']['C'] == float('inf')
         assert resultado['niveis']['D'] == float('inf')
         assert resultado['niveis']['E'] == float('inf')
+
+    def test_bfs_resultado_esparso(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+
+        for g in (grafo, grafo.to_csr()):
+            resultado = Sorting.breadth_first_search(g, vertices['a'])
+            niveis = resultado['niveis']
+
+            # Só os alcançados ficam guardados; o resto é inf sob demanda.
+            assert niveis.alcancados == {'A': 0, 'B': 1}
+            assert resultado['arvore'].alcancados == {'A': ['B']}
+            assert len(niveis) == 5
+            assert set(niveis) == {'A', 'B', 'C', 'D', 'E'}
+            assert dict(niveis) == {'A': 0, 'B': 1, 'C': float('inf'), 'D': float('inf'), 'E': float('inf')}
+            assert niveis.get('C') == float('inf')
+            assert niveis.get('Z') is None
+            with pytest.raises(KeyError):
+                niveis['Z']
+
+
+class TestBFSBidirecional:
+    """Testes do menor caminho em arestas por BFS bidirecional"""
+
+    def test_mesma_distancia_que_bfs_recife(self):
+        grafo = HelperTest.carregar_grafo_real()
+        csr = grafo.to_csr()
+        nomes = list(grafo.vertices)[::7]
+        for origem in nomes:
+            niveis = Sorting.breadth_first_search(grafo, grafo.vertices[origem])['niveis']
+            for destino in nomes:
+                for g in (grafo, csr):
+                    distancia, caminho = Sorting.bfs_shortest_path(g, origem, destino)
+                    assert distancia == niveis[destino]
+                    if distancia != float('inf'):
+                        assert len(caminho) == distancia + 1
+                        HelperTest.assert_caminho_valido(grafo, caminho, origem, destino)
+
+    def test_direcionado_usa_arestas_reversas(self):
+        grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D']:
+            grafo.adicionar_vertice(Vertice(nome))
+        v = grafo.vertices
+        grafo.adicionar_aresta(v['A'], v['B'])
+        grafo.adicionar_aresta(v['B'], v['C'])
+        grafo.adicionar_aresta(v['C'], v['D'])
+        grafo.adicionar_aresta(v['D'], v['A'])
+
+        for g in (grafo, grafo.to_csr()):
+            assert Sorting.bfs_shortest_path(g, 'A', 'D') == (3, ['A', 'B', 'C', 'D'])
+            assert Sorting.bfs_shortest_path(g, 'D', 'C') == (3, ['D', 'A', 'B', 'C'])
+
+    def test_vertice_ou_nome(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+        grafo.adicionar_aresta(vertices['b'], vertices['c'])
+
+        assert Sorting.bfs_shortest_path(grafo, vertices['a'], vertices['c']) == (2, ['A', 'B', 'C'])
+        assert Sorting.bfs_shortest_path(grafo, 'A', vertices['c']) == (2, ['A', 'B', 'C'])
+        assert Sorting.bfs_shortest_path(grafo, 'A', 'A') == (0, ['A'])
+
+    def test_inalcancavel(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+
+        assert Sorting.bfs_shortest_path(grafo, 'A', 'E') == (float('inf'), [])
+        assert Sorting.bfs_shortest_path(grafo, 'A', 'Z') == (float('inf'), [])
+        assert Sorting.bfs_shortest_path(grafo.to_csr(), 'A', 'E') == (float('inf'), [])
+
+
+class TestBFSDirecional:
+    """A BFS por níveis em NumPy deve reproduzir a BFS com fila"""
+
+    @staticmethod
+    def assert_mesmo_resultado(resultado, esperado):
+        assert resultado['niveis'].alcancados == esperado['niveis'].alcancados
+        assert resultado['anterior'] == esperado['anterior']
+        assert resultado['arvore'].alcancados == esperado['arvore'].alcancados
+        assert resultado['ordem_visita'] == esperado['ordem_visita']
+
+    def test_grafo_real_recife_nos_dois_modos(self):
+        grafo = HelperTest.carregar_grafo_real()
+        motores = [
+            BFSDirecional(grafo),
+            BFSDirecional(grafo, alfa=float('inf')),
+            BFSDirecional(grafo, alfa=1e-9, beta=float('inf')),
+        ]
+        for origem in list(grafo.vertices)[::10]:
+            esperado = Sorting.breadth_first_search(grafo, grafo.vertices[origem])
+            for motor in motores:
+                self.assert_mesmo_resultado(motor.executar(origem), esperado)
+
+    def test_direcionado_com_inalcancaveis(self):
+        grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            grafo.adicionar_vertice(Vertice(nome))
+        v = grafo.vertices
+        grafo.adicionar_aresta(v['A'], v['B'])
+        grafo.adicionar_aresta(v['A'], v['C'])
+        grafo.adicionar_aresta(v['C'], v['B'])
+        grafo.adicionar_aresta(v['B'], v['D'])
+        grafo.adicionar_aresta(v['E'], v['A'])
+
+        resultado = Sorting.bfs_direcional(grafo, v['A'])
+        self.assert_mesmo_resultado(resultado, Sorting.breadth_first_search(grafo, v['A']))
+        assert resultado['niveis']['E'] == float('inf')
+
+        nivel, pai, ordem = BFSDirecional(grafo.to_csr(), alfa=1e-9, beta=float('inf')).percorrer('A')
+        assert nivel.tolist() == [0, 1, 1, 2, -1]
+        assert pai.tolist() == [-1, 0, 0, 1, -1]
+        assert ordem.tolist() == [0, 1, 2, 3]
+
+
+class TestIterBFS:
+    """Percurso BFS sob demanda"""
+
+    def test_mesma_ordem_que_bfs_recife(self):
+        grafo = HelperTest.carregar_grafo_real()
+        esperado = Sorting.breadth_first_search(grafo, grafo.vertices['boa viagem'])
+
+        for g in (grafo, grafo.to_csr()):
+            percurso = list(Sorting.iter_bfs(g, 'boa viagem'))
+            assert [v for v, _, _ in percurso] == esperado['ordem_visita']
+            for vertice, nivel, anterior in percurso:
+                assert nivel == esperado['niveis'][vertice]
+                assert anterior == esperado['anterior'][vertice]
+
+    def test_parada_antecipada_e_origem_inexistente(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+        grafo.adicionar_aresta(vertices['b'], vertices['c'])
+
+        primeiro = next(v for v, nivel, _ in Sorting.iter_bfs(grafo, vertices['a']) if nivel == 1)
+        assert primeiro == 'B'
+        with pytest.raises(ValueError):
+            Sorting.iter_bfs(grafo, 'Z')
+
+
+class TestBFSGrafoECSR:
+    """O resultado da BFS não depende de o grafo estar congelado em CSR"""
+
+    def test_mesmos_mapas_nas_duas_representacoes(self):
+        grafo = HelperTest.carregar_grafo_real()
+        csr = grafo.to_csr()
+        origem = list(grafo.vertices)[40]
+
+        esperado = Sorting.breadth_first_search(grafo, grafo.vertices[origem])
+        for resultado in (Sorting.breadth_first_search(csr, origem), BFSDirecional(csr).executar(origem)):
+            for chave in ('niveis', 'distancias', 'arvore'):
+                assert list(resultado[chave]) == list(esperado[chave])
+                assert list(resultado[chave].items()) == list(esperado[chave].items())
+                assert resultado[chave].primeiro == esperado[chave].primeiro == origem
+            assert resultado['anterior'] == esperado['anterior']
+            assert resultado['ordem_visita'] == esperado['ordem_visita']
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.graph import GrafoCSR, GrafoDirecionado, Vertice
+from src.graphs.algorithms import Sorting
+from tests.base import HelperTest
+
+
+class TestSnapshotCSR:
+    """Testes do snapshot CSR e dos algoritmos executados sobre ele"""
+
+    def setup_method(self):
+        self.grafo, self.v = HelperTest.criar_grafo_com_vertices()
+        self.grafo.adicionar_aresta(self.v['a'], self.v['b'], peso=10.0)
+        self.grafo.adicionar_aresta(self.v['a'], self.v['c'], peso=3.0)
+        self.grafo.adicionar_aresta(self.v['c'], self.v['b'], peso=2.0)
+        self.grafo.adicionar_aresta(self.v['b'], self.v['d'], peso=1.0)
+        self.csr = self.grafo.to_csr()
+
+    def test_estrutura(self):
+        """Verifica ids densos, offsets e vizinhos ordenados por nome"""
+        assert isinstance(self.csr, GrafoCSR)
+        assert self.csr.nomes == ('A', 'B', 'C', 'D', 'E')
+        assert self.csr.ordem == self.grafo.ordem
+        assert self.csr.tamanho == self.grafo.tamanho
+        assert len(self.csr.offsets) == self.csr.ordem + 1
+        assert self.csr.obter_vizinhos('B') == ['A', 'C', 'D']
+        assert self.csr.obter_peso('C', 'B') == 2.0
+        assert self.csr.obter_peso('A', 'E') == float('inf')
+
+    def test_dijkstra_igual_ao_grafo(self):
+        assert Sorting.dijkstra(self.csr, self.v['a'], self.v['d']) == \
+            Sorting.dijkstra(self.grafo, self.v['a'], self.v['d'])
+        assert Sorting.dijkstra(self.csr, 'A', 'E') == (float('inf'), [])
+
+    def test_bellman_ford_igual_ao_grafo(self):
+        assert Sorting.bellman_ford(self.csr, self.v['a'], self.v['d']) == (6.0, ['A', 'C', 'B', 'D'])
+        distancias, _, ciclo = Sorting.bellman_ford(self.csr, self.v['a'])
+        esperado, _, _ = Sorting.bellman_ford(self.grafo, self.v['a'])
+        assert distancias == esperado
+        assert ciclo is False
+
+    def test_bfs_igual_ao_grafo(self):
+        assert Sorting.breadth_first_search(self.csr, self.v['a']) == \
+            Sorting.breadth_first_search(self.grafo, self.v['a'])
+
+    def test_dfs_igual_ao_grafo(self):
+        assert Sorting.depth_first_search(self.csr, self.v['a']) == \
+            Sorting.depth_first_search(self.grafo, self.v['a'])
+
+    def test_freeze_direcionado(self):
+        grafo = GrafoDirecionado()
+        for nome in ['X', 'Y', 'Z']:
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_aresta(grafo.vertices['X'], grafo.vertices['Y'], peso=4.0)
+        grafo.adicionar_aresta(grafo.vertices['Y'], grafo.vertices['Z'], peso=-1.0)
+
+        csr = grafo.freeze()
+
+        assert csr.direcionado
+        assert csr.tamanho == 2
+        assert csr.obter_vizinhos('Y') == ['Z']
+        assert Sorting.bellman_ford(csr, 'X', 'Z') == (3.0, ['X', 'Y', 'Z'])
+        assert Sorting.bellman_ford(csr, 'Z', 'X') == (float('inf'), [])
+
+
+class TestSnapshotCSRGrafoReal:
+    """Compara os algoritmos no grafo real dos bairros com e sem snapshot"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        cls.csr = cls.grafo.to_csr()
+
+    def test_dijkstra(self):
+        origem = self.grafo.vertices["casa forte"]
+        destino = self.grafo.vertices["boa viagem"]
+
+        distancia, caminho = Sorting.dijkstra(self.csr, origem, destino)
+        esperado, _ = Sorting.dijkstra(self.grafo, origem, destino)
+
+        HelperTest.assert_distancia_aproximada(distancia, esperado)
+        HelperTest.assert_caminho_valido(self.grafo, caminho, "casa forte", "boa viagem")
+
+    def test_dfs_componentes(self):
+        origem = self.grafo.vertices["boa viagem"]
+        resultado = Sorting.depth_first_search(self.csr, origem)
+        esperado = Sorting.depth_first_search(self.grafo, origem)
+
+        assert resultado['ordem_visita'] == esperado['ordem_visita']
+        assert resultado['componentes'] == esperado['componentes']
+        assert resultado['classificacao_arestas'] == esperado['classificacao_arestas']
@@ -19,7 +19,7 @@ class TestDFS:
         grafo.adicionar_aresta(vertices['c'], vertices['d'])
         grafo.adicionar_aresta(vertices['d'], vertices['e'])
         
-        resultado = Sorting.depth_first_search(grafo, vertices['a'])
+        resultado = Sorting.depth_first_search(grafo, vertices['a'], classificar=True)
         
         assert len(resultado['ordem_visita']) == 5
         assert resultado['ordem_visita'][0] == 'A'
@@ -43,7 +43,7 @@ class TestDFS:
         grafo.adicionar_aresta(vertices['b'], vertices['c'])
         grafo.adicionar_aresta(vertices['c'], vertices['a'])
         
-        resultado = Sorting.depth_first_search(grafo, vertices['a'])
+        resultado = Sorting.depth_first_search(grafo, vertices['a'], classificar=True)
         
         assert resultado['tem_ciclo'] == True
         
@@ -59,7 +59,7 @@ class TestDFS:
         grafo.adicionar_aresta(vertices['a'], vertices['c'])
         grafo.adicionar_aresta(vertices['b'], vertices['d'])
         
-        resultado = Sorting.depth_first_search(grafo, vertices['a'])
+        resultado = Sorting.depth_first_search(grafo, vertices['a'], classificar=True)
         
         assert resultado['tem_ciclo'] == False
         tipos_arestas = list(resultado['classificacao_arestas'].values())
@@ -115,7 +115,7 @@ class TestDFS:
         assert origem_nome in grafo.vertices, f"Bairro '{origem_nome}' não encontrado no grafo"
         
         origem = grafo.vertices[origem_nome]
-        resultado = Sorting.depth_first_search(grafo, origem)
+        resultado = Sorting.depth_first_search(grafo, origem, classificar=True)
         
         assert 'descoberta' in resultado
         assert 'finalizacao' in resultado
@@ -154,4 +154,85 @@ class TestDFS:
         
         for vertice in resultado['ordem_visita']:
             assert vertice in resultado['descoberta']
-            assert vertice in resultado['finalizacao']
\ No newline at end of file
+            assert vertice in resultado['finalizacao']
+    
+    def test_dfs_caminho_maior_que_limite_de_recursao(self):
+        grafo = Grafo()
+        n = sys.getrecursionlimit() * 5
+        for i in range(n):
+            grafo.adicionar_vertice(Vertice(f"v{i}"))
+        grafo.adicionar_arestas_em_lote([(f"v{i}", f"v{i + 1}") for i in range(n - 1)])
+
+        for g in (grafo, grafo.to_csr()):
+            resultado = Sorting.depth_first_search(g, 'v0')
+            assert len(resultado['ordem_visita']) == n
+            assert resultado['anterior'][f"v{n - 1}"] == f"v{n - 2}"
+            assert resultado['finalizacao']['v0'] == 2 * n
+            assert resultado['tem_ciclo'] == False
+
+    def test_dfs_classificacao_opcional(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+        grafo.adicionar_aresta(vertices['b'], vertices['c'])
+        grafo.adicionar_aresta(vertices['c'], vertices['a'])
+
+        resultado = Sorting.depth_first_search(grafo, vertices['a'])
+        assert resultado['classificacao_arestas'] == {}
+        assert resultado['tem_ciclo'] == True
+
+    def test_dfs_eventos(self):
+        grafo, vertices = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(vertices['a'], vertices['b'])
+        grafo.adicionar_aresta(vertices['b'], vertices['c'])
+        grafo.adicionar_aresta(vertices['c'], vertices['a'])
+
+        for g in (grafo, grafo.to_csr()):
+            eventos = []
+            Sorting.depth_first_search(g, 'A', classificar=True, eventos=lambda *e: eventos.append(e))
+            assert eventos == [
+                ('descoberta', 'A', None),
+                ('arvore', 'A', 'B'),
+                ('descoberta', 'B', 'A'),
+                ('arvore', 'B', 'C'),
+                ('descoberta', 'C', 'B'),
+                ('retorno', 'C', 'A'),
+                ('finalizacao', 'C', 'B'),
+                ('finalizacao', 'B', 'A'),
+                ('finalizacao', 'A', None),
+                ('descoberta', 'D', None),
+                ('finalizacao', 'D', None),
+                ('descoberta', 'E', None),
+                ('finalizacao', 'E', None),
+            ]
+
+            sem_classificar = []
+            Sorting.depth_first_search(g, 'A', eventos=lambda *e: sem_classificar.append(e))
+            assert sem_classificar == [
+                ('descoberta', 'A', None),
+                ('aresta', 'A', 'B'),
+                ('descoberta', 'B', 'A'),
+                ('aresta', 'B', 'C'),
+                ('descoberta', 'C', 'B'),
+                ('aresta', 'C', 'A'),
+                ('finalizacao', 'C', 'B'),
+                ('finalizacao', 'B', 'A'),
+                ('aresta', 'A', 'C'),
+                ('finalizacao', 'A', None),
+                ('descoberta', 'D', None),
+                ('finalizacao', 'D', None),
+                ('descoberta', 'E', None),
+                ('finalizacao', 'E', None),
+            ]
+
+    def test_iter_dfs(self):
+        grafo = HelperTest.carregar_grafo_real()
+        esperado = Sorting.depth_first_search(grafo, 'boa viagem')
+
+        for g in (grafo, grafo.to_csr()):
+            percurso = list(Sorting.iter_dfs(g, 'boa viagem'))
+            assert [v for v, _, _ in percurso] == esperado['componentes'][0]
+            profundidade = {}
+            for vertice, nivel, anterior in percurso:
+                assert anterior == esperado['anterior'][vertice]
+                profundidade[vertice] = 0 if anterior is None else profundidade[anterior] + 1
+                assert nivel == profundidade[vertice]
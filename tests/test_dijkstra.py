@@ -1,10 +1,13 @@
 import sys
 from pathlib import Path
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.graphs.algorithms import Sorting
+from src.graphs.graph import GrafoDirecionado, Vertice
 from tests.base import HelperTest
 
 """
@@ -160,3 +163,287 @@ class TestDijkstraGrafoReal:
             # A distância deve ser igual ao peso da aresta
             peso_aresta = self.grafo.obter_peso(bairro1, bairro2)
             assert distancia == peso_aresta
+
+
+class TestDijkstraBidirecional:
+    """Testes do Dijkstra bidirecional contra o unidirecional"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=1.0)
+        self.grafo.adicionar_aresta(v['B'], v['C'], peso=1.0)
+        self.grafo.adicionar_aresta(v['C'], v['D'], peso=1.0)
+        self.grafo.adicionar_aresta(v['A'], v['D'], peso=5.0)
+        self.grafo.adicionar_aresta(v['D'], v['E'], peso=1.0)
+
+    def test_direcionado_usa_arestas_reversas(self):
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'A', 'E') == (4.0, ['A', 'B', 'C', 'D', 'E'])
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'E', 'A') == (float('inf'), [])
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'C', 'C') == (0, ['C'])
+
+    def test_mapa_reverso_acompanha_mutacoes(self):
+        v = self.grafo.vertices
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'A', 'D') == (3.0, ['A', 'B', 'C', 'D'])
+
+        self.grafo.remover_aresta(v['B'], v['C'])
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'A', 'D') == (5.0, ['A', 'D'])
+
+        self.grafo.adicionar_aresta(v['E'], v['A'], peso=1.0)
+        assert self.grafo.mapa_adjacencia_reverso['A'] == {'E': self.grafo.mapa_adjacencia['E']['A']}
+        assert Sorting.dijkstra_bidirecional(self.grafo, 'E', 'D') == (6.0, ['E', 'A', 'D'])
+
+    def test_snapshot_csr(self):
+        csr = self.grafo.to_csr()
+        for origem in self.grafo.vertices:
+            for destino in self.grafo.vertices:
+                assert Sorting.dijkstra_bidirecional(csr, origem, destino) == \
+                    Sorting.dijkstra_bidirecional(self.grafo, origem, destino)
+
+    def test_peso_negativo(self):
+        self.grafo.adicionar_aresta(self.grafo.vertices['B'], self.grafo.vertices['E'], peso=-1.0)
+        with pytest.raises(ValueError):
+            Sorting.dijkstra_bidirecional(self.grafo, 'A', 'E')
+
+    def test_grafo_real_mesmas_distancias(self):
+        grafo = HelperTest.carregar_grafo_real()
+        nomes = list(grafo.vertices)[::7]
+        for origem in nomes:
+            for destino in nomes:
+                distancia, caminho = Sorting.dijkstra_bidirecional(grafo, origem, destino)
+                esperado, _ = Sorting.dijkstra(grafo, grafo.vertices[origem], grafo.vertices[destino])
+
+                if esperado == float('inf'):
+                    assert (distancia, caminho) == (esperado, [])
+                    continue
+                HelperTest.assert_distancia_aproximada(distancia, esperado)
+                HelperTest.assert_caminho_valido(grafo, caminho, origem, destino)
+                HelperTest.assert_distancia_aproximada(HelperTest.calcular_distancia_caminho(grafo, caminho), distancia)
+
+
+class TestDijkstraFilasInteiras:
+    """Testes das variantes com bucket queue (Dial) e radix heap e do seletor automático"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=1.5)
+        self.grafo.adicionar_aresta(v['B'], v['C'], peso=1.2)
+        self.grafo.adicionar_aresta(v['A'], v['C'], peso=3.0)
+        self.grafo.adicionar_aresta(v['C'], v['D'], peso=0.0)
+        self.grafo.adicionar_aresta(v['D'], v['A'], peso=2.0)
+
+    @pytest.mark.parametrize('variante', ['dijkstra_dial', 'dijkstra_radix', 'dijkstra_automatico'])
+    def test_mesmo_resultado_que_heap(self, variante):
+        algoritmo = getattr(Sorting, variante)
+        csr = self.grafo.to_csr()
+        for origem in self.grafo.vertices:
+            for destino in self.grafo.vertices:
+                esperado = Sorting.dijkstra(self.grafo, origem, destino)
+                assert algoritmo(self.grafo, origem, destino) == esperado
+                assert algoritmo(csr, origem, destino) == esperado
+
+    def test_perfil_em_cache_e_invalidado(self):
+        perfil = Sorting.perfil_pesos(self.grafo)
+        assert (perfil.fila, perfil.escala, perfil.peso_maximo, perfil.distintos) == ('dial', 10, 30, 5)
+        assert Sorting.perfil_pesos(self.grafo) is perfil
+
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['D'], v['E'], peso=1e6)
+        assert Sorting.perfil_pesos(self.grafo).fila == 'heap'
+        assert Sorting.dijkstra_automatico(self.grafo, 'A', 'E') == Sorting.dijkstra(self.grafo, 'A', 'E')
+
+        self.grafo.remover_aresta(v['D'], v['E'])
+        assert Sorting.perfil_pesos(self.grafo).fila == 'dial'
+
+    def test_pesos_sem_escala_inteira(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['D'], v['E'], peso=0.123456)
+        assert Sorting.perfil_pesos(self.grafo).fila == 'heap'
+        with pytest.raises(ValueError):
+            Sorting.dijkstra_dial(self.grafo, 'A', 'E')
+
+    def test_grafo_real(self):
+        grafo = HelperTest.carregar_grafo_real()
+        assert Sorting.perfil_pesos(grafo).fila == 'dial'
+        nomes = list(grafo.vertices)[::7]
+        for origem in nomes:
+            for destino in nomes:
+                esperado, _ = Sorting.dijkstra(grafo, origem, destino)
+                for algoritmo in (Sorting.dijkstra_dial, Sorting.dijkstra_radix):
+                    distancia, caminho = algoritmo(grafo, origem, destino)
+                    if esperado == float('inf'):
+                        assert caminho == []
+                        continue
+                    HelperTest.assert_distancia_aproximada(distancia, esperado)
+                    HelperTest.assert_caminho_valido(grafo, caminho, origem, destino)
+
+
+class TestIterDijkstra:
+    """Dijkstra sob demanda: um vértice por vez, em distância crescente"""
+
+    @pytest.mark.parametrize('csr', [False, True])
+    def test_mesmas_distancias_que_dijkstra(self, csr):
+        grafo = HelperTest.carregar_grafo_real()
+        g = grafo.to_csr() if csr else grafo
+        percurso = list(Sorting.iter_dijkstra(g, 'casa forte'))
+
+        alcancados = Sorting.breadth_first_search(grafo, grafo.vertices['casa forte'])['niveis'].alcancados
+        assert len(percurso) == len(alcancados)
+        assert [d for _, d, _ in percurso] == sorted(d for _, d, _ in percurso)
+        for vertice, distancia, anterior in percurso[::7]:
+            esperado, caminho = Sorting.dijkstra(grafo, 'casa forte', vertice)
+            HelperTest.assert_distancia_aproximada(distancia, esperado)
+            assert anterior == (caminho[-2] if len(caminho) > 1 else None)
+
+    def test_so_avanca_sob_demanda(self):
+        grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D']:
+            grafo.adicionar_vertice(Vertice(nome))
+        v = grafo.vertices
+        grafo.adicionar_aresta(v['A'], v['B'], peso=1.0)
+        grafo.adicionar_aresta(v['B'], v['C'], peso=2.0)
+        grafo.adicionar_aresta(v['C'], v['D'], peso=-1.0)
+
+        percurso = Sorting.iter_dijkstra(grafo, 'A')
+        # O peso negativo só é encontrado ao expandir C.
+        assert [next(percurso) for _ in range(3)] == [('A', 0, None), ('B', 1.0, 'A'), ('C', 3.0, 'B')]
+        with pytest.raises(ValueError):
+            next(percurso)
+
+
+class TestCaminhosEmLote:
+    """Consultas em lote: uma busca por origem, mesmo resultado do Dijkstra par a par"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        nomes = list(cls.grafo.vertices)
+        cls.pares = [(origem, destino) for origem in nomes[:6] for destino in nomes[::7]]
+        cls.pares += [('boa viagem', 'boa viagem'), ('derby', 'boa viagem'), ('boa viagem', 'derby')]
+
+    @pytest.mark.parametrize('csr', [False, True])
+    def test_mesmo_resultado_que_dijkstra(self, csr):
+        grafo = self.grafo.to_csr() if csr else self.grafo
+        resultados = Sorting.caminhos_em_lote(grafo, self.pares)
+
+        assert len(resultados) == len(self.pares)
+        for (origem, destino), resultado in zip(self.pares, resultados):
+            assert resultado == Sorting.dijkstra(grafo, origem, destino)
+
+    def test_destino_inalcancavel(self):
+        grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C']:
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_aresta(grafo.vertices['A'], grafo.vertices['B'], peso=2.0)
+
+        assert Sorting.caminhos_em_lote(grafo, [('A', 'C'), ('A', 'B'), ('B', 'A')]) == [
+            (float('inf'), []), (2.0, ['A', 'B']), (float('inf'), []),
+        ]
+        assert Sorting.caminhos_em_lote(grafo, []) == []
+
+    def test_vertice_inexistente(self):
+        with pytest.raises(ValueError):
+            Sorting.caminhos_em_lote(self.grafo, [('boa viagem', 'inexistente')])
+        with pytest.raises(ValueError):
+            Sorting.caminhos_em_lote(self.grafo.to_csr(), [('inexistente', 'boa viagem')])
+
+
+class TestCacheArvores:
+    """Árvores de caminhos mínimos em cache, invalidadas quando o grafo muda"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=1.0, tempo=5.0)
+        self.grafo.adicionar_aresta(v['B'], v['C'], peso=1.0, tempo=5.0)
+        self.grafo.adicionar_aresta(v['A'], v['C'], peso=3.0, tempo=1.0)
+
+    def test_consultas_repetidas_usam_a_arvore(self):
+        cache = Sorting.cache_arvores(self.grafo)
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'C') == (2.0, ['A', 'B', 'C'])
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'B') == (1.0, ['A', 'B'])
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'D') == (float('inf'), [])
+        assert (len(cache), cache.faltas, cache.acertos) == (1, 1, 2)
+
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'C', chave_peso='tempo') == (1.0, ['A', 'C'])
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'C', 'bellman_ford') == (2.0, ['A', 'B', 'C'])
+        assert len(cache) == 3
+
+    @pytest.mark.parametrize('mutacao', ['adicionar_aresta', 'remover_aresta', 'adicionar_vertice'])
+    def test_invalidacao(self, mutacao):
+        v = self.grafo.vertices
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'C') == (2.0, ['A', 'B', 'C'])
+
+        if mutacao == 'adicionar_aresta':
+            self.grafo.adicionar_aresta(v['A'], v['C'], peso=0.5)
+            esperado = (0.5, ['A', 'C'])
+        elif mutacao == 'remover_aresta':
+            self.grafo.remover_aresta(v['B'], v['C'])
+            esperado = (3.0, ['A', 'C'])
+        else:
+            self.grafo.adicionar_vertice(Vertice('E'))
+            esperado = (2.0, ['A', 'B', 'C'])
+
+        assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'C') == esperado
+        assert Sorting.cache_arvores(self.grafo).faltas == 2
+        if mutacao == 'adicionar_vertice':
+            assert Sorting.caminho_pela_arvore(self.grafo, 'A', 'E') == (float('inf'), [])
+
+    def test_limite_de_memoria(self):
+        grafo = HelperTest.carregar_grafo_real()
+        cache = Sorting.cache_arvores(grafo)
+        cache.memoria_maxima = 3 * 16 * grafo.ordem
+
+        for origem in ['boa viagem', 'derby', 'casa forte', 'torre']:
+            Sorting.arvore_caminhos(grafo, origem)
+        assert len(cache) == 3
+        assert cache.memoria <= cache.memoria_maxima
+
+        # 'boa viagem' foi a menos usada e saiu primeiro.
+        Sorting.arvore_caminhos(grafo, 'derby')
+        Sorting.arvore_caminhos(grafo, 'boa viagem')
+        assert cache.faltas == 5
+
+    def test_consultas_concorrentes(self):
+        grafo = HelperTest.carregar_grafo_real()
+        cache = Sorting.cache_arvores(grafo)
+        # Espaço para só duas árvores: as threads disputam as mesmas entradas do LRU.
+        cache.memoria_maxima = 2 * 16 * grafo.ordem
+        origens = list(grafo.vertices)[:8]
+        esperado = {o: Sorting.dijkstra(grafo, o, 'derby')[0] for o in origens}
+
+        def consultar(i):
+            return [(o, Sorting.caminho_pela_arvore(grafo, o, 'derby')[0]) for o in origens[i % 4:] * 5]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for resultados in executor.map(consultar, range(16)):
+                for origem, distancia in resultados:
+                    HelperTest.assert_distancia_aproximada(distancia, esperado[origem])
+        assert len(cache) <= 2
+        assert cache.memoria == sum(arvore.bytes for arvore in cache.arvores.values())
+
+    def test_grafo_com_cache_pode_ser_serializado(self):
+        csr = HelperTest.carregar_grafo_real().to_csr()
+        Sorting.arvore_caminhos(csr, 'derby')
+        copia = pickle.loads(pickle.dumps(csr))
+        assert Sorting.caminho_pela_arvore(copia, 'derby', 'boa viagem') == \
+            Sorting.caminho_pela_arvore(csr, 'derby', 'boa viagem')
+
+    def test_erros(self):
+        v = self.grafo.vertices
+        with pytest.raises(ValueError):
+            Sorting.arvore_caminhos(self.grafo, 'A', algoritmo='floyd')
+        with pytest.raises(ValueError):
+            Sorting.arvore_caminhos(self.grafo, 'Z')
+        self.grafo.adicionar_aresta(v['C'], v['A'], peso=-4.0)
+        with pytest.raises(ValueError):
+            Sorting.arvore_caminhos(self.grafo, 'A')
+        with pytest.raises(ValueError):
+            Sorting.arvore_caminhos(self.grafo, 'A', 'bellman_ford')
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.algorithms import CicloNegativoError, Sorting
+from src.graphs.graph import GrafoDirecionado, Vertice
+from tests.base import HelperTest
+
+
+class TestFloydWarshallGrafoSimples:
+    """Testes do Floyd–Warshall vetorizado em grafos pequenos e controlados"""
+
+    def setup_method(self):
+        self.grafo = GrafoDirecionado()
+        for nome in ['A', 'B', 'C', 'D', 'E']:
+            self.grafo.adicionar_vertice(Vertice(nome))
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['A'], v['B'], peso=4.0)
+        self.grafo.adicionar_aresta(v['A'], v['C'], peso=2.0)
+        self.grafo.adicionar_aresta(v['C'], v['B'], peso=-1.0)
+        self.grafo.adicionar_aresta(v['B'], v['D'], peso=3.0)
+        self.grafo.adicionar_aresta(v['D'], v['A'], peso=-2.0)
+
+    def test_mesmo_resultado_que_johnson(self):
+        matriz = Sorting.floyd_warshall(self.grafo)
+        esperado = Sorting.johnson(self.grafo, anteriores=True, processos=1)
+
+        assert (matriz.distancias == esperado.distancias).all()
+        assert matriz.caminho_mais_curto('D', 'B') == (-1.0, ['D', 'A', 'C', 'B'])
+        assert matriz.caminho_mais_curto('A', 'E') == (float('inf'), [])
+        assert matriz.caminho_mais_curto('E', 'E') == (0.0, ['E'])
+        assert matriz.matriz_distancias(['A', 'E'], ['D', 'E']) == [[4.0, float('inf')], [float('inf'), 0.0]]
+
+    def test_ciclo_negativo(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['B'], v['A'], peso=-2.0)
+        with pytest.raises(CicloNegativoError) as erro:
+            Sorting.floyd_warshall(self.grafo)
+        ciclo = erro.value.ciclo
+        assert sum(self.grafo.obter_peso(u, w) for u, w in zip(ciclo, ciclo[1:] + ciclo[:1])) < 0
+
+    def test_limite_cai_para_dijkstra(self, monkeypatch):
+        def nao_usar(*args, **kwargs):
+            raise AssertionError("acima do limite o Floyd–Warshall não deveria rodar")
+
+        monkeypatch.setattr(Sorting, 'floyd_warshall', nao_usar)
+        matriz = Sorting.todos_os_pares(self.grafo, limite=3)
+        assert matriz.caminho_mais_curto('D', 'B') == (-1.0, ['D', 'A', 'C', 'B'])
+
+
+class TestFloydWarshallGrafoReal:
+    """Compara a matriz de todos os pares ao Dijkstra no grafo dos bairros"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        cls.matriz = Sorting.floyd_warshall(cls.grafo)
+
+    def test_distancias(self):
+        HelperTest.assert_distancias_como_dijkstra(self.grafo, self.matriz.caminho_mais_curto)
+
+    def test_todos_os_pares_usa_floyd_warshall(self, monkeypatch):
+        monkeypatch.setattr(Sorting, 'johnson', None)
+        assert (Sorting.todos_os_pares(self.grafo).distancias == self.matriz.distancias).all()
+
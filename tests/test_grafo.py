@@ -0,0 +1,177 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.graph import Grafo, GrafoDirecionado, Vertice
+from src.graphs.algorithms import Sorting
+from tests.base import HelperTest
+
+
+class TestArestasEmLote:
+    """Testes da inserção de arestas em lote"""
+
+    def test_mesma_ordem_que_insercao_individual(self):
+        """A ordem dos vizinhos deve ser igual à de adicionar_aresta"""
+        arestas = [('A', 'D', 1.0), ('A', 'B', 2.0), ('C', 'A', 3.0), ('B', 'C', 4.0), ('E', 'A', 5.0)]
+
+        individual, v = HelperTest.criar_grafo_com_vertices()
+        for origem, destino, peso in arestas:
+            individual.adicionar_aresta(v[origem.lower()], v[destino.lower()], peso=peso)
+
+        lote, _ = HelperTest.criar_grafo_com_vertices()
+        adicionadas = lote.adicionar_arestas_em_lote(arestas)
+
+        assert adicionadas == len(arestas)
+        assert lote.tamanho == individual.tamanho
+        for nome in individual.vertices:
+            assert [x.nome for x in lote.vertices[nome].vizinhos] == \
+                [x.nome for x in individual.vertices[nome].vizinhos]
+            assert lote.adjacencias[nome] == individual.adjacencias[nome]
+
+        assert Sorting.breadth_first_search(lote, lote.vertices['A']) == Sorting.breadth_first_search(individual, v['a'])
+        assert Sorting.depth_first_search(lote, v['a']) == Sorting.depth_first_search(individual, v['a'])
+
+    def test_deduplica_e_ignora_vertices_inexistentes(self):
+        grafo, v = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(v['a'], v['b'], peso=1.0)
+
+        grafo.adicionar_arestas_em_lote([
+            (v['a'], v['b'], 7.0, {'tipo': 'rua'}),
+            ('B', 'A'),
+            ('A', 'Z', 1.0),
+        ])
+
+        assert grafo.obter_vizinhos('A') == ['B']
+        assert grafo.obter_vizinhos('B') == ['A']
+        assert grafo.obter_peso('A', 'B') == 1.0
+        assert grafo.tamanho == 1
+
+    def test_lote_direcionado(self):
+        grafo = GrafoDirecionado()
+        for nome in ['X', 'Y', 'Z']:
+            grafo.adicionar_vertice(Vertice(nome))
+
+        grafo.adicionar_arestas_em_lote([('X', 'Z', 2.0, {'voos': 3}), ('X', 'Y', 1.0)])
+
+        assert grafo.obter_vizinhos('X') == ['Y', 'Z']
+        assert grafo.obter_vizinhos('Z') == []
+        assert grafo.obter_informacoes_aresta('X', 'Z') == {'peso': 2.0, 'voos': 3}
+        assert grafo.obter_peso('Z', 'X') == float('inf')
+
+
+class TestMapaAdjacencia:
+    """Testes do mapa de adjacência unificado e das visões de compatibilidade"""
+
+    def setup_method(self):
+        self.grafo, self.v = HelperTest.criar_grafo_com_vertices()
+        self.grafo.adicionar_aresta(self.v['c'], self.v['a'], peso=2.0, tipo='rua')
+        self.grafo.adicionar_aresta(self.v['a'], self.v['b'], peso=1.0)
+
+    def test_id_compartilhado_entre_sentidos(self):
+        mapa = self.grafo.mapa_adjacencia
+        assert list(mapa['A']) == ['B', 'C']
+        assert mapa['A']['C'] == mapa['C']['A']
+        assert self.grafo.obter_peso('C', 'A') == self.grafo.obter_peso('A', 'C') == 2.0
+
+    def test_visoes_de_compatibilidade(self):
+        assert dict(self.grafo.arestas) == {
+            ('A', 'B'): {'peso': 1.0},
+            ('A', 'C'): {'peso': 2.0, 'tipo': 'rua'},
+        }
+        assert ('C', 'A') not in self.grafo.arestas
+        assert self.grafo.adjacencias['A'] == {'B', 'C'}
+        assert [vizinho.nome for vizinho in self.v['a'].vizinhos] == ['B', 'C']
+        assert self.v['b'].esta_conectado_a(self.v['a'])
+
+    def test_remover_aresta(self):
+        assert self.grafo.remover_aresta(self.v['c'], self.v['a'])
+        assert not self.grafo.remover_aresta(self.v['c'], self.v['a'])
+        assert self.grafo.tamanho == 1
+        assert self.grafo.obter_vizinhos('A') == ['B']
+        assert self.grafo.obter_vizinhos('C') == []
+
+    def test_mutadores_obsoletos_do_vertice(self):
+        with pytest.warns(DeprecationWarning):
+            assert self.v['a'].adicionar_vizinho(self.v['d'])
+        with pytest.warns(DeprecationWarning):
+            assert not self.v['a'].adicionar_vizinho(self.v['d'])
+        assert self.grafo.obter_vizinhos('D') == ['A']
+
+        with pytest.warns(DeprecationWarning):
+            assert self.v['a'].remover_vizinho(self.v['b'])
+        assert [vizinho.nome for vizinho in self.v['a'].vizinhos] == ['C', 'D']
+
+        with pytest.warns(DeprecationWarning):
+            self.v['a'].limpar_vizinhos()
+        assert self.v['a'].vizinhos == []
+        assert self.grafo.tamanho == 0
+
+        with pytest.raises(ValueError), pytest.warns(DeprecationWarning):
+            Vertice('solto').adicionar_vizinho(self.v['a'])
+
+    def test_vertice_em_dois_grafos(self):
+        outro = Grafo()
+        with pytest.raises(ValueError):
+            outro.adicionar_vertice(self.v['a'])
+        assert 'A' not in outro.vertices
+        assert not self.grafo.adicionar_vertice(self.v['a'])
+
+    def test_grau(self):
+        grafo, v = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(v['a'], v['b'])
+        grafo.adicionar_aresta(v['a'], v['c'])
+
+        for g in (grafo, grafo.to_csr()):
+            assert [g.grau(nome) for nome in 'ABCDE'] == [2, 1, 1, 0, 0]
+        assert v['a'].grau == len(v['a'].vizinhos) == 2
+        assert Vertice('Z').grau == 0
+        with pytest.raises(ValueError):
+            grafo.grau('Z')
+
+
+class TestColunasArestas:
+    """Testes do armazenamento colunar dos atributos das arestas"""
+
+    def test_colunas_tipadas_e_registro_sob_demanda(self):
+        grafo = GrafoDirecionado()
+        for nome in ['X', 'Y', 'Z']:
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_aresta(grafo.vertices['X'], grafo.vertices['Y'], peso=10.0, voos=3, distancia=10.0, cidade='Recife')
+        grafo.adicionar_aresta(grafo.vertices['Y'], grafo.vertices['Z'], peso=5.0, voos=1, distancia=5.0, cidade='Recife')
+
+        colunas = grafo.colunas_arestas.colunas
+        assert colunas['voos'].typecode == 'q'
+        assert colunas['distancia'].typecode == 'd'
+        assert colunas['cidade'][0] is colunas['cidade'][1]
+        assert grafo.obter_informacoes_aresta('X', 'Y') == {'peso': 10.0, 'voos': 3, 'distancia': 10.0, 'cidade': 'Recife'}
+
+    def test_atributo_ausente_e_reuso_de_id(self):
+        grafo, v = HelperTest.criar_grafo_com_vertices()
+        grafo.adicionar_aresta(v['a'], v['b'], peso=1.0, tipo='rua')
+        grafo.adicionar_aresta(v['b'], v['c'], peso=2.0)
+        grafo.remover_aresta(v['a'], v['b'])
+        grafo.adicionar_aresta(v['d'], v['e'], peso=3.0, id_rua=7)
+
+        assert grafo.obter_informacoes_aresta('B', 'C') == {'peso': 2.0}
+        assert grafo.obter_informacoes_aresta('E', 'D') == {'peso': 3.0, 'id_rua': 7}
+        assert grafo.obter_informacoes_aresta('A', 'B') == {}
+        assert len(grafo.colunas_arestas) == grafo.tamanho == 2
+
+    def test_coluna_tipada_so_com_o_tipo_exato(self):
+        grafo = GrafoDirecionado()
+        for nome in ['X', 'Y', 'Z', 'W']:
+            grafo.adicionar_vertice(Vertice(nome))
+        v = grafo.vertices
+        grafo.adicionar_aresta(v['X'], v['Y'], voos=3, distancia=10.0)
+        grafo.adicionar_aresta(v['Y'], v['Z'], voos=2 ** 70, distancia=5)
+        grafo.adicionar_aresta(v['Z'], v['W'], voos=True, distancia=2.5)
+
+        colunas = grafo.colunas_arestas.colunas
+        assert type(colunas['voos']) is list
+        assert type(colunas['distancia']) is list
+        assert grafo.obter_informacoes_aresta('Y', 'Z') == {'peso': 1.0, 'voos': 2 ** 70, 'distancia': 5}
+        assert type(grafo.obter_informacoes_aresta('Y', 'Z')['distancia']) is int
+        assert grafo.obter_informacoes_aresta('Z', 'W')['voos'] is True
+        assert grafo.obter_informacoes_aresta('X', 'Y') == {'peso': 1.0, 'voos': 3, 'distancia': 10.0}
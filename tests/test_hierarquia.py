@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.algorithms import Sorting
+from src.graphs.cache import carregar_hierarquia, salvar_hierarquia
+from src.graphs.graph import Grafo, Vertice
+from src.graphs.hierarquia import HierarquiaContracao
+from tests.base import HelperTest
+
+
+class TestHierarquiaGrafoSimples:
+    """Testes das Contraction Hierarchies em grafos pequenos e controlados"""
+
+    def setup_method(self):
+        self.grafo = HelperTest.criar_grafo_direcionado_simples()
+
+    @pytest.mark.parametrize('limite_testemunha', [1, 50])
+    def test_mesmo_resultado_que_dijkstra(self, limite_testemunha):
+        hierarquia = HierarquiaContracao.construir(self.grafo, limite_testemunha)
+        HelperTest.assert_mesmo_resultado_que_dijkstra(self.grafo, hierarquia.caminho_mais_curto, hierarquia.distancia)
+
+    def test_atalhos_desempacotados(self):
+        grafo = Grafo()
+        nomes = [f"v{i}" for i in range(8)]
+        for nome in nomes:
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_arestas_em_lote([(a, b, 1.0) for a, b in zip(nomes, nomes[1:])])
+
+        hierarquia = HierarquiaContracao.construir(grafo)
+
+        assert hierarquia.num_atalhos > 0
+        assert hierarquia.caminho_mais_curto('v0', 'v7') == (7.0, nomes)
+        assert hierarquia.caminho_mais_curto('v7', 'v0') == (7.0, nomes[::-1])
+
+    def test_vertice_inexistente(self):
+        hierarquia = HierarquiaContracao.construir(self.grafo)
+        with pytest.raises(ValueError):
+            hierarquia.caminho_mais_curto('A', 'Z')
+
+    def test_pesos_negativos(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['E'], v['F'], peso=-1.0)
+        with pytest.raises(ValueError):
+            HierarquiaContracao.construir(self.grafo)
+
+
+class TestHierarquiaGrafoReal:
+    """Compara as consultas da hierarquia ao Dijkstra no grafo dos bairros"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        cls.hierarquia = HierarquiaContracao.construir(cls.grafo)
+
+    def test_distancias(self):
+        HelperTest.assert_distancias_como_dijkstra(self.grafo, self.hierarquia.caminho_mais_curto)
+
+    def test_persistencia(self, tmp_path):
+        arquivo = tmp_path / 'recife.ch.npz'
+        fonte = tmp_path / 'grafo.npz'
+        fonte.write_bytes(b'v1')
+        salvar_hierarquia(self.hierarquia, arquivo, [str(fonte)])
+
+        copia = carregar_hierarquia(arquivo, [str(fonte)])
+        assert copia.nomes == self.hierarquia.nomes
+        assert copia.nivel == self.hierarquia.nivel
+        assert copia.num_atalhos == self.hierarquia.num_atalhos
+        assert copia.caminho_mais_curto('casa forte', 'boa viagem') == \
+            self.hierarquia.caminho_mais_curto('casa forte', 'boa viagem')
+
+        fonte.write_bytes(b'v2 alterado')
+        assert carregar_hierarquia(arquivo, [str(fonte)]) is None
+        assert carregar_hierarquia(tmp_path / 'inexistente.npz') is None
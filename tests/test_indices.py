@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import ARESTAS_FILE, BAIRROS_FILE
+from src.graphs.cache import caminho_cache, carregar_grafo_binario, salvar_grafo_binario
+from src.graphs.graph import GrafoDirecionado, Vertice
+from src.graphs.indices import IndiceNomes, IndiceSugestoes, normalizar_nome
+from tests.base import HelperTest
+
+
+class TestIndiceNomes:
+
+    def test_resolve_variantes(self):
+        indice = IndiceNomes(['boa viagem', 'varzea'])
+
+        assert indice.resolver('boa viagem') == 'boa viagem'
+        assert indice.resolver('Boa Viagem ') == 'boa viagem'
+        assert indice.resolver('VÁRZEA') == 'varzea'
+        assert indice.resolver('pina') is None
+        assert 'Várzea' in indice
+
+    def test_alias_resolve_sem_normalizar(self):
+        indice = IndiceNomes(['varzea'])
+        indice.adicionar_alias('Várzea', 'varzea')
+        normalizar_nome.cache_clear()
+
+        assert indice.resolver('Várzea') == 'varzea'
+        assert normalizar_nome.cache_info().misses == 0
+
+    def test_grafo_atualiza_indice(self):
+        grafo = GrafoDirecionado()
+        grafo.adicionar_vertice(Vertice('SEA'))
+        assert grafo.resolver_vertice('sea') == 'SEA'
+
+        grafo.adicionar_vertice(Vertice('JFK'))
+        assert grafo.resolver_vertice('jfk') == 'JFK'
+        assert grafo.resolver_vertice('LAX') is None
+
+
+class TestIndiceSugestoes:
+
+    def setup_method(self):
+        self.indice = IndiceSugestoes(['boa viagem', 'boa vista', 'Várzea', 'torre', 'torreao', 'pina'])
+
+    def test_prefixo_antes_de_trigramas(self):
+        assert self.indice.sugerir('boa', 5) == ['boa viagem', 'boa vista']
+        assert self.indice.sugerir('TORRE', 3) == ['torre', 'torreao']
+        assert self.indice.sugerir('varz', 1) == ['Várzea']
+
+    def test_trigramas_toleram_erros(self):
+        assert self.indice.sugerir('viagen', 3) == ['boa viagem']
+        assert self.indice.sugerir('torrao', 1) == ['torreao']
+        assert self.indice.sugerir('xyz', 3) == []
+
+    def test_limite_k(self):
+        assert self.indice.sugerir('boa', 1) == ['boa viagem']
+        assert self.indice.sugerir('boa', 0) == []
+
+    def test_indice_do_grafo_acompanha_novos_vertices(self):
+        grafo = GrafoDirecionado()
+        grafo.adicionar_vertice(Vertice('SEA'))
+        assert grafo.sugerir_vertices('se') == ['SEA']
+
+        grafo.adicionar_vertice(Vertice('SEB'))
+        assert grafo.sugerir_vertices('se') == ['SEA', 'SEB']
+
+
+class TestIndiceNomesGrafoReal:
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+
+    def test_aliases_do_csv(self):
+        assert self.grafo.resolver_vertice('Várzea') == 'varzea'
+        assert self.grafo.indice_nomes.aliases.get('Várzea') == 'varzea'
+
+    def test_aliases_sobrevivem_ao_cache(self, tmp_path):
+        fontes = [str(BAIRROS_FILE), str(ARESTAS_FILE)]
+        arquivo = caminho_cache(fontes, 'bairros', diretorio=tmp_path)
+        salvar_grafo_binario(self.grafo, arquivo, fontes)
+
+        copia = carregar_grafo_binario(arquivo, fontes)
+
+        assert copia.indice_nomes.aliases == self.grafo.indice_nomes.aliases
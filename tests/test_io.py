@@ -0,0 +1,281 @@
+import sys
+import time
+from pathlib import Path
+import pytest
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import ARESTAS_FILE, BAIRROS_FILE, DATASET_2_CSV
+from src.graphs.graph import Grafo, GrafoDirecionado, Vertice
+from src.graphs import cache, io
+from src.graphs.algorithms import Sorting
+from src.graphs.cache import caminho_cache, carregar_grafo_binario, salvar_grafo_binario
+from src.graphs.io import carregar_dataset_parte2, carregar_grafo, normalizar_serie, normalizar_texto
+from src.graphs.rotulos import OraculoHubs
+from tests.base import HelperTest
+
+
+ROTAS = [
+    # origem, destino, cidade origem, cidade destino, passageiros, voos, distância
+    ('SEA', 'RDM', 'Seattle, WA', 'Bend, OR', 120, 3, 228.0),
+    ('SEA', 'GEG', 'Seattle, WA', 'Spokane, WA', 300, 5, 224.0),
+    ('GEG', 'RDM', 'Spokane, WA', 'Bend, OR', 40, 1, 300.0),
+    ('JFK', 'LAX', 'New York, NY', 'Los Angeles, CA', 900, 6, 2475.0),
+]
+
+
+def escrever_csv_rotas(caminho: Path, rotas=ROTAS) -> Path:
+    pd.DataFrame(
+        [
+            {
+                'Origin_airport': o, 'Destination_airport': d, 'Origin_city': co, 'Destination_city': cd,
+                'Passengers': p, 'Seats': p * 2, 'Flights': f, 'Distance': dist, 'Fly_date': '2008-01-01',
+            }
+            for o, d, co, cd, p, f, dist in rotas
+        ]
+    ).to_csv(caminho, index=False)
+    return caminho
+
+
+def carregar_dataset_parte2_por_linha(caminho_csv: str) -> GrafoDirecionado:
+    """Referência com iterrows, equivalente ao carregador antes da vetorização"""
+    grafo = GrafoDirecionado()
+    dados = pd.read_csv(caminho_csv)
+    for _, linha in dados.iterrows():
+        for codigo, cidade in ((linha['Origin_airport'], linha['Origin_city']), (linha['Destination_airport'], linha['Destination_city'])):
+            if codigo not in grafo.vertices:
+                vertice = Vertice(codigo)
+                vertice.atributos['rotulo'] = cidade
+                vertice.atributos['cidade'] = cidade
+                grafo.adicionar_vertice(vertice)
+        grafo.adicionar_aresta(
+            grafo.vertices[linha['Origin_airport']],
+            grafo.vertices[linha['Destination_airport']],
+            peso=float(linha['Distance']),
+            passageiros=int(linha['Passengers']),
+            voos=int(linha['Flights']),
+            distancia=float(linha['Distance'])
+        )
+    return grafo
+
+
+class TestCarregamentoVetorizado:
+
+    def test_normalizar_serie_igual_ao_escalar(self):
+        serie = pd.Series(['Boa Viagem ', 'CASA AMARELA', 'Várzea', 'Boa Viagem ', None])
+        esperado = [normalizar_texto(valor) for valor in serie.dropna()]
+        assert normalizar_serie(serie).dropna().tolist() == esperado
+
+    def test_dataset_parte2(self, tmp_path):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv')
+        grafo = carregar_dataset_parte2(str(caminho), usar_cache=False)
+
+        assert list(grafo.vertices) == ['SEA', 'GEG', 'JFK', 'RDM', 'LAX']
+        assert grafo.vertices['RDM'].atributos['cidade'] == 'Bend, OR'
+        assert grafo.tamanho == 4
+        assert grafo.obter_vizinhos('SEA') == ['GEG', 'RDM']
+
+        informacoes = grafo.obter_informacoes_aresta('JFK', 'LAX')
+        assert informacoes == {'peso': 2475.0, 'passageiros': 900, 'voos': 6, 'distancia': 2475.0}
+        assert type(informacoes['passageiros']) is int
+
+    def test_igual_a_carga_por_linha(self, tmp_path):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv')
+        grafo = carregar_dataset_parte2(str(caminho), usar_cache=False)
+        referencia = carregar_dataset_parte2_por_linha(str(caminho))
+
+        assert set(grafo.vertices) == set(referencia.vertices)
+        assert dict(grafo.arestas) == dict(referencia.arestas)
+
+
+class TestCarregamentoEmBlocos:
+
+    ROTAS_REPETIDAS = ROTAS + [
+        ('SEA', 'RDM', 'Seattle, WA', 'Bend, OR', 80, 2, 228.0),
+        ('JFK', 'LAX', 'New York, NY', 'Los Angeles, CA', 100, 1, 2475.0),
+        ('LAX', 'SEA', 'Los Angeles, CA', 'Seattle, WA', 10, 1, 954.0),
+        ('SEA', 'RDM', 'Seattle, WA', 'Bend, OR', 5, 1, 228.0),
+    ]
+
+    def test_agrega_rotas_entre_blocos(self, tmp_path):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv', self.ROTAS_REPETIDAS)
+        grafo = carregar_dataset_parte2(str(caminho), usar_cache=False, tamanho_bloco=3)
+
+        assert grafo.tamanho == 5
+        assert grafo.obter_informacoes_aresta('SEA', 'RDM') == {'peso': 228.0, 'passageiros': 205, 'voos': 6, 'distancia': 228.0}
+        assert grafo.obter_informacoes_aresta('JFK', 'LAX')['passageiros'] == 1000
+
+    def test_mesmos_vertices_da_leitura_completa(self, tmp_path):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv', self.ROTAS_REPETIDAS)
+        em_blocos = carregar_dataset_parte2(str(caminho), usar_cache=False, tamanho_bloco=2)
+        completo = carregar_dataset_parte2(str(caminho), usar_cache=False)
+
+        assert list(em_blocos.vertices) == list(completo.vertices)
+        assert em_blocos.mapa_adjacencia.keys() == completo.mapa_adjacencia.keys()
+        assert all(em_blocos.obter_vizinhos(n) == completo.obter_vizinhos(n) for n in completo.vertices)
+
+
+class TestAgregacaoRotas:
+
+    ROTAS_REPETIDAS = TestCarregamentoEmBlocos.ROTAS_REPETIDAS
+
+    @pytest.mark.parametrize("tamanho_bloco", [None, 1, 3])
+    def test_padrao_nao_depende_dos_blocos(self, tmp_path, tamanho_bloco):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv', self.ROTAS_REPETIDAS)
+        grafo = carregar_dataset_parte2(str(caminho), usar_cache=False, tamanho_bloco=tamanho_bloco)
+
+        assert grafo.obter_informacoes_aresta('SEA', 'RDM') == {'peso': 228.0, 'passageiros': 205, 'voos': 6, 'distancia': 228.0}
+        assert grafo.obter_informacoes_aresta('JFK', 'LAX')['passageiros'] == 1000
+
+    @pytest.mark.parametrize("tamanho_bloco", [None, 1, 3])
+    def test_redutores_configuraveis(self, tmp_path, tamanho_bloco):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv', self.ROTAS_REPETIDAS)
+        grafo = carregar_dataset_parte2(
+            str(caminho), usar_cache=False, tamanho_bloco=tamanho_bloco,
+            agregacao={'passageiros': 'mean', 'voos': 'max', 'distancia': 'min'},
+        )
+
+        informacoes = grafo.obter_informacoes_aresta('SEA', 'RDM')
+        assert informacoes['passageiros'] == pytest.approx(205 / 3)
+        assert informacoes['voos'] == 3
+        assert informacoes['distancia'] == informacoes['peso'] == 228.0
+        assert grafo.obter_informacoes_aresta('JFK', 'LAX')['voos'] == 6
+
+    def test_redutor_invalido(self, tmp_path):
+        caminho = escrever_csv_rotas(tmp_path / 'rotas.csv')
+        with pytest.raises(ValueError):
+            carregar_dataset_parte2(str(caminho), usar_cache=False, agregacao={'voos': 'mediana'})
+        with pytest.raises(ValueError):
+            carregar_dataset_parte2(str(caminho), usar_cache=False, agregacao={'assentos': 'sum'})
+
+
+class TestCacheBinario:
+
+    def test_ida_e_volta_grafo_real(self, tmp_path):
+        grafo = HelperTest.carregar_grafo_real()
+        fontes = [str(BAIRROS_FILE), str(ARESTAS_FILE)]
+        arquivo = caminho_cache(fontes, 'bairros', diretorio=tmp_path)
+
+        assert salvar_grafo_binario(grafo, arquivo, fontes)
+        copia = carregar_grafo_binario(arquivo, fontes)
+
+        assert list(copia.vertices) == list(grafo.vertices)
+        assert copia.mapa_adjacencia == grafo.mapa_adjacencia
+        assert dict(copia.arestas) == dict(grafo.arestas)
+        assert copia.vertices['boa viagem'].atributos == grafo.vertices['boa viagem'].atributos
+        assert copia.caminho_mais_curto_dijkstra('casa forte', 'boa viagem') == \
+            grafo.caminho_mais_curto_dijkstra('casa forte', 'boa viagem')
+
+    def test_invalida_quando_fonte_muda(self, tmp_path):
+        csv = escrever_csv_rotas(tmp_path / 'rotas.csv')
+        grafo = carregar_dataset_parte2(str(csv), usar_cache=False)
+        arquivo = caminho_cache([str(csv)], 'aeroportos', diretorio=tmp_path)
+        salvar_grafo_binario(grafo, arquivo, [str(csv)])
+
+        copia = carregar_grafo_binario(arquivo, [str(csv)])
+        assert copia.direcionado
+        assert dict(copia.arestas) == dict(grafo.arestas)
+
+        escrever_csv_rotas(csv, ROTAS[:2])
+        assert carregar_grafo_binario(arquivo, [str(csv)]) is None
+
+    def test_carregar_grafo_usa_o_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path)
+        grafo = carregar_grafo(str(BAIRROS_FILE), str(ARESTAS_FILE))
+        assert grafo.arquivo_cache is not None
+        assert Path(grafo.arquivo_cache).parent == tmp_path
+
+        def nao_reconstruir(*args, **kwargs):
+            raise AssertionError("o grafo deveria vir do cache")
+
+        monkeypatch.setattr(io, '_construir_grafo_bairros', nao_reconstruir)
+        copia = carregar_grafo(str(BAIRROS_FILE), str(ARESTAS_FILE))
+        assert copia.arquivo_cache == grafo.arquivo_cache
+        assert copia.mapa_adjacencia == grafo.mapa_adjacencia
+        assert dict(copia.arestas) == dict(grafo.arestas)
+
+    @pytest.mark.parametrize('carregar, sufixo, alvo, construtor, consultar', [
+        (lambda g: io.carregar_marcos(g, k=3), 'marcos_distante_3', Sorting, 'calcular_tabelas_marcos',
+         lambda g, tabelas, o, d: Sorting.a_estrela_marcos(g, o, d, tabelas)),
+        (io.carregar_oraculo, 'hubs', OraculoHubs, 'construir', lambda g, oraculo, o, d: oraculo.caminho_mais_curto(o, d)),
+        (io.carregar_matriz, 'apsp', Sorting, 'todos_os_pares', lambda g, matriz, o, d: matriz.caminho_mais_curto(o, d)),
+    ], ids=['marcos', 'oraculo', 'matriz'])
+    def test_estrutura_derivada_ao_lado_do_cache(self, tmp_path, monkeypatch, carregar, sufixo, alvo, construtor, consultar):
+        grafo = HelperTest.carregar_grafo_real_com_cache(tmp_path)
+        estrutura = carregar(grafo)
+        assert (tmp_path / f"{Path(grafo.arquivo_cache).stem}.{sufixo}.npz").exists()
+
+        def nao_reconstruir(*args, **kwargs):
+            raise AssertionError("a estrutura deveria vir do cache")
+
+        monkeypatch.setattr(alvo, construtor, nao_reconstruir)
+        copia = carregar(grafo)
+        assert copia.nomes == estrutura.nomes
+        assert consultar(grafo, copia, 'casa forte', 'boa viagem') == consultar(grafo, estrutura, 'casa forte', 'boa viagem')
+
+        monkeypatch.undo()
+        grafo.adicionar_vertice(Vertice('novo bairro'))
+        assert grafo.arquivo_cache is None
+        assert len(carregar(grafo).nomes) == grafo.ordem
+
+    def test_estruturas_derivadas_nao_sobrevivem_a_alteracoes(self, tmp_path):
+        grafo = Grafo()
+        for nome in ('a', 'b', 'c'):
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_aresta(grafo.vertices['a'], grafo.vertices['b'], peso=1.0)
+        grafo.adicionar_aresta(grafo.vertices['b'], grafo.vertices['c'], peso=1.0)
+        arquivo = str(caminho_cache(['caminho.csv'], 'caminho', diretorio=tmp_path))
+        salvar_grafo_binario(grafo, arquivo)
+        grafo.arquivo_cache = arquivo
+
+        assert io.carregar_matriz(grafo).distancia('a', 'c') == 2.0
+        assert io.carregar_oraculo(grafo).distancia('a', 'c') == 2.0
+
+        grafo.adicionar_aresta(grafo.vertices['a'], grafo.vertices['c'], peso=0.5)
+        assert grafo.arquivo_cache is None
+        assert io.carregar_matriz(grafo).distancia('a', 'c') == 0.5
+        assert io.carregar_oraculo(grafo).distancia('a', 'c') == 0.5
+
+        # O cache antigo continua no disco, mas só vale para o grafo salvo.
+        copia = carregar_grafo_binario(arquivo)
+        copia.arquivo_cache = arquivo
+        assert io.carregar_matriz(copia).distancia('a', 'c') == 2.0
+
+    def test_atributo_com_tipos_misturados_avisa(self, tmp_path):
+        grafo = Grafo()
+        for nome in ('a', 'b', 'c'):
+            grafo.adicionar_vertice(Vertice(nome))
+        grafo.adicionar_aresta(grafo.vertices['a'], grafo.vertices['b'], rotulo='x')
+        grafo.adicionar_aresta(grafo.vertices['b'], grafo.vertices['c'], rotulo=(1, 2))
+        arquivo = tmp_path / 'misto.npz'
+
+        with pytest.warns(RuntimeWarning, match="'rotulo'"):
+            assert not salvar_grafo_binario(grafo, arquivo)
+        assert not arquivo.exists()
+
+    def test_arquivo_de_outro_tipo_e_ignorado(self, tmp_path):
+        grafo = HelperTest.carregar_grafo_real_com_cache(tmp_path)
+        assert cache.carregar_matriz_distancias(grafo.arquivo_cache) is None
+        assert carregar_grafo_binario(grafo.arquivo_cache) is not None
+
+    def test_opcoes_mudam_o_arquivo(self, tmp_path):
+        assert caminho_cache(['a.csv'], 'x', {'modo': 1}, tmp_path) != caminho_cache(['a.csv'], 'x', {'modo': 2}, tmp_path)
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not DATASET_2_CSV.exists(), reason="usa_airport_dataset.csv não disponível")
+def test_benchmark_carga_dataset_parte2():
+    inicio = time.perf_counter()
+    grafo = carregar_dataset_parte2(str(DATASET_2_CSV), usar_cache=False)
+    tempo_vetorizado = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    referencia = carregar_dataset_parte2_por_linha(str(DATASET_2_CSV))
+    tempo_por_linha = time.perf_counter() - inicio
+
+    print(f"\nCarga vetorizada: {tempo_vetorizado:.3f}s | iterrows: {tempo_por_linha:.3f}s "
+          f"| speedup: {tempo_por_linha / tempo_vetorizado:.1f}x")
+
+    assert grafo.tamanho == referencia.tamanho
+    assert tempo_vetorizado < tempo_por_linha
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphs.algorithms import Sorting
+from src.graphs.rotulos import OraculoHubs
+from tests.base import HelperTest
+
+
+class TestOraculoGrafoSimples:
+    """Testes do oráculo de distâncias 2-hop em grafos pequenos e controlados"""
+
+    def setup_method(self):
+        self.grafo = HelperTest.criar_grafo_direcionado_simples()
+        self.oraculo = OraculoHubs.construir(self.grafo)
+
+    def test_mesmo_resultado_que_dijkstra(self):
+        HelperTest.assert_mesmo_resultado_que_dijkstra(self.grafo, self.oraculo.caminho_mais_curto, self.oraculo.distancia)
+
+    def test_matriz_distancias(self):
+        matriz = self.oraculo.matriz_distancias(['A', 'E'], ['A', 'D', 'E'])
+        assert matriz == [[0, 4.0, 5.0], [float('inf'), float('inf'), 0]]
+
+    def test_vertice_inexistente(self):
+        with pytest.raises(ValueError):
+            self.oraculo.distancia('A', 'Z')
+
+    def test_pesos_negativos(self):
+        v = self.grafo.vertices
+        self.grafo.adicionar_aresta(v['E'], v['F'], peso=-1.0)
+        with pytest.raises(ValueError):
+            OraculoHubs.construir(self.grafo)
+
+
+class TestOraculoGrafoReal:
+    """Compara o oráculo ao Dijkstra no grafo dos bairros"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.grafo = HelperTest.carregar_grafo_real()
+        cls.oraculo = OraculoHubs.construir(cls.grafo)
+
+    def test_distancias(self):
+        HelperTest.assert_distancias_como_dijkstra(self.grafo, self.oraculo.caminho_mais_curto)
+
+        nomes = list(self.grafo.vertices)[::5]
+        assert self.oraculo.matriz_distancias(nomes, nomes) == \
+            [[self.oraculo.distancia(origem, destino) for destino in nomes] for origem in nomes]
+
+    def test_rotulos_curtos(self):
+        assert self.oraculo.tamanho_medio_rotulo < self.grafo.ordem / 4